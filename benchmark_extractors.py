@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+提取脚本基准测试
+在 generate_dvm_corpus.py 生成的合成语料上运行两个提取脚本的 process_html_files，报告：
+    性能: 墙钟时间、CPU时间、每秒处理的页面数、峰值RSS（主进程和并行工作进程分别统计）
+    正确性: 与 ground_truth.json 比较的召回率、精确率和各字段的准确率
+
+每次运行都在新启动（spawn）的子进程中进行，峰值RSS不受前一次运行和本脚本自身的影响；
+提取脚本的控制台输出被丢弃
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import extraction_stats
+
+# 语料子目录 -> 提取脚本模块
+EXTRACTORS = {
+    "dvm": "extract_test_cases_from_html_to_json",
+    "capl": "extract_api_from_html_to_json"
+}
+
+# 参与比较的测试用例字段（命令行提取不解析需求表格，requirements 不参与比较）
+DVM_FIELDS = ("test_case_id", "legacy_id", "purpose", "precondition", "description", "postcondition", "test_script")
+
+# 报告中列出的缺失/不一致条目数
+MAX_LISTED = 20
+
+def max_rss_bytes(who):
+    """
+    返回峰值RSS（字节），ru_maxrss在Linux上以KB为单位，在macOS上以字节为单位
+    """
+    max_rss = resource.getrusage(who).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+@contextlib.contextmanager
+def discard_stdout():
+    """
+    在文件描述符层面丢弃标准输出，并行提取时工作进程的输出同样被丢弃
+    """
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    devnull_fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull_fd, 1)
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+        os.close(devnull_fd)
+
+def run_extractor(extractor, input_dir, output_dir, jobs=1, with_stages=False):
+    """
+    运行一次提取（在子进程中调用）
+
+    返回:
+        dict: 墙钟时间、CPU时间（包括已结束的工作进程）、峰值RSS，以及可选的各阶段统计
+    """
+    module = __import__(EXTRACTORS[extractor])
+    stats = extraction_stats.ExtractionStats() if with_stages else None
+    extraction_stats.activate(stats)
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    with discard_stdout():
+        module.process_html_files(input_dir, output_dir, jobs=jobs)
+    wall = time.perf_counter() - start_wall
+    cpu = time.process_time() - start_cpu
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    result = {
+        "wall_seconds": wall,
+        "cpu_seconds": cpu + children.ru_utime + children.ru_stime,
+        "peak_rss_bytes": max_rss_bytes(resource.RUSAGE_SELF),
+        "worker_peak_rss_bytes": max_rss_bytes(resource.RUSAGE_CHILDREN)
+    }
+    if stats is not None:
+        result["stages"] = stats.to_dict()["stages"]
+    return result
+
+def run_in_fresh_process(extractor, input_dir, output_dir, jobs=1, with_stages=False):
+    """
+    在新启动的子进程中运行一次提取
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(run_extractor, extractor, str(input_dir), str(output_dir), jobs, with_stages).result()
+
+def score_test_cases(expected, extracted):
+    """
+    按标题匹配测试用例，计算召回率、精确率和各字段的准确率
+    """
+    extracted_by_title = {}
+    for test_case in extracted:
+        extracted_by_title.setdefault(test_case["title"], test_case)
+
+    field_matches = dict.fromkeys(DVM_FIELDS, 0)
+    matched = 0
+    exact = 0
+    missing = []
+    mismatched = []
+    for test_case in expected:
+        found = extracted_by_title.get(test_case["title"])
+        if found is None:
+            missing.append(test_case["title"])
+            continue
+        matched += 1
+        wrong_fields = [field for field in DVM_FIELDS if found.get(field) != test_case.get(field)]
+        for field in DVM_FIELDS:
+            if field not in wrong_fields:
+                field_matches[field] += 1
+        if wrong_fields:
+            mismatched.append({"title": test_case["title"], "page_number": test_case["page_number"],
+                               "fields": wrong_fields})
+        else:
+            exact += 1
+
+    return {
+        "expected": len(expected),
+        "extracted": len(extracted),
+        "matched": matched,
+        "exact": exact,
+        "recall": round(matched / len(expected), 4) if expected else 1.0,
+        "precision": round(matched / len(extracted), 4) if extracted else 1.0,
+        "exact_ratio": round(exact / len(expected), 4) if expected else 1.0,
+        "field_accuracy": {field: round(count / matched, 4) if matched else 0.0 for field, count in field_matches.items()},
+        "missing": missing[:MAX_LISTED],
+        "mismatched": mismatched[:MAX_LISTED]
+    }
+
+def score_apis(expected, extracted):
+    """
+    按 (函数名, 语法) 比较API，每个重载签名都是一个期望的条目
+    """
+    expected_pairs = {(api["function_name"], syntax) for api in expected for syntax in api["syntaxes"]}
+    extracted_pairs = {(api["function_name"], api["syntax"]) for api in extracted}
+    correct = expected_pairs & extracted_pairs
+    expected_names = {api["function_name"] for api in expected}
+    extracted_names = {api["function_name"] for api in extracted}
+
+    return {
+        "expected": len(expected_pairs),
+        "extracted": len(extracted_pairs),
+        "correct": len(correct),
+        "recall": round(len(correct) / len(expected_pairs), 4) if expected_pairs else 1.0,
+        "precision": round(len(correct) / len(extracted_pairs), 4) if extracted_pairs else 1.0,
+        "function_recall": round(len(expected_names & extracted_names) / len(expected_names), 4) if expected_names else 1.0,
+        "missing": [f"{name}: {syntax}" for name, syntax in sorted(expected_pairs - extracted_pairs)][:MAX_LISTED],
+        "unexpected": [f"{name}: {syntax}" for name, syntax in sorted(extracted_pairs - expected_pairs)][:MAX_LISTED]
+    }
+
+def score_output(extractor, ground_truth, output_dir):
+    """
+    比较提取结果与期望结果
+    """
+    if extractor == "dvm":
+        with open(Path(output_dir) / "all_test_cases.json", 'r', encoding='utf-8') as f:
+            return score_test_cases(ground_truth["dvm"]["test_cases"], json.load(f))
+
+    summary_file = Path(output_dir) / "capl_api_lists.json"
+    extracted = []
+    if summary_file.exists():
+        with open(summary_file, 'r', encoding='utf-8') as f:
+            extracted = json.load(f)
+    return score_apis(ground_truth["capl"]["apis"], extracted)
+
+def benchmark(corpus_dir, extractors=tuple(EXTRACTORS), jobs=1, repeat=3, with_stages=False, work_dir=None):
+    """
+    对语料运行基准测试
+
+    参数:
+        corpus_dir: generate_dvm_corpus.py 生成的语料目录
+        extractors: 要测试的语料子目录（dvm、capl）
+        jobs: 传给 process_html_files 的并行进程数
+        repeat: 每个提取脚本的运行次数，性能取中位数
+        with_stages: 为True时同时记录各阶段的时间（取最后一次运行）
+        work_dir: 提取结果的输出目录（可选），默认使用临时目录并在结束后删除
+
+    返回:
+        dict: 基准测试报告
+    """
+    corpus_path = Path(corpus_dir)
+    with open(corpus_path / "ground_truth.json", 'r', encoding='utf-8') as f:
+        ground_truth = json.load(f)
+
+    report = {"corpus": str(corpus_dir), "seed": ground_truth["seed"], "jobs": jobs, "repeat": repeat, "extractors": {}}
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='extractor_benchmark_'))
+
+        for extractor in extractors:
+            pages = ground_truth[extractor]["pages"]
+            if not pages:
+                continue
+            output_dir = Path(work_dir) / extractor
+            runs = [run_in_fresh_process(extractor, corpus_path / extractor, output_dir, jobs, with_stages)
+                    for _ in range(repeat)]
+
+            wall = statistics.median(run["wall_seconds"] for run in runs)
+            result = {
+                "pages": pages,
+                "wall_seconds": round(wall, 4),
+                "cpu_seconds": round(statistics.median(run["cpu_seconds"] for run in runs), 4),
+                "pages_per_second": round(pages / wall, 2) if wall else 0.0,
+                "peak_rss_mib": round(max(run["peak_rss_bytes"] for run in runs) / 1024 / 1024, 2),
+                "worker_peak_rss_mib": round(max(run["worker_peak_rss_bytes"] for run in runs) / 1024 / 1024, 2),
+                "runs_wall_seconds": [round(run["wall_seconds"], 4) for run in runs],
+                # 每次运行的输出相同，只比较最后一次的结果
+                "correctness": score_output(extractor, ground_truth, output_dir)
+            }
+            if with_stages:
+                result["stages"] = runs[-1]["stages"]
+            report["extractors"][extractor] = result
+
+    return report
+
+def print_report(report):
+    """
+    打印基准测试报告摘要
+    """
+    print(f"语料: {report['corpus']}（种子 {report['seed']}），进程数 {report['jobs']}，每项运行 {report['repeat']} 次")
+    for extractor, result in report["extractors"].items():
+        correctness = result["correctness"]
+        print(f"\n[{extractor}] {result['pages']} 页，{result['wall_seconds']:.3f} 秒（中位数），"
+              f"{result['pages_per_second']:.1f} 页/秒，CPU {result['cpu_seconds']:.3f} 秒")
+        print(f"  峰值RSS: 主进程 {result['peak_rss_mib']:.1f} MiB，工作进程 {result['worker_peak_rss_mib']:.1f} MiB")
+        print(f"  召回率 {correctness['recall']:.2%}，精确率 {correctness['precision']:.2%}"
+              f"（期望 {correctness['expected']}，提取 {correctness['extracted']}）")
+        if "field_accuracy" in correctness:
+            print(f"  完全一致 {correctness['exact_ratio']:.2%}，字段准确率: " +
+                  "，".join(f"{field} {accuracy:.2%}" for field, accuracy in correctness["field_accuracy"].items()))
+            for mismatch in correctness["mismatched"]:
+                print(f"  不一致: {mismatch['title']}（第{mismatch['page_number']}页）: {', '.join(mismatch['fields'])}")
+        for item in correctness["missing"]:
+            print(f"  缺失: {item}")
+        for item in correctness.get("unexpected", []):
+            print(f"  多余: {item}")
+        for name, stage in result.get("stages", {}).items():
+            print(f"  阶段 {name}: {stage['wall_seconds']:.3f} 秒（{stage['wall_share']:.1%}）")
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description='在合成语料上测试提取脚本的性能和正确性')
+    parser.add_argument('corpus_dir', help='generate_dvm_corpus.py 生成的语料目录')
+    parser.add_argument('--extractor', choices=sorted(EXTRACTORS), action='append',
+                        help='只测试指定的提取脚本（可重复指定，默认全部）')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='提取时的并行进程数（默认1）')
+    parser.add_argument('--repeat', type=int, default=3, help='每个提取脚本的运行次数，性能取中位数（默认3）')
+    parser.add_argument('--stages', action='store_true', help='同时报告各阶段的时间')
+    parser.add_argument('--work-dir', help='保留提取结果的目录（默认使用临时目录）')
+    parser.add_argument('--output', '-o', help='把完整报告保存为JSON文件')
+
+    args = parser.parse_args()
+
+    report = benchmark(args.corpus_dir, args.extractor or tuple(EXTRACTORS), args.jobs, max(args.repeat, 1),
+                       args.stages, args.work_dir)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n报告已保存到: {args.output}")
+
+if __name__ == "__main__":
+    main()
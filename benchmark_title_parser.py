@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+测试用例标题解析基准测试
+在合成的标题语料上比较 html_to_json_converter.parse_test_case_title / test_case_filename
+与原来的正则表达式级联（保留在本文件中作为参照实现）：
+    正确性: 两种实现的ID、名称、结果和文件名必须完全一致
+    性能: 原级联、编译后的语法（冷缓存）和缓存命中时的耗时
+
+语料包括带结果和不带结果的标题、以冒号结尾的标题、ID不是数字的标题（走 split(':') 回退）、
+没有ID的标题、跨行的标题，以及需要清理的名称（非ASCII字符、冒号、超长名称）
+相同的参数和随机种子总是生成相同的语料
+"""
+
+import argparse
+import random
+import re
+import time
+
+import html_to_json_converter
+
+NAME_WORDS = ('Read', 'DID', '0xF190', 'Écran', 'wiper: speed', 'x' * 120, 'a:b', '', '  ', 'Passed', 'Failed', ':')
+
+def legacy_parse_title(test_case_text, index):
+    """
+    原来的标题解析（正则表达式级联），作为比较的参照
+
+    返回:
+        tuple: (ID, 名称, 结果, 文件名)
+    """
+    # 测试结果（Passed/Failed），标题中没有结果时为空
+    verdict = ""
+    if 'Test Case Silk ID:' in test_case_text:
+        match = re.search(r'Test Case Silk ID:(\d+):\s*(.*?):\s*(Passed|Failed)', test_case_text)
+        if match:
+            test_case_id = match.group(1)
+            test_case_name = match.group(2).strip()
+            verdict = match.group(3)
+        else:
+            match = re.search(r'Test Case Silk ID:(\d+):\s*(.*?)\s*:\s*(Passed|Failed)$', test_case_text)
+            if match:
+                test_case_id = match.group(1)
+                test_case_name = match.group(2).strip()
+                verdict = match.group(3)
+            else:
+                match = re.search(r'Test Case Silk ID:(\d+):\s*(.*?)(?:\s*:)?$', test_case_text)
+                if match:
+                    test_case_id = match.group(1)
+                    test_case_name = match.group(2).strip()
+                else:
+                    parts = test_case_text.split(':')
+                    if len(parts) >= 4:
+                        test_case_id = parts[2].strip()
+                        test_case_name = parts[3].strip()
+                        if len(parts) > 4:
+                            test_case_name += '_' + '_'.join(parts[4:]).strip()
+                    else:
+                        test_case_id = str(index)
+                        test_case_name = test_case_text
+    else:
+        test_case_id = str(index)
+        test_case_name = test_case_text
+
+    clean_name = re.sub(r'[^a-zA-Z0-9_\-: ]', '', test_case_name)
+    filename = re.sub(r'[^a-zA-Z0-9_\-]', '_', clean_name.replace(' ', '_'))
+    if not filename:
+        filename = f"test_case_{test_case_id}"
+    if len(filename) > 100:
+        filename = filename[:100]
+    return test_case_id, test_case_name, verdict, filename
+
+def parse_title(test_case_text, index):
+    """
+    使用 html_to_json_converter 中的解析函数，返回值与 legacy_parse_title 相同
+    """
+    test_case_id, test_case_name, verdict = html_to_json_converter.parse_test_case_title(test_case_text)
+    if test_case_id is None:
+        test_case_id = str(index)
+    return test_case_id, test_case_name, verdict, html_to_json_converter.test_case_filename(test_case_name, test_case_id)
+
+def generate_titles(count, seed=1):
+    """
+    生成合成的测试用例标题语料
+    """
+    rnd = random.Random(seed)
+    titles = []
+    for index in range(count):
+        kind = rnd.random()
+        name = ' '.join(rnd.choice(NAME_WORDS) for _ in range(rnd.randint(0, 5)))
+        if kind < 0.5:
+            title = f"{index} Test Case Silk ID:{index}: {name}: {rnd.choice(('Passed', 'Failed'))}"
+        elif kind < 0.7:
+            title = f"{index} Test Case Silk ID:{index}: {name}"
+        elif kind < 0.8:
+            title = f"{index} Test Case Silk ID:{index}: {name} :"
+        elif kind < 0.9:
+            title = f"{index} Test Case Silk ID:A{index}: {name}: x"
+        elif kind < 0.95:
+            title = f"Test Case Silk ID {name}"
+        else:
+            title = f"{index} Test Case Silk ID:{index}:{name}\n: Passed trailing"
+        titles.append(title.strip())
+    return titles
+
+def find_mismatches(titles):
+    """
+    返回两种实现结果不一致的标题列表 [(序号, 标题, 原结果, 新结果)]
+    """
+    mismatches = []
+    for index, title in enumerate(titles):
+        expected = legacy_parse_title(title, index)
+        actual = parse_title(title, index)
+        if expected != actual:
+            mismatches.append((index, title, expected, actual))
+    return mismatches
+
+def benchmark(titles, repeat=3):
+    """
+    测量各实现解析整个语料的耗时（取最小值）
+
+    返回:
+        dict: 原级联、编译后的语法（冷缓存）和缓存命中时的秒数
+    """
+    timings = {"cascade": [], "compiled_cold": [], "compiled_memo_hit": []}
+    for _ in range(repeat):
+        re.purge()
+        start = time.perf_counter()
+        for index, title in enumerate(titles):
+            legacy_parse_title(title, index)
+        timings["cascade"].append(time.perf_counter() - start)
+
+        html_to_json_converter.parse_test_case_title.cache_clear()
+        start = time.perf_counter()
+        for index, title in enumerate(titles):
+            parse_title(title, index)
+        timings["compiled_cold"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for index, title in enumerate(titles):
+            parse_title(title, index)
+        timings["compiled_memo_hit"].append(time.perf_counter() - start)
+    return {name: round(min(values), 4) for name, values in timings.items()}
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description='比较测试用例标题解析的新旧实现（正确性和耗时）')
+    parser.add_argument('--titles', type=int, default=50000, help='合成标题数（默认50000）')
+    parser.add_argument('--seed', type=int, default=1, help='随机种子（默认1）')
+    parser.add_argument('--repeat', type=int, default=3, help='计时重复次数，取最小值（默认3）')
+
+    args = parser.parse_args()
+
+    titles = generate_titles(args.titles, args.seed)
+    mismatches = find_mismatches(titles)
+    print(f"{len(titles)} 个标题，结果不一致 {len(mismatches)} 个")
+    for index, title, expected, actual in mismatches[:10]:
+        print(f"  #{index} {title!r}: 原 {expected} 新 {actual}")
+
+    timings = benchmark(titles, max(args.repeat, 1))
+    print(f"原级联 {timings['cascade']:.3f} 秒，编译后的语法 {timings['compiled_cold']:.3f} 秒（冷缓存），"
+          f"{timings['compiled_memo_hit']:.3f} 秒（缓存命中）")
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
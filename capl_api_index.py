@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+CAPL API索引查询
+为 extract_api_from_html_to_json.py 输出的 capl_api_lists.json 建立持久化的SQLite索引，
+支持不区分大小写的函数名查询、前缀查询、描述/参数全文检索和相关函数图查询
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS apis (
+    id INTEGER PRIMARY KEY,
+    entry_hash TEXT NOT NULL UNIQUE,
+    function_name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    syntax TEXT,
+    description TEXT,
+    parameters_text TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS related_functions (
+    api_id INTEGER NOT NULL REFERENCES apis(id) ON DELETE CASCADE,
+    related_lower TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_apis_name_lower ON apis(name_lower);
+CREATE INDEX IF NOT EXISTS idx_related_api ON related_functions(api_id);
+CREATE INDEX IF NOT EXISTS idx_related_lower ON related_functions(related_lower);
+"""
+
+# 描述和参数的全文索引（外部内容表）
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS apis_fts USING fts5(
+    function_name, description, parameters_text,
+    content='apis', content_rowid='id'
+);
+"""
+
+def entry_hash(api):
+    """
+    计算单个API条目内容的哈希值，用于增量更新
+    """
+    payload = json.dumps(api, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+def parameters_text(api):
+    """
+    将参数列表拼接为可检索的文本
+    """
+    return " ".join(
+        f"{param.get('name', '')} {param.get('description', '')}" for param in api.get('parameters', [])
+    )
+
+class CaplApiIndex:
+    """
+    CAPL API持久化索引
+    """
+
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            # 部分SQLite编译版本不包含FTS5，此时全文检索退化为LIKE查询
+            print(f"当前SQLite不支持FTS5，全文检索将使用LIKE查询: {e}")
+            self.has_fts = False
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def update(self, apis):
+        """
+        增量更新索引：只插入新增或变化的API条目，删除已不存在的条目
+
+        参数:
+            apis: API信息列表（capl_api_lists.json 的内容）
+
+        返回:
+            tuple: (新增条目数, 删除条目数)
+        """
+        new_entries = {}
+        for api in apis:
+            new_entries.setdefault(entry_hash(api), api)
+
+        existing = dict(self.conn.execute('SELECT entry_hash, id FROM apis'))
+        removed_ids = [(api_id,) for digest, api_id in existing.items() if digest not in new_entries]
+        added = [(digest, api) for digest, api in new_entries.items() if digest not in existing]
+
+        with self.conn:
+            if self.has_fts:
+                self.conn.executemany(
+                    "INSERT INTO apis_fts (apis_fts, rowid, function_name, description, parameters_text) "
+                    "SELECT 'delete', id, function_name, description, parameters_text FROM apis WHERE id = ?",
+                    removed_ids
+                )
+            self.conn.executemany('DELETE FROM apis WHERE id = ?', removed_ids)
+
+            for digest, api in added:
+                function_name = api.get('function_name', '')
+                description = api.get('description', '')
+                params_text = parameters_text(api)
+                cursor = self.conn.execute(
+                    'INSERT INTO apis (entry_hash, function_name, name_lower, syntax, description, parameters_text, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (digest, function_name, function_name.lower(), api.get('syntax', ''),
+                     description, params_text, json.dumps(api, ensure_ascii=False))
+                )
+                api_id = cursor.lastrowid
+                self.conn.executemany(
+                    'INSERT INTO related_functions (api_id, related_lower) VALUES (?, ?)',
+                    [(api_id, name.lower()) for name in api.get('related_functions', [])]
+                )
+                if self.has_fts:
+                    self.conn.execute(
+                        'INSERT INTO apis_fts (rowid, function_name, description, parameters_text) VALUES (?, ?, ?, ?)',
+                        (api_id, function_name, description, params_text)
+                    )
+
+        return len(added), len(removed_ids)
+
+    def lookup(self, function_name):
+        """
+        按函数名查询（不区分大小写），返回所有重载
+        """
+        rows = self.conn.execute(
+            'SELECT data FROM apis WHERE name_lower = ? ORDER BY id', (function_name.lower(),)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def prefix(self, prefix, limit=50):
+        """
+        按函数名前缀查询（不区分大小写），返回函数名列表
+        """
+        prefix = prefix.lower()
+        rows = self.conn.execute(
+            'SELECT DISTINCT function_name FROM apis WHERE name_lower >= ? AND name_lower < ? '
+            'ORDER BY name_lower LIMIT ?',
+            (prefix, prefix + '\uffff', limit)
+        )
+        return [function_name for (function_name,) in rows]
+
+    def search(self, query, limit=50):
+        """
+        在函数名、描述和参数中全文检索
+
+        返回:
+            list: (函数名, 语法) 元组列表
+        """
+        if self.has_fts:
+            rows = self.conn.execute(
+                'SELECT a.function_name, a.syntax FROM apis_fts f JOIN apis a ON a.id = f.rowid '
+                'WHERE apis_fts MATCH ? ORDER BY rank LIMIT ?',
+                (query, limit)
+            )
+        else:
+            pattern = f'%{query}%'
+            rows = self.conn.execute(
+                'SELECT function_name, syntax FROM apis '
+                'WHERE function_name LIKE ? OR description LIKE ? OR parameters_text LIKE ? LIMIT ?',
+                (pattern, pattern, pattern, limit)
+            )
+        return [tuple(row) for row in rows]
+
+    def related(self, function_name, depth=1):
+        """
+        查询相关函数图：包括该函数列出的相关函数，以及把该函数列为相关函数的函数
+
+        参数:
+            function_name: 函数名
+            depth: 图遍历深度
+
+        返回:
+            dict: {函数名(小写): 距离}
+        """
+        start = function_name.lower()
+        distances = {start: 0}
+        frontier = [start]
+        for distance in range(1, depth + 1):
+            next_frontier = []
+            for name in frontier:
+                neighbours = self.conn.execute(
+                    'SELECT r.related_lower FROM related_functions r JOIN apis a ON a.id = r.api_id '
+                    'WHERE a.name_lower = ? '
+                    'UNION '
+                    'SELECT a.name_lower FROM related_functions r JOIN apis a ON a.id = r.api_id '
+                    'WHERE r.related_lower = ?',
+                    (name, name)
+                )
+                for (neighbour,) in neighbours:
+                    if neighbour not in distances:
+                        distances[neighbour] = distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        del distances[start]
+        return distances
+
+def update_index(db_path, apis):
+    """
+    打开索引并增量更新
+
+    返回:
+        tuple: (新增条目数, 删除条目数)
+    """
+    with CaplApiIndex(db_path) as index:
+        return index.update(apis)
+
+def main():
+    """
+    主函数
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='CAPL API索引查询')
+    parser.add_argument('db', help='索引数据库路径')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='根据capl_api_lists.json增量更新索引')
+    build_parser.add_argument('api_file', help='capl_api_lists.json路径（或其所在目录）')
+
+    lookup_parser = subparsers.add_parser('lookup', help='按函数名查询（不区分大小写）')
+    lookup_parser.add_argument('name', help='函数名')
+
+    prefix_parser = subparsers.add_parser('prefix', help='按函数名前缀查询')
+    prefix_parser.add_argument('prefix', help='函数名前缀')
+    prefix_parser.add_argument('--limit', type=int, default=50, help='最大返回条数（默认50）')
+
+    search_parser = subparsers.add_parser('search', help='在描述和参数中全文检索')
+    search_parser.add_argument('query', help='检索词')
+    search_parser.add_argument('--limit', type=int, default=50, help='最大返回条数（默认50）')
+
+    related_parser = subparsers.add_parser('related', help='查询相关函数')
+    related_parser.add_argument('name', help='函数名')
+    related_parser.add_argument('--depth', type=int, default=1, help='图遍历深度（默认1）')
+
+    args = parser.parse_args()
+
+    with CaplApiIndex(args.db) as index:
+        if args.command == 'build':
+            api_file = Path(args.api_file)
+            if api_file.is_dir():
+                api_file = api_file / 'capl_api_lists.json'
+            with open(api_file, 'r', encoding='utf-8') as f:
+                apis = json.load(f)
+            added, removed = index.update(apis)
+            print(f"索引已更新: 新增 {added} 个条目，删除 {removed} 个条目")
+        elif args.command == 'lookup':
+            print(json.dumps(index.lookup(args.name), ensure_ascii=False, indent=2))
+        elif args.command == 'prefix':
+            for function_name in index.prefix(args.prefix, args.limit):
+                print(function_name)
+        elif args.command == 'search':
+            for function_name, syntax in index.search(args.query, args.limit):
+                print(f"{function_name}: {syntax}")
+        else:
+            for name, distance in sorted(index.related(args.name, args.depth).items(), key=lambda item: (item[1], item[0])):
+                print(f"{distance} {name}")
+
+if __name__ == "__main__":
+    main()
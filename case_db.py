@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+测试用例SQLite存储
+将 html_to_json_converter.parse_test_report 和
+extract_test_cases_from_html_to_json.process_html_files 提取的测试用例
+批量写入SQLite数据库，支持跨报告的索引查询和测试步骤全文检索
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS test_cases (
+    id INTEGER PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    case_id TEXT,
+    name TEXT,
+    title TEXT,
+    verdict TEXT,
+    page_number INTEGER,
+    legacy_id TEXT,
+    purpose TEXT,
+    precondition TEXT,
+    postcondition TEXT,
+    description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY,
+    test_case_id INTEGER NOT NULL REFERENCES test_cases(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    step TEXT,
+    timestamp TEXT,
+    action TEXT,
+    expected_result TEXT,
+    description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS requirements (
+    id INTEGER PRIMARY KEY,
+    test_case_id INTEGER NOT NULL REFERENCES test_cases(id) ON DELETE CASCADE,
+    requirement TEXT,
+    req_id TEXT,
+    ver TEXT,
+    status TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_test_cases_report ON test_cases(report_id);
+CREATE INDEX IF NOT EXISTS idx_test_cases_case_id ON test_cases(case_id);
+CREATE INDEX IF NOT EXISTS idx_test_cases_verdict ON test_cases(verdict);
+CREATE INDEX IF NOT EXISTS idx_steps_test_case ON steps(test_case_id, position);
+CREATE INDEX IF NOT EXISTS idx_requirements_test_case ON requirements(test_case_id);
+CREATE INDEX IF NOT EXISTS idx_requirements_req_id ON requirements(req_id);
+"""
+
+# 测试步骤全文索引（外部内容表，文本只在steps表中保存一份）
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS steps_fts USING fts5(
+    step, action, expected_result, description,
+    content='steps', content_rowid='id'
+);
+"""
+
+def connect(db_path):
+    """
+    打开数据库并初始化表结构
+
+    返回:
+        sqlite3.Connection: 数据库连接
+    """
+    conn = sqlite3.connect(db_path, timeout=60)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.executescript(SCHEMA)
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        # 部分SQLite编译版本不包含FTS5，此时退化为LIKE查询
+        print(f"当前SQLite不支持FTS5，步骤全文检索将使用LIKE查询: {e}")
+    return conn
+
+def has_fts(conn):
+    """
+    检查数据库中是否存在步骤全文索引表
+    """
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'steps_fts'"
+    ).fetchone()
+    return row is not None
+
+def create_report(conn, source, kind):
+    """
+    新建一份报告记录（不提交，随后续第一批测试用例一起提交）
+
+    参数:
+        conn: 数据库连接
+        source: 报告来源（通常是输入文件或目录路径）
+        kind: 报告类型，'report'（测试报告）或 'dvm'（DVM测试规范）
+
+    返回:
+        int: 新建的报告ID
+    """
+    if not conn.in_transaction:
+        conn.execute('BEGIN IMMEDIATE')
+    cursor = conn.execute(
+        'INSERT INTO reports (source, kind, imported_at) VALUES (?, ?, ?)',
+        (str(source), kind, datetime.now().isoformat(timespec='seconds'))
+    )
+    return cursor.lastrowid
+
+def add_test_cases(conn, report_id, test_cases):
+    """
+    在一个事务中批量写入一批测试用例、步骤和需求
+    同一份报告可以分多批写入（如流式提取时每处理完一页写入一批）
+
+    参数:
+        conn: 数据库连接
+        report_id: 报告ID
+        test_cases: 测试用例数据列表（parse_test_report 或 process_html_files 的输出格式）
+    """
+    # 多个进程同时写入同一数据库时（如语料库模式），立即获取写锁，避免延迟事务升级写锁时直接失败
+    if not conn.in_transaction:
+        conn.execute('BEGIN IMMEDIATE')
+    with conn:
+        last_step_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM steps').fetchone()[0]
+
+        step_rows = []
+        requirement_rows = []
+        for test_case in test_cases:
+            cursor = conn.execute(
+                'INSERT INTO test_cases (report_id, case_id, name, title, verdict, page_number, '
+                'legacy_id, purpose, precondition, postcondition, description) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    report_id,
+                    test_case.get('id') or test_case.get('test_case_id', ''),
+                    test_case.get('name', ''),
+                    test_case.get('title', ''),
+                    test_case.get('verdict', ''),
+                    test_case.get('page_number'),
+                    test_case.get('legacy_id', ''),
+                    test_case.get('purpose', ''),
+                    test_case.get('precondition', ''),
+                    test_case.get('postcondition', ''),
+                    test_case.get('description', '')
+                )
+            )
+            case_row_id = cursor.lastrowid
+
+            # 测试报告的步骤为 timestamp/test_step/description，
+            # DVM测试规范的步骤为 step/action/expected_result
+            steps = test_case.get('steps') or test_case.get('test_script') or []
+            for position, step in enumerate(steps):
+                step_rows.append((
+                    case_row_id,
+                    position,
+                    step.get('step') or step.get('test_step', ''),
+                    step.get('timestamp', ''),
+                    step.get('action', ''),
+                    step.get('expected_result', ''),
+                    step.get('description', '')
+                ))
+
+            for requirement in test_case.get('requirements', []):
+                requirement_rows.append((
+                    case_row_id,
+                    requirement.get('requirement', ''),
+                    requirement.get('req_id', ''),
+                    requirement.get('ver', ''),
+                    requirement.get('status', '')
+                ))
+
+        conn.executemany(
+            'INSERT INTO steps (test_case_id, position, step, timestamp, action, expected_result, description) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            step_rows
+        )
+        conn.executemany(
+            'INSERT INTO requirements (test_case_id, requirement, req_id, ver, status) '
+            'VALUES (?, ?, ?, ?, ?)',
+            requirement_rows
+        )
+
+        if has_fts(conn):
+            conn.execute(
+                'INSERT INTO steps_fts (rowid, step, action, expected_result, description) '
+                'SELECT s.id, s.step, s.action, s.expected_result, s.description '
+                'FROM steps s WHERE s.id > ?',
+                (last_step_id,)
+            )
+
+def insert_test_cases(conn, test_cases, source, kind):
+    """
+    在一个事务中批量写入一份报告的所有测试用例、步骤和需求
+
+    参数:
+        conn: 数据库连接
+        test_cases: 测试用例数据列表（parse_test_report 或 process_html_files 的输出格式）
+        source: 报告来源（通常是输入文件或目录路径）
+        kind: 报告类型，'report'（测试报告）或 'dvm'（DVM测试规范）
+
+    返回:
+        int: 新建的报告ID
+    """
+    report_id = create_report(conn, source, kind)
+    add_test_cases(conn, report_id, test_cases)
+    return report_id
+
+def import_test_cases(db_path, test_cases, source, kind='report'):
+    """
+    打开数据库并写入一份报告的测试用例
+
+    返回:
+        int: 新建的报告ID
+    """
+    conn = connect(db_path)
+    try:
+        return insert_test_cases(conn, test_cases, source, kind)
+    finally:
+        conn.close()
+
+def search_steps(conn, query, verdict=None, limit=100):
+    """
+    全文检索测试步骤
+
+    参数:
+        conn: 数据库连接
+        query: 检索词（FTS5查询语法，例如 '0xF190' 或 '"Read DID"'）
+        verdict: 只返回指定测试结果（Passed/Failed）的测试用例的步骤（可选）
+        limit: 最大返回条数
+
+    返回:
+        list: sqlite3.Row 列表
+    """
+    columns = (
+        'r.source, c.case_id, c.name, c.title, c.verdict, '
+        's.position, s.step, s.timestamp, s.action, s.expected_result, s.description'
+    )
+    params = []
+    if has_fts(conn):
+        sql = (
+            f'SELECT {columns} FROM steps_fts f '
+            'JOIN steps s ON s.id = f.rowid '
+            'JOIN test_cases c ON c.id = s.test_case_id '
+            'JOIN reports r ON r.id = c.report_id '
+            'WHERE steps_fts MATCH ?'
+        )
+        params.append(query)
+    else:
+        pattern = f'%{query}%'
+        sql = (
+            f'SELECT {columns} FROM steps s '
+            'JOIN test_cases c ON c.id = s.test_case_id '
+            'JOIN reports r ON r.id = c.report_id '
+            'WHERE (s.step LIKE ? OR s.action LIKE ? OR s.expected_result LIKE ? OR s.description LIKE ?)'
+        )
+        params.extend([pattern] * 4)
+
+    if verdict:
+        sql += ' AND c.verdict = ?'
+        params.append(verdict)
+    sql += ' ORDER BY r.id, c.id, s.position LIMIT ?'
+    params.append(limit)
+
+    return conn.execute(sql, params).fetchall()
+
+def load_test_cases_json(path):
+    """
+    从JSON文件或目录中读取测试用例
+
+    目录中存在 all_test_cases.json 时只读取该文件（DVM提取结果），
+    否则读取目录中所有的单个测试用例JSON文件（测试报告解析结果）
+
+    返回:
+        tuple: (测试用例列表, 报告类型)
+    """
+    path = Path(path)
+    if path.is_dir():
+        all_file = path / 'all_test_cases.json'
+        if all_file.exists():
+            files = [all_file]
+        else:
+            files = sorted(path.glob('*.json'))
+    else:
+        files = [path]
+
+    test_cases = []
+    for json_file in files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            test_cases.extend(data)
+        else:
+            test_cases.append(data)
+
+    kind = 'dvm' if any('test_case_id' in tc for tc in test_cases) else 'report'
+    return test_cases, kind
+
+def main():
+    """
+    主函数
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='将提取的测试用例写入SQLite数据库并进行检索')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='导入测试用例JSON文件或目录')
+    import_parser.add_argument('db', help='SQLite数据库路径')
+    import_parser.add_argument('paths', nargs='+', help='测试用例JSON文件或目录')
+
+    search_parser = subparsers.add_parser('search', help='全文检索测试步骤')
+    search_parser.add_argument('db', help='SQLite数据库路径')
+    search_parser.add_argument('query', help="检索词，例如 '0xF190'")
+    search_parser.add_argument('--verdict', choices=['Passed', 'Failed'], help='只检索指定测试结果的测试用例')
+    search_parser.add_argument('--limit', type=int, default=100, help='最大返回条数（默认100）')
+
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    try:
+        if args.command == 'import':
+            for path in args.paths:
+                test_cases, kind = load_test_cases_json(path)
+                report_id = insert_test_cases(conn, test_cases, path, kind)
+                print(f"已导入 {len(test_cases)} 个测试用例: {path} (report_id={report_id})")
+        else:
+            rows = search_steps(conn, args.query, args.verdict, args.limit)
+            for row in rows:
+                print(json.dumps(dict(row), ensure_ascii=False))
+            print(f"共找到 {len(rows)} 条步骤")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
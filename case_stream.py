@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+测试用例流式写入
+按批把已经确定的测试用例追加写入结果文件并立即刷新，不需要在内存中保留整个文档的测试用例：
+    JSON数组格式: 与 json.dump(test_cases, f, ensure_ascii=False, indent=2) 的输出逐字节一致
+    NDJSON格式: 每行一个测试用例，中途中断时已写入的行仍然完整可用
+"""
+
+import json
+
+class TestCaseStreamWriter:
+    """
+    测试用例流式写入器
+    """
+
+    def __init__(self, path, ndjson=False):
+        self.path = path
+        self.ndjson = ndjson
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, test_cases):
+        """
+        追加写入一批测试用例并刷新到文件
+        """
+        for test_case in test_cases:
+            if self.ndjson:
+                self._file.write(json.dumps(test_case, ensure_ascii=False))
+                self._file.write('\n')
+            else:
+                # 数组元素位于第一层缩进，元素内部的每一行都要再缩进两个空格
+                # （字符串中的换行已被转义，不会出现在输出的行内）
+                self._file.write('[\n  ' if self.count == 0 else ',\n  ')
+                self._file.write(json.dumps(test_case, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+            self.count += 1
+        self._file.flush()
+
+    def close(self):
+        """
+        结束JSON数组并关闭文件
+        """
+        if not self.ndjson:
+            self._file.write('[]' if self.count == 0 else '\n]')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
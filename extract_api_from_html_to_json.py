@@ -7,8 +7,40 @@ CAPL函数API文档提取脚本
 import os
 import re
 import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from bs4 import BeautifulSoup
+
+import capl_api_index
+import extraction_stats
+from extraction_stats import ExtractionStats
+from extraction_records import PositionedText
+from memory_report import trace_memory
+from page_classifier import DOCUMENT_CAPL, PAGE_FUNCTION, PAGE_IRRELEVANT, classify_text, has_capl_section_text, page_text
+from page_cache import PageCache, is_page_cache
+from page_text_index import NO_POSITION, PageTextIndex
+from pdftohtml_xml_reader import DEFAULT_FONT_CLASS_FORMAT, iter_xml_pages
+
+# 提取器版本号，提取逻辑变化导致输出变化时需要递增，使旧的页面缓存失效
+EXTRACTOR_VERSION = 3
+
+# 有效函数名格式
+FUNCTION_NAME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_]+$')
+# 与函数名格式相同但不是函数名的常见文本
+NON_FUNCTION_NAMES = {'USA', 'CAN', 'INT', 'CHAR', 'FLOAT', 'DOUBLE', 'VOID', 'LONG', 'SHORT', 'BYTE'}
+# Related Functions section中的函数名
+RELATED_FUNCTION_PATTERN = re.compile(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b')
+# section标题及对应的字段名（按匹配优先级排列）
+SECTION_MARKERS = (
+    ('Syntax', 'syntax'),
+    ('Description', 'description'),
+    ('Parameter', 'parameters'),
+    ('Returns', 'returns'),
+    ('Availability', 'availability'),
+    ('Observation', 'observation'),
+    ('Branch Compatibility', 'branch_compatibility'),
+    ('Related Functions', 'related_functions')
+)
 
 def extract_api_from_html(html_content, page_number):
     """
@@ -21,114 +53,128 @@ def extract_api_from_html(html_content, page_number):
     返回:
         list: API信息列表
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # 先预分类，跳过Availability Chart页面和没有Syntax section的页面
+    page_class, page_index = classify_api_page(html_content)
+    if page_class != PAGE_FUNCTION:
+        return []
+    
+    with extraction_stats.stage('extract'):
+        return extract_api_from_index(page_index, page_number)
+
+def classify_api_page(html_content):
+    """
+    对CAPL手册页面进行预分类
+    页面文本中没有 Availability Chart 和 Syntax 时不解析页面；
+    否则解析页面定位文本索引，与原来的实现一样只根据<p>段落文本判断
+    
+    参数:
+        html_content: HTML内容
+    
+    返回:
+        tuple: (页面类型, 页面定位文本索引)，未解析页面时索引为None
+    """
+    with extraction_stats.stage('classify'):
+        if not has_capl_section_text(page_text(html_content)):
+            return PAGE_IRRELEVANT, None
+    
+    with extraction_stats.stage('parse'):
+        page_index = PageTextIndex.from_html(html_content)
+    with extraction_stats.stage('classify'):
+        return classify_text(page_index.text(), DOCUMENT_CAPL), page_index
+
+def extract_api_from_index(page_index, page_number):
+    """
+    从页面定位文本索引中提取CAPL函数API信息
+    HTML页面和pdftohtml -xml文档的页面共用此提取逻辑
+    
+    参数:
+        page_index: 页面定位文本索引
+        page_number: 页码
+    
+    返回:
+        list: API信息列表
+    """
     api_list = []
     
     # 首先检查是否是Availability Chart页面
-    availability_chart = False
-    for p in soup.find_all('p'):
-        text = p.get_text().strip()
-        if 'Availability Chart' in text:
-            availability_chart = True
-            break
-    
-    if availability_chart:
+    if any('Availability Chart' in text for text in page_index.texts):
         # 跳过Availability Chart页面，不处理
         return []
     
     # 查找函数名 - 以粗体显示在页面右侧，有特定的样式
     function_name = None
-    function_heading = None
+    function_heading_row = None
     
     # 收集所有可能的函数名候选
     function_candidates = []
     
-    for p in soup.find_all('p'):
-        text = p.get_text().strip()
-        if not text:
+    for row, text in enumerate(page_index.texts):
+        if not text or not page_index.has_position(row):
             continue
-            
-        style = p.get('style', '')
-        class_name = p.get('class', [])
         
-        left_match = re.search(r'left:(\d+)px', style)
-        top_match = re.search(r'top:(\d+)px', style)
+        left = page_index.lefts[row]
+        top = page_index.tops[row]
         
-        if left_match and top_match:
-            left = int(left_match.group(1))
-            top = int(top_match.group(1))
-            
-            # 函数名特征：
-            # 1. 位置在右侧 (left > 400)
-            # 2. 文本是有效的函数名格式
-            # 3. 有粗体样式 (ft02, ft01等)
-            # 4. 不是常见参数名或普通文本
-            
-            is_valid_function_name = (
-                left > 400 and 
-                re.match(r'^[a-zA-Z][a-zA-Z0-9_]+$', text) and
-                len(text) > 2 and  # 排除过短的名字
-                len(text) <= 30 and  # 排除过长的名字
-                text not in {'USA', 'CAN', 'INT', 'CHAR', 'FLOAT', 'DOUBLE', 'VOID', 'LONG', 'SHORT', 'BYTE'} and
-                not text.endswith('Name') and  # 排除EnvVarName这类参数名
-                not text.isupper()  # 排除全大写的普通文本
-            )
+        # 函数名特征：
+        # 1. 位置在右侧 (left > 400)
+        # 2. 文本是有效的函数名格式
+        # 3. 有粗体样式 (ft02, ft01等)
+        # 4. 不是常见参数名或普通文本
+        
+        is_valid_function_name = (
+            left > 400 and 
+            FUNCTION_NAME_PATTERN.match(text) and
+            len(text) > 2 and  # 排除过短的名字
+            len(text) <= 30 and  # 排除过长的名字
+            text not in NON_FUNCTION_NAMES and
+            not text.endswith('Name') and  # 排除EnvVarName这类参数名
+            not text.isupper()  # 排除全大写的普通文本
+        )
+        
+        if is_valid_function_name:
+            # 检查是否有函数特征样式
+            has_function_style = 'ft0' in page_index.font_classes[row]
             
-            if is_valid_function_name:
-                # 检查是否有函数特征样式
-                has_function_style = any('ft0' in str(cls) for cls in class_name)
-                
-                function_candidates.append({
-                    'text': text,
-                    'element': p,
-                    'top': top,
-                    'left': left,
-                    'score': (left - 400) + (10 if has_function_style else 0)
-                })
+            score = (left - 400) + (10 if has_function_style else 0)
+            function_candidates.append((score, PositionedText(text, top, left, row)))
     
     # 选择最可能的函数名
     if function_candidates:
         # 按分数排序，选择分数最高的
-        function_candidates.sort(key=lambda x: x['score'], reverse=True)
+        function_candidates.sort(key=lambda x: x[0], reverse=True)
         
         # 验证是否有对应的Syntax section
-        best_candidate = function_candidates[0]
+        best_candidate = function_candidates[0][1]
         
-        # 检查后续是否有Syntax section
+        # 检查函数名附近是否有Syntax section（上下200px以内）
         has_syntax = False
-        for p in soup.find_all('p'):
-            text = p.get_text().strip()
-            if 'Syntax' in text and 'ft03' in str(p.get('class', [])):
-                p_style = p.get('style', '')
-                syntax_top_match = re.search(r'top:(\d+)px', p_style)
-                if syntax_top_match:
-                    syntax_top = int(syntax_top_match.group(1))
-                    if abs(syntax_top - best_candidate['top']) < 200:  # Syntax应该在函数名附近
-                        has_syntax = True
-                        break
+        for row in page_index.rows_in_range(best_candidate.top - 199, best_candidate.top + 199):
+            if 'Syntax' in page_index.texts[row] and 'ft03' in page_index.font_classes[row]:
+                has_syntax = True
+                break
         
         if has_syntax:
-            function_name = best_candidate['text']
-            function_heading = best_candidate['element']
+            function_name = best_candidate.text
+            function_heading_row = best_candidate.row
     
-    if not function_name or not function_heading:
+    if not function_name or function_heading_row is None:
         return api_list
     
     # 使用extract_function_details提取详细信息，支持重载函数
-    function_details = extract_function_details(soup, function_name, function_heading)
+    function_details = extract_function_details(page_index, function_name, function_heading_row)
     api_list.extend(function_details)
     return api_list
 
 
 
-def extract_function_details(soup, function_name, function_heading):
+def extract_function_details(page_index, function_name, function_heading_row):
     """
     提取特定函数的详细信息
     
     参数:
-        soup: BeautifulSoup对象
+        page_index: 页面定位文本索引
         function_name: 函数名
-        function_heading: 函数名的HTML元素
+        function_heading_row: 函数名段落在索引中的行号
     
     返回:
         list: 函数详细信息列表（支持重载函数）
@@ -136,25 +182,11 @@ def extract_function_details(soup, function_name, function_heading):
     api_list = []
     
     # 获取函数标题的top位置
-    style = function_heading.get('style', '')
-    top_match = re.search(r'top:(\d+)px', style)
-    if not top_match:
+    if page_index.tops[function_heading_row] == NO_POSITION:
         return api_list
     
-    function_top = int(top_match.group(1))
-    
-    # 查找所有段落
-    all_paragraphs = soup.find_all('p')
-    
-    # 找到函数标题之后的段落
-    start_index = 0
-    for i, p in enumerate(all_paragraphs):
-        if p == function_heading:
-            start_index = i + 1
-            break
-    
-    if start_index == 0:
-        return api_list
+    function_top = page_index.tops[function_heading_row]
+    texts = page_index.texts
     
     # 收集函数相关信息
     current_section = None
@@ -163,49 +195,32 @@ def extract_function_details(soup, function_name, function_heading):
     # 存储所有section的内容
     sections_content = {}
     
-    for i in range(start_index, len(all_paragraphs)):
-        p = all_paragraphs[i]
-        text = p.get_text().strip()
-        if not text:
+    # 从函数标题的下一个段落开始，只扫描函数标题下方800px以内的段落
+    for i in range(function_heading_row + 1, len(texts)):
+        text = texts[i]
+        if not text or not page_index.has_position(i):
             continue
-            
-        style = p.get('style', '')
-        top_match = re.search(r'top:(\d+)px', style)
-        left_match = re.search(r'left:(\d+)px', style)
         
-        if not top_match or not left_match:
-            continue
-            
-        top = int(top_match.group(1))
-        left = int(left_match.group(1))
+        top = page_index.tops[i]
+        left = page_index.lefts[i]
         
         # 如果距离太远，可能是下一个函数
         if top - function_top > 800:
             break
             
         # 检查是否是新的section
-        section_markers = {
-            'Syntax': 'syntax',
-            'Description': 'description',
-            'Parameter': 'parameters',
-            'Returns': 'returns',
-            'Availability': 'availability',
-            'Observation': 'observation',
-            'Branch Compatibility': 'branch_compatibility',
-            'Related Functions': 'related_functions'
-        }
-        
         found_section = False
-        for marker, section in section_markers.items():
-            if marker in text and left < 200:
-                # 保存前一个section的内容
-                if current_section and current_text:
-                    sections_content[current_section] = current_text
-                
-                current_section = section
-                current_text = []  # 不将标题行加入内容
-                found_section = True
-                break
+        if left < 200:
+            for marker, section in SECTION_MARKERS:
+                if marker in text:
+                    # 保存前一个section的内容
+                    if current_section and current_text:
+                        sections_content[current_section] = current_text
+                    
+                    current_section = section
+                    current_text = []  # 不将标题行加入内容
+                    found_section = True
+                    break
         
         if not found_section and current_section:
             # 收集当前section的内容
@@ -279,12 +294,14 @@ def extract_function_details(soup, function_name, function_heading):
             
             # 填充其他section的内容
             for section, content_list in sections_content.items():
-                if section != 'syntax' and section != 'related_functions':
+                if section != 'syntax':
                     content = " ".join(content_list).strip()
                     if section == 'parameters':
                         api_info[section] = parse_parameters(content)
                     elif section == 'branch_compatibility':
                         api_info[section] = parse_branch_compatibility(content)
+                    elif section == 'related_functions':
+                        api_info[section] = parse_related_functions(content)
                     elif section == 'description':
                         # 去掉Description前缀
                         description = content.replace('Description:', '').replace('Description', '').strip()
@@ -443,6 +460,21 @@ def parse_branch_compatibility(content):
     
     return compatibility
 
+def parse_related_functions(content):
+    """
+    解析相关函数列表
+    例如："fileClose, fileOpen" -> ["fileClose", "fileOpen"]
+    """
+    # 移除"Related Functions"前缀
+    content = re.sub(r'^\s*related functions?\s*[:\-]?\s*', '', content, flags=re.IGNORECASE)
+    
+    related_functions = []
+    for name in RELATED_FUNCTION_PATTERN.findall(content):
+        if name not in related_functions:
+            related_functions.append(name)
+    
+    return related_functions
+
 
 
 def load_exception_list():
@@ -470,13 +502,150 @@ def load_exception_list():
     
     return exception_functions
 
-def process_html_files(input_dir, output_dir):
+def page_cache_key(html_content):
+    """
+    根据页面内容和提取器版本计算缓存键
+    """
+    digest = hashlib.sha256(f"v{EXTRACTOR_VERSION}\n".encode('utf-8'))
+    digest.update(html_content.encode('utf-8'))
+    return digest.hexdigest()
+
+def extract_api_cached(html_content, page_number, cache_dir):
+    """
+    带缓存的预分类和 extract_api_from_index
+    只缓存函数页面未经排除列表过滤的提取结果，内容和提取器版本不变时直接复用（不再解析页面）
+    
+    参数:
+        html_content: HTML内容
+        page_number: 页码
+        cache_dir: 缓存目录路径
+    
+    返回:
+        tuple: (页面类型, API信息列表)
+    """
+    with extraction_stats.stage('classify'):
+        if not has_capl_section_text(page_text(html_content)):
+            return PAGE_IRRELEVANT, []
+    
+    cache_file = Path(cache_dir) / f"{page_cache_key(html_content)}.json"
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                apis = json.load(f)
+            extraction_stats.count('cache_hits')
+            return PAGE_FUNCTION, apis
+        except (OSError, ValueError):
+            # 缓存文件损坏时重新提取
+            pass
+    
+    extraction_stats.count('cache_misses')
+    with extraction_stats.stage('parse'):
+        page_index = PageTextIndex.from_html(html_content)
+    with extraction_stats.stage('classify'):
+        page_class = classify_text(page_index.text(), DOCUMENT_CAPL)
+    if page_class != PAGE_FUNCTION:
+        return page_class, []
+    with extraction_stats.stage('extract'):
+        apis = extract_api_from_index(page_index, page_number)
+    
+    # 先写临时文件再替换，避免并行进程读到不完整的缓存
+    temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(apis, f, ensure_ascii=False)
+    os.replace(temp_file, cache_file)
+    return page_class, apis
+
+def process_api_page(html_file, output_path, exception_functions, cache_dir=None):
+    """
+    处理单个HTML页面：提取API信息，过滤排除函数，并保存 apis_<页面>.json
+    
+    参数:
+        html_file: HTML文件路径
+        output_path: 输出目录路径
+        exception_functions: 需要排除的函数名集合（小写）
+        cache_dir: 页面提取缓存目录（可选）
+    
+    返回:
+        tuple: (保存的API列表, 被排除的函数名列表, 错误信息或None)
+    """
+    try:
+        with extraction_stats.stage('read'):
+            with open(html_file, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+        
+        # 提取API信息（预分类不是函数页面的页面直接跳过，也不写入缓存）
+        if cache_dir:
+            page_class, apis = extract_api_cached(html_content, html_file.stem, cache_dir)
+        else:
+            page_class, page_index = classify_api_page(html_content)
+            if page_class != PAGE_FUNCTION:
+                apis = []
+            else:
+                with extraction_stats.stage('extract'):
+                    apis = extract_api_from_index(page_index, html_file.stem)
+        extraction_stats.count(f'pages_{page_class}')
+        
+        filtered_apis, excluded_functions = save_page_apis(apis, html_file.stem, output_path, exception_functions)
+        return filtered_apis, excluded_functions, None
+    except Exception as e:
+        extraction_stats.count('page_errors')
+        return [], [], str(e)
+
+def save_page_apis(apis, page_stem, output_path, exception_functions):
+    """
+    过滤排除函数，并保存单个页面的 apis_<页面>.json
+    
+    返回:
+        tuple: (保存的API列表, 被排除的函数名列表)
+    """
+    extraction_stats.count('apis_extracted', len(apis))
+    
+    # 过滤掉在排除列表中的函数
+    filtered_apis = []
+    excluded_functions = []
+    for api in apis:
+        if api.get('function_name', '').lower() not in exception_functions:
+            filtered_apis.append(api)
+        else:
+            excluded_functions.append(api.get('function_name', ''))
+    
+    extraction_stats.count('apis_excluded', len(excluded_functions))
+    
+    if filtered_apis:
+        # 保存单个文件的API信息
+        output_file = output_path / f"apis_{page_stem}.json"
+        with extraction_stats.stage('write'):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(filtered_apis, f, ensure_ascii=False, indent=2)
+    
+    return filtered_apis, excluded_functions
+
+def print_page_result(page_name, filtered_apis, excluded_functions, error):
+    """
+    输出单个页面的处理结果
+    """
+    if error:
+        print(f"处理文件 {page_name} 时出错: {error}")
+        return
+    
+    print(f"处理文件: {page_name}")
+    for function_name in excluded_functions:
+        print(f"  排除函数: {function_name}")
+    if filtered_apis:
+        print(f"  提取了 {len(filtered_apis)} 个API (已排除 {len(excluded_functions)} 个)")
+
+def process_html_files(input_dir, output_dir, jobs=1, cache_dir=None, index_db=None):
     """
     处理目录中的所有HTML文件
     
     参数:
         input_dir: 输入目录路径
         output_dir: 输出目录路径
+        jobs: 并行进程数，大于1时使用进程池并行提取各页面，
+              汇总文件仍按页码顺序合并，与串行结果一致
+        cache_dir: 页面提取缓存目录（可选），按页面内容哈希和提取器版本缓存未过滤的提取结果，
+                   排除列表的过滤和汇总在缓存结果之上进行
+        index_db: CAPL API索引数据库路径（可选），写入汇总文件后增量更新索引
     """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
@@ -487,50 +656,143 @@ def process_html_files(input_dir, output_dir):
     # 加载排除函数列表
     exception_functions = load_exception_list()
     
-    all_apis = []
+    if cache_dir:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
     
     # 获取所有HTML文件
     html_files = list(input_path.glob('*.html'))
     html_files.sort(key=lambda x: int(re.search(r'(\d+)', x.stem).group(1)) if re.search(r'(\d+)', x.stem) else 0)
     
-    for html_file in html_files:
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            print(f"处理文件: {html_file.name}")
-            
-            # 提取API信息
-            apis = extract_api_from_html(html_content, html_file.stem)
-            
-            # 过滤掉在排除列表中的函数
-            filtered_apis = []
-            for api in apis:
-                if api.get('function_name', '').lower() not in exception_functions:
-                    filtered_apis.append(api)
+    # 每个页面保存的API列表，按页码顺序存放
+    page_apis = [None] * len(html_files)
+    
+    stats = extraction_stats.active()
+    if jobs and jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                (executor.submit(extraction_stats.run_page, html_file.name, process_api_page, html_file, output_path,
+                                 exception_functions, cache_dir) if stats is not None else
+                 executor.submit(process_api_page, html_file, output_path, exception_functions, cache_dir)): index
+                for index, html_file in enumerate(html_files)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                if stats is not None:
+                    # 工作进程中记录的统计随结果返回
+                    (filtered_apis, excluded_functions, error), page_stats = future.result()
+                    stats.merge(page_stats)
                 else:
-                    print(f"  排除函数: {api.get('function_name', '')}")
-            
-            if filtered_apis:
-                # 保存单个文件的API信息
-                output_file = output_path / f"apis_{html_file.stem}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(filtered_apis, f, ensure_ascii=False, indent=2)
-                
-                all_apis.extend(filtered_apis)
-                print(f"  提取了 {len(filtered_apis)} 个API (已排除 {len(apis) - len(filtered_apis)} 个)")
-            
-        except Exception as e:
-            print(f"处理文件 {html_file.name} 时出错: {e}")
+                    filtered_apis, excluded_functions, error = future.result()
+                print_page_result(html_files[index].name, filtered_apis, excluded_functions, error)
+                page_apis[index] = filtered_apis
+    else:
+        for index, html_file in enumerate(html_files):
+            with extraction_stats.page(html_file.name):
+                filtered_apis, excluded_functions, error = process_api_page(html_file, output_path, exception_functions, cache_dir)
+            print_page_result(html_file.name, filtered_apis, excluded_functions, error)
+            page_apis[index] = filtered_apis
     
-    # 保存所有API信息的汇总文件
+    # 按页码顺序合并
+    all_apis = []
+    for filtered_apis in page_apis:
+        all_apis.extend(filtered_apis)
+    
+    save_api_summary(all_apis, output_path, index_db)
+
+def process_xml_file(xml_file, output_dir, index_db=None, font_class_format=DEFAULT_FONT_CLASS_FORMAT):
+    """
+    处理pdftohtml -xml生成的XML文档：逐页流式读取并提取API信息
+    单页输出文件按pdftohtml逐页HTML的命名方式命名为 apis_<文档名>-<页码>.json
+    
+    参数:
+        xml_file: XML文件路径
+        output_dir: 输出目录路径
+        index_db: CAPL API索引数据库路径（可选）
+        font_class_format: 字体编号到字体类名的映射格式
+    """
+    xml_path = Path(xml_file)
+    pages = (
+        (f"{xml_path.stem}-{page_number}", f"{xml_path.name} 第{page_number}页", page_index)
+        for page_number, page_index in iter_xml_pages(xml_path, font_class_format)
+    )
+    process_page_indexes(pages, output_dir, index_db)
+
+def process_cache_file(cache_file, output_dir, index_db=None):
+    """
+    处理 page_cache.py 编译的页面缓存文件，输出与处理原HTML页面目录相同
+    
+    参数:
+        cache_file: 页面缓存文件路径
+        output_dir: 输出目录路径
+        index_db: CAPL API索引数据库路径（可选）
+    """
+    with PageCache(cache_file) as page_cache:
+        names = page_cache.names()
+        names.sort(key=lambda name: int(re.search(r'(\d+)', Path(name).stem).group(1)) if re.search(r'(\d+)', Path(name).stem) else 0)
+        pages = ((Path(name).stem, name, page_cache.page_index(name)) for name in names)
+        process_page_indexes(pages, output_dir, index_db)
+
+def process_page_indexes(pages, output_dir, index_db=None):
+    """
+    依次处理已构建为定位文本索引的页面（XML文档或页面缓存）
+    
+    参数:
+        pages: (单页输出文件名, 页面显示名称, PageTextIndex) 元组的可迭代对象，按页码顺序排列
+        output_dir: 输出目录路径
+        index_db: CAPL API索引数据库路径（可选）
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    exception_functions = load_exception_list()
+    
+    all_apis = []
+    pages = iter(pages)
+    while True:
+        # XML文档和页面缓存在迭代时才解析页面
+        with extraction_stats.stage('parse'):
+            page = next(pages, None)
+        if page is None:
+            break
+        page_stem, page_name, page_index = page
+        
+        with extraction_stats.page(page_name):
+            try:
+                with extraction_stats.stage('classify'):
+                    page_class = classify_text(page_index.text(), DOCUMENT_CAPL)
+                extraction_stats.count(f'pages_{page_class}')
+                if page_class != PAGE_FUNCTION:
+                    apis = []
+                else:
+                    with extraction_stats.stage('extract'):
+                        apis = extract_api_from_index(page_index, page_stem)
+                filtered_apis, excluded_functions = save_page_apis(apis, page_stem, output_path, exception_functions)
+                error = None
+            except Exception as e:
+                extraction_stats.count('page_errors')
+                filtered_apis, excluded_functions, error = [], [], str(e)
+        print_page_result(page_name, filtered_apis, excluded_functions, error)
+        all_apis.extend(filtered_apis)
+    
+    save_api_summary(all_apis, output_path, index_db)
+
+def save_api_summary(all_apis, output_path, index_db=None):
+    """
+    保存汇总文件 capl_api_lists.json，并按需增量更新API索引
+    """
     if all_apis:
         summary_file = output_path / "capl_api_lists.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(all_apis, f, ensure_ascii=False, indent=2)
+        with extraction_stats.stage('write'):
+            with open(summary_file, 'w', encoding='utf-8') as f:
+                json.dump(all_apis, f, ensure_ascii=False, indent=2)
         
         print(f"\n总计提取了 {len(all_apis)} 个API")
         print(f"所有API信息已保存到: {summary_file}")
+        
+        if index_db:
+            with extraction_stats.stage('index_db'):
+                added, removed = capl_api_index.update_index(index_db, all_apis)
+            print(f"API索引已更新: 新增 {added} 个条目，删除 {removed} 个条目")
 
 def main():
     """
@@ -539,12 +801,42 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='从CAPL HTML文档中提取API信息')
-    parser.add_argument('input_dir', help='输入HTML文件目录')
+    parser.add_argument('input_dir', help='输入HTML文件目录、pdftohtml -xml生成的XML文件或page_cache.py编译的页面缓存文件')
     parser.add_argument('output_dir', help='输出JSON文件目录')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='并行提取的进程数（默认1，即串行处理）')
+    parser.add_argument('--cache-dir', help='页面提取缓存目录（可选），页面内容未变化时复用上次的提取结果')
+    parser.add_argument('--index-db', help='CAPL API索引数据库路径（可选），提取完成后增量更新索引')
+    
+    parser.add_argument('--font-class-format', default=DEFAULT_FONT_CLASS_FORMAT,
+                        help=f'XML输入时字体编号到字体类名的映射格式（默认 {DEFAULT_FONT_CLASS_FORMAT}）')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='使用tracemalloc跟踪内存分配，结束时输出内存报告（只跟踪主进程）')
+    parser.add_argument('--stats', metavar='FILE',
+                        help='把各阶段的墙钟/CPU时间、每页处理时间、最慢的页面和计数保存为JSON文件')
+    parser.add_argument('--profile-dir', help='为每个阶段生成cProfile数据（<阶段>.prof）的目录（只覆盖主进程）')
     
     args = parser.parse_args()
     
-    process_html_files(args.input_dir, args.output_dir)
+    stats = ExtractionStats(args.profile_dir) if args.stats or args.profile_dir else None
+    extraction_stats.activate(stats)
+    
+    # XML文档和页面缓存逐页顺序处理，--jobs 和 --cache-dir 只适用于HTML页面目录
+    try:
+        with trace_memory(args.trace_memory):
+            if is_page_cache(args.input_dir):
+                process_cache_file(args.input_dir, args.output_dir, args.index_db)
+            elif Path(args.input_dir).is_file():
+                process_xml_file(args.input_dir, args.output_dir, args.index_db, args.font_class_format)
+            else:
+                process_html_files(args.input_dir, args.output_dir, args.jobs, args.cache_dir, args.index_db)
+    finally:
+        if stats is not None:
+            extraction_stats.activate(None)
+            if args.stats:
+                stats.save(args.stats)
+                print(f"统计信息已保存到: {args.stats}")
+            else:
+                stats.dump_profiles()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
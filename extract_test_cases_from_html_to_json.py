@@ -1,26 +1,54 @@
-import os
 import re
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
 from pathlib import Path
 from bs4 import BeautifulSoup
 import json
+import extraction_stats
+import case_db
+from extraction_stats import ExtractionStats
+from case_stream import TestCaseStreamWriter
+from page_cache import PageCache, is_page_cache
+from memory_report import trace_memory
+from page_manifest import PageManifest, content_digest, file_signature
+from page_classifier import (DOCUMENT_DVM, PAGE_SCRIPT_CONTINUATION, PAGE_TEST_CASE_HEADER, TEST_CASE_HEADER_PATTERN,
+                             classify_page, classify_text)
+from page_text_index import PageTextIndex
+from extraction_records import PositionedText, RequirementRow, TestCase, TestStep, test_cases_to_dicts
+from table_layout import cluster_rows, detect_column_boundary
+from pdftohtml_xml_reader import DEFAULT_FONT_CLASS_FORMAT, iter_xml_pages
+
+# pdftohtml逐页HTML的文件名格式，page 分组为页码
+DVM_PAGE_PATTERN = re.compile(r'CC_DVM-(?P<page>\d+)\.html')
+
+# 语料库模式的默认文件名格式（pdftohtml的 <文档名>-<页码>.html），doc 分组为文档名
+CORPUS_PAGE_PATTERN = re.compile(r'^(?P<doc>.+)-(?P<page>\d+)\.html$')
+
+# 单页输出文件名（见 page_output_file）
+PAGE_OUTPUT_PATTERN = re.compile(r'^test_cases_(id_.+_)?page_\d+\.json$')
 
 def extract_test_script_from_html(html_content, page_number):
     """
     从HTML内容中提取测试脚本步骤
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    with extraction_stats.stage('parse'):
+        page_index = PageTextIndex.from_html(html_content)
+    with extraction_stats.stage('steps'):
+        return extract_test_script_from_index(page_index, page_number)
+
+def extract_test_script_from_index(page_index, page_number):
+    """
+    从页面定位文本索引中提取测试脚本步骤
+    """
     test_script = []
-    
-    # 查找所有段落
-    all_paragraphs = soup.find_all('p')
+    texts = page_index.texts
     
     # 查找步骤开始的标记
     step_start_index = None
-    for i, p in enumerate(all_paragraphs):
-        text = p.get_text().strip()
-        style = p.get('style', '')
-        left_match = re.search(r'left:(\d+)px', style)
-        left_pos = int(left_match.group(1)) if left_match else 0
+    for i, text in enumerate(texts):
+        left_pos = page_index.left(i)
         
         # 查找"Step Action"或"Step"作为开始标记
         if 'Step Action' in text or ('Step' in text and left_pos < 200):
@@ -33,8 +61,7 @@ def extract_test_script_from_html(html_content, page_number):
     
     if step_start_index is None:
         # 如果没有找到明确的开始标记，尝试从包含步骤格式的段落开始
-        for i, p in enumerate(all_paragraphs):
-            text = p.get_text().strip()
+        for i, text in enumerate(texts):
             if re.match(r'\d+\s+Read DID', text):
                 step_start_index = i
                 break
@@ -43,49 +70,38 @@ def extract_test_script_from_html(html_content, page_number):
         return test_script
     
     # 从步骤开始处处理
-    paragraphs_to_process = all_paragraphs[step_start_index:]
-    
-    # 处理步骤
     current_step = None
-    for p in paragraphs_to_process:
-        text = p.get_text().strip()
+    for i in range(step_start_index, len(texts)):
+        text = texts[i]
         if not text:
             continue
         
-        style = p.get('style', '')
-        left_match = re.search(r'left:(\d+)px', style)
-        left_pos = int(left_match.group(1)) if left_match else 0
-        top_match = re.search(r'top:(\d+)px', style)
-        top_pos = int(top_match.group(1)) if top_match else 0
+        left_pos = page_index.left(i)
         
         # 查找步骤数字
         step_match = re.match(r'(\d+)', text)
         if step_match and left_pos < 200:
             # 保存前一个步骤
-            if current_step and (current_step["action"] or current_step["expected_result"]):
+            if current_step and (current_step.action or current_step.expected_result):
                 test_script.append(current_step)
             
             # 创建新步骤
-            current_step = {
-                "step": step_match.group(1),
-                "action": text[len(step_match.group(1)):].strip(),
-                "expected_result": ""
-            }
+            current_step = TestStep(step_match.group(1), text[len(step_match.group(1)):].strip())
         elif current_step:
             # 收集动作和预期结果
             if left_pos < 300:  # 动作区域
-                if current_step["action"]:
-                    current_step["action"] += " " + text
+                if current_step.action:
+                    current_step.action += " " + text
                 else:
-                    current_step["action"] = text
+                    current_step.action = text
             else:  # 预期结果区域
-                if current_step["expected_result"]:
-                    current_step["expected_result"] += " " + text
+                if current_step.expected_result:
+                    current_step.expected_result += " " + text
                 else:
-                    current_step["expected_result"] = text
+                    current_step.expected_result = text
     
     # 添加最后一个步骤
-    if current_step and (current_step["action"] or current_step["expected_result"]):
+    if current_step and (current_step.action or current_step.expected_result):
         test_script.append(current_step)
     
     return test_script
@@ -93,19 +109,9 @@ def extract_test_script_from_html(html_content, page_number):
 def has_test_script_only(html_content):
     """
     检查页面是否只包含测试脚本（没有测试用例标题）
+    只通过页面文本预分类判断，不构建soup
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    text = soup.get_text()
-    
-    # 检查是否有测试用例标题 - 严格匹配格式
-    has_test_case = bool(re.search(r'\d+(\.\d+)*\s+Test case\s*[:\s].*\(Ver:\s*\d+\)', text))
-    
-    # 检查是否有测试脚本 - 查找步骤格式
-    has_script = bool(re.search(r'Step\s+Action', text, re.IGNORECASE)) or \
-                   bool(re.search(r'\d+\s+Read DID', text, re.IGNORECASE)) or \
-                   bool(re.search(r'\d+\s+[A-Z][a-z]', text))
-    
-    return has_script and not has_test_case
+    return classify_page(html_content, DOCUMENT_DVM) == PAGE_SCRIPT_CONTINUATION
 
 def extract_test_cases_from_html(html_content, page_number, include_requirements=False):
     """
@@ -116,665 +122,1048 @@ def extract_test_cases_from_html(html_content, page_number, include_requirements
         page_number: 页码
         include_requirements: 是否包含requirements字段，默认为False
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # 查找所有包含"Test case"的标题
-    test_case_headers = []
-    
-    # 查找所有可能包含测试用例的标题
-    for i in range(1, 7):
-        for heading in soup.find_all(f'h{i}'):
-            text = heading.get_text().strip()
-            # 只匹配真正的测试用例标题格式：数字+Test case+版本号
-            if re.match(r'\d+(\.\d+)*\s+Test case\s*[:\s].*\(Ver:\s*\d+\)', text):
-                test_case_headers.append(heading)
+    with extraction_stats.stage('parse'):
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        # 查找所有可能包含测试用例的标题
+        heading_titles = []
+        for i in range(1, 7):
+            for heading in soup.find_all(f'h{i}'):
+                text = heading.get_text().strip()
+                # 只匹配真正的测试用例标题格式：数字+Test case+版本号
+                if TEST_CASE_HEADER_PATTERN.match(text):
+                    heading_titles.append(text)
+        
+        page_index = PageTextIndex.from_soup(soup)
     
-    # 在HTML中查找包含"Test case"的段落作为标题
-    for p in soup.find_all('p'):
-        text = p.get_text().strip()
-        # 严格匹配测试用例标题格式：数字+Test case+描述+(Ver: 数字)
-        if re.match(r'\d+(\.\d+)*\s+Test case\s*[:\s].*\(Ver:\s*\d+\)', text):
-            test_case_headers.append(p)
+    return extract_test_cases_from_index(page_index, page_number, include_requirements, heading_titles)
+
+# 标签段落：(字段名, 触发文本, 内联内容正则, 结束标记)
+# 标签后没有内联内容时，收集后续段落直到遇到结束标记
+LABELED_SECTIONS = (
+    ("purpose", 'Purpose:', re.compile(r'Purpose:\s*(.*)', re.DOTALL),
+     ('Test', 'PreCondition', 'Description', 'Requirements', 'Test Script', 'PostCondition')),
+    ("precondition", 'PreCondition:', re.compile(r'PreCondition:\s*(.*)', re.DOTALL),
+     ('Test', 'Purpose', 'Description', 'Requirements', 'Test Script', 'PostCondition')),
+    ("postcondition", 'PostCondition:', re.compile(r'PostCondition:\s*(.*)', re.DOTALL),
+     ('Test', 'Purpose', 'PreCondition', 'Description', 'Requirements', 'Test Script')),
+    ("description", 'Description:', re.compile(r'(?:Test case )?Description:\s*(.*)', re.DOTALL),
+     ('Test', 'Purpose', 'PreCondition', 'Requirements', 'Test Script', 'PostCondition')),
+)
+
+# 需求表格和测试脚本表格的结束标记（包含即结束）
+REQUIREMENTS_END_MARKERS = ('Test Script Description', 'Test Script', 'Step Action')
+TEST_SCRIPT_END_MARKERS = ('Test Case ID:', 'PreCondition:', 'Purpose:', 'Description:', 'Requirements:')
+
+def next_marker_rows(texts, is_marker):
+    """
+    一次反向扫描计算每个位置之后第一个结束标记所在的行号
+
+    返回:
+        list: stops[i] 为 i 及之后第一个满足 is_marker 的非空段落行号，没有时为 len(texts)
+    """
+    stops = [len(texts)] * (len(texts) + 1)
+    for i in range(len(texts) - 1, -1, -1):
+        text = texts[i]
+        stops[i] = i if text and is_marker(text) else stops[i + 1]
+    return stops
+
+def clean_section_lines(lines):
+    """
+    清理标签段落文本，移除开头的·和多余的空格
+    """
+    cleaned_lines = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith('·'):
+            line = line[1:].strip()
+        if line:
+            cleaned_lines.append(line)
+    return " ".join(cleaned_lines)
+
+def parse_requirements_table(page_index, start, end):
+    """
+    解析需求表格，返回需求行列表
+
+    参数:
+        page_index: 页面定位文本索引
+        start, end: 表格所在的段落行号范围（不含end）
+    """
+    texts = page_index.texts
+    requirements = []
     
-    test_cases = []
+    # 收集所有段落，按top值排序来模拟表格行
+    requirement_data = []
     
-    for header in test_case_headers:
-        test_case = {
-            "page_number": page_number,
-            "title": header.get_text().strip(),
-            "test_case_id": "",
-            "legacy_id": "",
-            "purpose": "",
-            "precondition": "",
-            "description": "",
-            "requirements": [],
-            "test_script": []
-        }
+    # 首先收集所有带有样式的段落
+    for j in range(start, end):
+        next_text = texts[j]
+        if not next_text:
+            continue
         
-        # 查找测试用例ID
-        # 查找所有段落，寻找测试用例相关信息
-        all_paragraphs = soup.find_all('p')
-        for i, p in enumerate(all_paragraphs):
-            text = p.get_text().strip()
+        # 获取元素的坐标用于定位
+        if page_index.has_position(j):
+            top = page_index.tops[j]
+            left = page_index.lefts[j]
             
-            # 查找测试用例ID
-            if 'Test Case ID:' in text:
-                id_match = re.search(r'Test Case ID:\s*(\d+)', text)
-                if id_match:
-                    test_case["test_case_id"] = id_match.group(1)
-                else:
-                    # 如果没有在当前段落找到ID，检查下一个段落
-                    if i + 1 < len(all_paragraphs):
-                        next_text = all_paragraphs[i+1].get_text().strip()
-                        id_match = re.search(r'(\d+)', next_text)
-                        if id_match:
-                            test_case["test_case_id"] = id_match.group(1)
+            # 排除表头行
+            if 'Requirement' in next_text and 'Req ID' in next_text:
+                continue
             
-            # 查找Legacy ID
-            if 'Legacy ID:' in text:
-                # Legacy ID可能在下一行
-                legacy_match = re.search(r'Legacy ID:\s*(\S+)', text)
-                if not legacy_match:
-                    # 检查下一个段落
-                    if i + 1 < len(all_paragraphs):
-                        next_text = all_paragraphs[i+1].get_text().strip()
-                        if next_text and not next_text.startswith(('Test', 'Purpose', 'PreCondition', 'Description', 'Requirements', 'Test Script')):
-                            test_case["legacy_id"] = next_text
-                else:
-                    test_case["legacy_id"] = legacy_match.group(1)
+            # 收集所有非空的文本
+            if next_text and next_text != 'Requirement':
+                requirement_data.append(PositionedText(next_text, top, left))
+    
+    # 按top值分组，同一行的元素top值相近（允许15px误差）
+    if requirement_data:
+        # 处理每一行数据
+        for row_items in cluster_rows(requirement_data, key=lambda item: item.top):
+            # 按left值排序来识别列
+            row_items.sort(key=lambda x: x.left)
             
-            # 查找Purpose
-            if 'Purpose:' in text:
-                purpose_match = re.search(r'Purpose:\s*(.*)', text, re.DOTALL)
-                if purpose_match and purpose_match.group(1).strip():
-                    test_case["purpose"] = purpose_match.group(1).strip()
-                else:
-                    # 如果没有在当前段落找到Purpose，检查后续段落直到遇到其他标记
-                    j = i + 1
-                    purpose_lines = []
-                    while j < len(all_paragraphs):
-                        next_text = all_paragraphs[j].get_text().strip()
-                        if not next_text:
-                            j += 1
-                            continue
-                            
-                        # 检查是否遇到其他标记，但允许以·开头的文本
-                        is_other_marker = False
-                        for marker in ['Test', 'PreCondition', 'Description', 'Requirements', 'Test Script', 'PostCondition']:
-                            if next_text.startswith(marker) and not next_text.startswith('·'):
-                                is_other_marker = True
-                                break
-                        
-                        if is_other_marker:
-                            break
-                            
-                        # 收集Purpose文本，包括以·开头的
-                        purpose_lines.append(next_text)
-                        j += 1
-                    
-                    if purpose_lines:
-                        # 清理Purpose文本，移除开头的·和多余的空格
-                        cleaned_lines = []
-                        for line in purpose_lines:
-                            line = line.strip()
-                            if line.startswith('·'):
-                                line = line[1:].strip()
-                            if line:
-                                cleaned_lines.append(line)
-                        test_case["purpose"] = " ".join(cleaned_lines)
+            # 提取列数据
+            columns = [item.text for item in row_items]
             
-            # 查找PreCondition
-            if 'PreCondition:' in text:
-                precondition_match = re.search(r'PreCondition:\s*(.*)', text, re.DOTALL)
-                if precondition_match and precondition_match.group(1).strip():
-                    test_case["precondition"] = precondition_match.group(1).strip()
-                else:
-                    # 如果没有在当前段落找到PreCondition，检查后续段落直到遇到其他标记
-                    j = i + 1
-                    precondition_lines = []
-                    while j < len(all_paragraphs):
-                        next_text = all_paragraphs[j].get_text().strip()
-                        if not next_text:
-                            j += 1
-                            continue
-                            
-                        # 检查是否遇到其他标记，但允许以·开头的文本
-                        is_other_marker = False
-                        for marker in ['Test', 'Purpose', 'Description', 'Requirements', 'Test Script', 'PostCondition']:
-                            if next_text.startswith(marker) and not next_text.startswith('·'):
-                                is_other_marker = True
-                                break
-                        
-                        if is_other_marker:
-                            break
-                            
-                        # 收集PreCondition文本，包括以·开头的
-                        precondition_lines.append(next_text)
-                        j += 1
-                    
-                    if precondition_lines:
-                        # 清理PreCondition文本，移除开头的·和多余的空格
-                        cleaned_lines = []
-                        for line in precondition_lines:
-                            line = line.strip()
-                            if line.startswith('·'):
-                                line = line[1:].strip()
-                            if line:
-                                cleaned_lines.append(line)
-                        test_case["precondition"] = " ".join(cleaned_lines)
+            # 跳过表头行（包含"Requirement"和"Req ID"的行）
+            is_header = False
+            for col in columns:
+                if 'Requirement' in col and 'Req ID' in col:
+                    is_header = True
+                    break
+                elif 'Req ID' in col and 'Ver' in col:
+                    is_header = True
+                    break
             
-            # 查找PostCondition
-            if 'PostCondition:' in text:
-                postcondition_match = re.search(r'PostCondition:\s*(.*)', text, re.DOTALL)
-                if postcondition_match and postcondition_match.group(1).strip():
-                    test_case["postcondition"] = postcondition_match.group(1).strip()
-                else:
-                    # 如果没有在当前段落找到PostCondition，检查后续段落直到遇到其他标记
-                    j = i + 1
-                    postcondition_lines = []
-                    while j < len(all_paragraphs):
-                        next_text = all_paragraphs[j].get_text().strip()
-                        if not next_text:
-                            j += 1
-                            continue
-                            
-                        # 检查是否遇到其他标记，但允许以·开头的文本
-                        is_other_marker = False
-                        for marker in ['Test', 'Purpose', 'PreCondition', 'Description', 'Requirements', 'Test Script']:
-                            if next_text.startswith(marker) and not next_text.startswith('·'):
-                                is_other_marker = True
-                                break
-                        
-                        if is_other_marker:
-                            break
-                            
-                        # 收集PostCondition文本，包括以·开头的
-                        postcondition_lines.append(next_text)
-                        j += 1
-                    
-                    if postcondition_lines:
-                        # 清理PostCondition文本，移除开头的·和多余的空格
-                        cleaned_lines = []
-                        for line in postcondition_lines:
-                            line = line.strip()
-                            if line.startswith('·'):
-                                line = line[1:].strip()
-                            if line:
-                                cleaned_lines.append(line)
-                        test_case["postcondition"] = " ".join(cleaned_lines)
+            if is_header:
+                continue
             
-            # 查找Description
-            if 'Description:' in text or 'Test case Description:' in text:
-                description_match = re.search(r'(Test case )?Description:\s*(.*)', text, re.DOTALL)
-                if description_match and description_match.group(2).strip():
-                    test_case["description"] = description_match.group(2).strip()
-                else:
-                    # 如果没有在当前段落找到Description，检查后续段落直到遇到其他标记
-                    j = i + 1
-                    description_lines = []
-                    while j < len(all_paragraphs):
-                        next_text = all_paragraphs[j].get_text().strip()
-                        if not next_text:
-                            j += 1
-                            continue
-                            
-                        # 检查是否遇到其他标记，但允许以·开头的描述文本
-                        is_other_marker = False
-                        for marker in ['Test', 'Purpose', 'PreCondition', 'Requirements', 'Test Script', 'PostCondition']:
-                            if next_text.startswith(marker) and not next_text.startswith('·'):
-                                is_other_marker = True
-                                break
-                        
-                        if is_other_marker:
-                            break
-                            
-                        # 收集描述文本，包括以·开头的
-                        description_lines.append(next_text)
-                        j += 1
-                    
-                    if description_lines:
-                        # 清理描述文本，移除开头的·和多余的空格
-                        cleaned_lines = []
-                        for line in description_lines:
-                            line = line.strip()
-                            if line.startswith('·'):
-                                line = line[1:].strip()
-                            if line:
-                                cleaned_lines.append(line)
-                        test_case["description"] = " ".join(cleaned_lines)
+            # 跳过完全匹配表头文本的行
+            if len(columns) >= 2 and columns[0] == "Requirement" and columns[1] == "Req ID":
+                continue
             
-            # 查找需求表格 - 仅在include_requirements为True时处理
-            if 'Requirements:' in text and include_requirements:
-                # 需求信息在后续段落中
-                next_elements = all_paragraphs[i+1:]
-                # 查找需求信息的结束标记
-                end_markers = ['Test Script Description', 'Test Script', 'Step Action']
-                
-                # 收集所有段落，按top值排序来模拟表格行
-                requirement_data = []
-                
-                # 首先收集所有带有样式的段落
-                for j, next_p in enumerate(next_elements):
-                    next_text = next_p.get_text().strip()
-                    if not next_text:
-                        continue
-                    
-                    # 检查是否到达结束标记
-                    if any(marker in next_text for marker in end_markers):
-                        break
-                    
-                    # 获取元素的样式属性用于定位
-                    style = next_p.get('style', '')
-                    top_match = re.search(r'top:(\d+)px', style)
-                    left_match = re.search(r'left:(\d+)px', style)
-                    
-                    if top_match and left_match:
-                        top = int(top_match.group(1))
-                        left = int(left_match.group(1))
-                        
-                        # 排除表头行
-                        if 'Requirement' in next_text and 'Req ID' in next_text:
-                            continue
-                        
-                        # 收集所有非空的文本
-                        if next_text and next_text != 'Requirement':
-                            requirement_data.append({
-                                'text': next_text,
-                                'top': top,
-                                'left': left
-                            })
-                
-                # 按top值分组，同一行的元素top值相近
-                if requirement_data:
-                    rows = {}
-                    for item in requirement_data:
-                        # 找到相近的top值组（允许15px误差）
-                        row_key = None
-                        for key in rows.keys():
-                            if abs(key - item['top']) <= 15:
-                                row_key = key
-                                break
-                        
-                        if row_key is None:
-                            row_key = item['top']
-                            rows[row_key] = []
-                        
-                        rows[row_key].append(item)
-                    
-                    # 处理每一行数据
-                    for top_value in sorted(rows.keys()):
-                        row_items = rows[top_value]
-                        # 按left值排序来识别列
-                        row_items.sort(key=lambda x: x['left'])
-                        
-                        # 提取列数据
-                        columns = [item['text'] for item in row_items]
-                        
-                        # 跳过表头行（包含"Requirement"和"Req ID"的行）
-                        is_header = False
-                        for col in columns:
-                            if 'Requirement' in col and 'Req ID' in col:
-                                is_header = True
-                                break
-                            elif 'Req ID' in col and 'Ver' in col:
-                                is_header = True
-                                break
-                        
-                        if is_header:
-                            continue
-                        
-                        # 跳过完全匹配表头文本的行
-                        if len(columns) >= 2 and columns[0] == "Requirement" and columns[1] == "Req ID":
-                            continue
-                        
-                        # 根据列数和位置判断数据结构
-                        if len(columns) >= 4:
-                            # 标准的4列数据：Requirement, Req ID, Ver, Status
-                            requirement = {
-                                "requirement": columns[0],
-                                "req_id": columns[1],
-                                "ver": columns[2] if len(columns) > 2 else "",
-                                "status": columns[3] if len(columns) > 3 else ""
-                            }
-                            test_case["requirements"].append(requirement)
-                        elif len(columns) == 3:
-                            # 3列数据：Requirement, Req ID, Ver
-                            requirement = {
-                                "requirement": columns[0],
-                                "req_id": columns[1],
-                                "ver": columns[2],
-                                "status": ""
-                            }
-                            test_case["requirements"].append(requirement)
-                        elif len(columns) == 2:
-                            # 2列数据：Requirement, Req ID
-                            requirement = {
-                                "requirement": columns[0],
-                                "req_id": columns[1],
-                                "ver": "",
-                                "status": ""
-                            }
-                            test_case["requirements"].append(requirement)
-                        elif len(columns) == 1 and columns[0] and not columns[0].startswith('Test'):
-                            # 单列数据：只有Requirement
-                            requirement = {
-                                "requirement": columns[0],
-                                "req_id": "",
-                                "ver": "",
-                                "status": ""
-                            }
-                            test_case["requirements"].append(requirement)
+            # 根据列数和位置判断数据结构
+            if len(columns) >= 4:
+                # 标准的4列数据：Requirement, Req ID, Ver, Status
+                requirement = RequirementRow(columns[0], columns[1], columns[2], columns[3])
+                requirements.append(requirement)
+            elif len(columns) == 3:
+                # 3列数据：Requirement, Req ID, Ver
+                requirement = RequirementRow(columns[0], columns[1], columns[2])
+                requirements.append(requirement)
+            elif len(columns) == 2:
+                # 2列数据：Requirement, Req ID
+                requirement = RequirementRow(columns[0], columns[1])
+                requirements.append(requirement)
+            elif len(columns) == 1 and columns[0] and not columns[0].startswith('Test'):
+                # 单列数据：只有Requirement
+                requirement = RequirementRow(columns[0])
+                requirements.append(requirement)
+    
+    return requirements
+
+def parse_test_steps(page_index, start, end, test_script):
+    """
+    解析测试脚本表格，把测试步骤追加到test_script
+    不以步骤号开头的行合并到test_script中的上一个步骤
+
+    参数:
+        page_index: 页面定位文本索引
+        start, end: 表格所在的段落行号范围（不含end）
+        test_script: 测试步骤列表
+    """
+    texts = page_index.texts
+    
+    # 用于存储测试步骤的临时列表
+    step_elements = []
+    
+    # 收集测试步骤元素
+    for j in range(start, end):
+        next_text = texts[j]
+        
+        # 跳过表头行
+        if 'Step' in next_text and 'Action' in next_text and 'Expected Result' in next_text:
+            continue
+        
+        # 跳过空文本
+        if not next_text:
+            continue
+        
+        # 获取元素的top和left坐标
+        step_elements.append(PositionedText(next_text, page_index.top(j), page_index.left(j)))
+    
+    # 按top值分组，同一行的元素top值相近（允许15px误差）
+    step_groups = cluster_rows(step_elements, key=lambda element: element.top)
+    for group in step_groups:
+        # 按left值排序
+        group.sort(key=lambda x: x.left)
+    
+    # 根据动作和预期结果文本的left分布确定两列的分界（步骤号不参与）
+    column_lefts = []
+    for group in step_groups:
+        content = group[1:] if re.match(r'^\d+\s*$', group[0].text) else group
+        column_lefts.extend(element.left for element in content)
+    column_boundary = detect_column_boundary(column_lefts)
+    
+    # 处理每个组，构建测试步骤
+    for group in step_groups:
+        # 识别步骤号、动作和预期结果
+        if len(group) >= 1:
+            # 检查第一个元素是否是步骤号
+            first_element = group[0]
+            step_number_match = re.match(r'^\d+\s*$', first_element.text)
             
-            # 查找测试脚本描述
-            if 'Test Script Description' in text:
-                # 测试脚本信息在后续段落中
-                next_elements = all_paragraphs[i+1:]
-                # 查找测试脚本信息的结束标记
-                end_markers = ['Test Case ID:', 'PreCondition:', 'Purpose:', 'Description:', 'Requirements:']
+            if step_number_match:
+                # 确实是步骤号
+                step_number = first_element.text.strip()
+                step = TestStep(step_number)
                 
-                # 用于存储测试步骤的临时列表
-                step_elements = []
+                # 处理动作和预期结果
+                action_parts = []
+                expected_result_parts = []
                 
-                # 收集测试步骤元素
-                for next_p in next_elements:
-                    next_text = next_p.get_text().strip()
-                    
-                    # 检查是否到达结束标记
-                    if any(marker in next_text for marker in end_markers):
-                        break
-                    
-                    # 跳过表头行
-                    if 'Step' in next_text and 'Action' in next_text and 'Expected Result' in next_text:
-                        continue
-                    
-                    # 跳过空文本
-                    if not next_text:
-                        continue
-                    
-                    # 获取元素的top和left样式属性
-                    style = next_p.get('style', '')
-                    top_match = re.search(r'top:(\d+)px', style)
-                    left_match = re.search(r'left:(\d+)px', style)
-                    top = int(top_match.group(1)) if top_match else 0
-                    left = int(left_match.group(1)) if left_match else 0
-                    
-                    step_elements.append({
-                        'text': next_text,
-                        'top': top,
-                        'left': left,
-                        'element': next_p
-                    })
+                for element in group[1:]:
+                    if element.left < column_boundary:  # 动作区域
+                        action_parts.append(element.text)
+                    else:  # 预期结果区域
+                        expected_result_parts.append(element.text)
                 
-                # 按top值分组，同一行的元素top值相近
-                step_groups = {}
-                for element in step_elements:
-                    # 找到相近的top值组
-                    group_key = None
-                    for key in step_groups.keys():
-                        if abs(key - element['top']) <= 15:  # 允许15px的误差
-                            group_key = key
-                            break
-                    
-                    if group_key is None:
-                        group_key = element['top']
-                        step_groups[group_key] = []
-                    
-                    step_groups[group_key].append(element)
+                step.action = " ".join(action_parts)
+                step.expected_result = " ".join(expected_result_parts)
                 
-                # 处理每个组，构建测试步骤
-                for top_value in sorted(step_groups.keys()):
-                    group = step_groups[top_value]
-                    # 按left值排序
-                    group.sort(key=lambda x: x['left'])
-                    
-                    # 识别步骤号、动作和预期结果
-                    if len(group) >= 1:
-                        # 检查第一个元素是否是步骤号
-                        first_element = group[0]
-                        step_number_match = re.match(r'^\d+\s*$', first_element['text'])
-                        
-                        if step_number_match:
-                            # 确实是步骤号
-                            step_number = first_element['text'].strip()
-                            step = {
-                                "step": step_number,
-                                "action": "",
-                                "expected_result": ""
-                            }
-                            
-                            # 处理动作和预期结果
-                            action_parts = []
-                            expected_result_parts = []
-                            
-                            for element in group[1:]:
-                                if element['left'] < 250:  # 动作区域 (left < 250)
-                                    action_parts.append(element['text'])
-                                else:  # 预期结果区域 (left >= 250)
-                                    expected_result_parts.append(element['text'])
-                            
-                            step["action"] = " ".join(action_parts)
-                            step["expected_result"] = " ".join(expected_result_parts)
-                            
-                            test_case["test_script"].append(step)
-                        else:
-                            # 不是步骤号，可能是跨行的动作或预期结果描述
-                            # 检查这些文本应该属于动作还是预期结果区域
-                            for element in group:
-                                if element['left'] < 250:  # 动作区域
-                                    if test_case["test_script"]:
-                                        # 添加到上一个步骤的动作中
-                                        test_case["test_script"][-1]["action"] += " " + element['text']
-                                else:  # 预期结果区域
-                                    if test_case["test_script"]:
-                                        # 添加到上一个步骤的预期结果中
-                                        test_case["test_script"][-1]["expected_result"] += " " + element['text']
+                test_script.append(step)
+            else:
+                # 不是步骤号，可能是跨行的动作或预期结果描述
+                # 检查这些文本应该属于动作还是预期结果区域
+                for element in group:
+                    if element.left < column_boundary:  # 动作区域
+                        if test_script:
+                            # 添加到上一个步骤的动作中
+                            test_script[-1].action += " " + element.text
+                    else:  # 预期结果区域
+                        if test_script:
+                            # 添加到上一个步骤的预期结果中
+                            test_script[-1].expected_result += " " + element.text
+
+def fill_test_case_region(test_case, page_index, start, end, stops, include_requirements=False):
+    """
+    单次顺序扫描一个测试用例区域内的段落，填充测试用例的各个字段
+    同一字段出现多次时，以最后一次出现为准（需求和测试步骤则依次累加）
+
+    参数:
+        test_case: 测试用例（TestCase）
+        page_index: 页面定位文本索引
+        start, end: 区域的段落行号范围（不含end）
+        stops: 各结束标记的下一行号表（见 next_marker_rows）
+        include_requirements: 是否解析需求表格
+    """
+    texts = page_index.texts
+    
+    for i in range(start, end):
+        text = texts[i]
+        if not text:
+            continue
+        
+        # 查找测试用例ID
+        if 'Test Case ID:' in text:
+            id_match = re.search(r'Test Case ID:\s*(\d+)', text)
+            if id_match:
+                test_case.test_case_id = id_match.group(1)
+            else:
+                # 如果没有在当前段落找到ID，检查下一个段落
+                if i + 1 < len(texts):
+                    next_text = texts[i+1]
+                    id_match = re.search(r'(\d+)', next_text)
+                    if id_match:
+                        test_case.test_case_id = id_match.group(1)
+        
+        # 查找Legacy ID
+        if 'Legacy ID:' in text:
+            # Legacy ID可能在下一行
+            legacy_match = re.search(r'Legacy ID:\s*(\S+)', text)
+            if not legacy_match:
+                # 检查下一个段落
+                if i + 1 < len(texts):
+                    next_text = texts[i+1]
+                    if next_text and not next_text.startswith(('Test', 'Purpose', 'PreCondition', 'Description', 'Requirements', 'Test Script')):
+                        test_case.legacy_id = next_text
+            else:
+                test_case.legacy_id = legacy_match.group(1)
+        
+        # 查找Purpose、PreCondition、PostCondition和Description
+        for field, label, pattern, _ in LABELED_SECTIONS:
+            if label not in text:
+                continue
+            match = pattern.search(text)
+            if match and match.group(1).strip():
+                setattr(test_case, field, match.group(1).strip())
+            else:
+                # 如果没有在当前段落找到内容，收集后续段落直到遇到其他标记（以·开头的文本不是标记）
+                section_end = min(stops[field][i + 1], end)
+                lines = [texts[j] for j in range(i + 1, section_end) if texts[j]]
+                if lines:
+                    setattr(test_case, field, clean_section_lines(lines))
+        
+        # 查找需求表格 - 仅在include_requirements为True时处理
+        if 'Requirements:' in text and include_requirements:
+            # 需求信息在后续段落中，直到遇到结束标记
+            table_end = min(stops["requirements"][i + 1], end)
+            with extraction_stats.stage('requirements'):
+                test_case.requirements.extend(parse_requirements_table(page_index, i + 1, table_end))
+        
+        # 查找测试脚本描述
+        if 'Test Script Description' in text:
+            # 测试脚本信息在后续段落中，直到遇到结束标记
+            table_end = min(stops["test_script"][i + 1], end)
+            with extraction_stats.stage('steps'):
+                parse_test_steps(page_index, i + 1, table_end, test_case.test_script)
+
+def extract_test_cases_from_index(page_index, page_number, include_requirements=False, heading_titles=()):
+    """
+    从页面定位文本索引中提取测试用例信息
+    
+    各字段在整个页面上只顺序扫描一次，页面中的每个测试用例标题都得到这次扫描的结果：
+    一个页面有多个标题时，每个测试用例的ID、各段落、需求和测试步骤都与原来逐标题扫描整页的结果相同
+    （字段以页面中最后一次出现为准，测试步骤是页面中所有步骤表格的步骤）
+    
+    参数:
+        page_index: 页面定位文本索引
+        page_number: 页码
+        include_requirements: 是否包含requirements字段，默认为False
+        heading_titles: 页面中<h1>-<h6>测试用例标题的文本（pdftohtml页面通常没有）
+    """
+    texts = page_index.texts
+    
+    with extraction_stats.stage('header_detection'):
+        # 查找所有包含"Test case"的标题
+        # 在页面中查找包含"Test case"的段落作为标题
+        # 严格匹配测试用例标题格式：数字+Test case+描述+(Ver: 数字)
+        titles = list(heading_titles) + [text for text in texts if TEST_CASE_HEADER_PATTERN.match(text)]
+        
+        if not titles:
+            return []
+        
+        # 各标签段落和表格的结束位置，整页只计算一次
+        stops = {field: next_marker_rows(texts, lambda text, markers=markers: text.startswith(markers))
+                 for field, _, _, markers in LABELED_SECTIONS}
+        stops["requirements"] = next_marker_rows(texts, lambda text: any(marker in text for marker in REQUIREMENTS_END_MARKERS))
+        stops["test_script"] = next_marker_rows(texts, lambda text: any(marker in text for marker in TEST_SCRIPT_END_MARKERS))
+    
+    page_fields = TestCase(page_number, "")
+    with extraction_stats.stage('fields'):
+        fill_test_case_region(page_fields, page_index, 0, len(texts), stops, include_requirements)
+    
+    test_cases = []
+    
+    for title in titles:
+        # 每个测试用例使用各自的需求和步骤记录，跨页合并时不会互相影响
+        test_case = TestCase(
+            page_number, title, page_fields.test_case_id, page_fields.legacy_id,
+            page_fields.purpose, page_fields.precondition, page_fields.description,
+            [RequirementRow(row.requirement, row.req_id, row.ver, row.status) for row in page_fields.requirements],
+            [TestStep(step.step, step.action, step.expected_result) for step in page_fields.test_script],
+            page_fields.postcondition
+        )
         
         # 只有当测试用例有ID时才添加到结果中
-        if test_case["test_case_id"]:
+        if test_case.test_case_id:
             test_cases.append(test_case)
         else:
             # 添加调试信息
-            print(f"Test case without ID found on page {page_number}: {test_case['title']}")
+            print(f"Test case without ID found on page {page_number}: {test_case.title}")
+            extraction_stats.count('test_cases_without_id')
             # 如果标题包含"Test case"，但没有ID，也添加到结果中
-            if "Test case" in test_case["title"]:
-                # 处理累积的动作文本（即使没有ID）
-                if '_pending_action_parts' in test_case and test_case['_pending_action_parts']:
-                    if test_case["test_script"]:
-                        # 将累积的文本添加到上一个步骤的动作中
-                        test_case["test_script"][-1]["action"] += " " + " ".join(test_case['_pending_action_parts']).strip()
-                    # 清除暂存的文本
-                    del test_case['_pending_action_parts']
+            if "Test case" in test_case.title:
                 test_cases.append(test_case)
     
     return test_cases
 
-def process_html_files(input_dir, output_dir):
+def dvm_page_number(name, page_pattern=DVM_PAGE_PATTERN):
+    """
+    从页面文件名（默认 CC_DVM-<页码>.html）中提取页码，不匹配时为0
+    """
+    page_match = page_pattern.search(name)
+    return int(page_match.group('page')) if page_match else 0
+
+def list_html_pages(input_dir, page_pattern=DVM_PAGE_PATTERN):
+    """
+    获取目录中的所有HTML文件并按页码排序
+    """
+    html_files = list(Path(input_dir).glob("*.html"))
+    html_files.sort(key=lambda x: dvm_page_number(x.name, page_pattern))
+    return html_files
+
+def discover_documents(root_dir, page_pattern=CORPUS_PAGE_PATTERN):
+    """
+    在目录树中查找所有文档：按所在目录和文件名中的 doc 分组把页面归为文档
+    文件名不匹配 page_pattern 的HTML文件被忽略
+    
+    返回:
+        dict: {文档标识(相对路径/文档名): 按页码排序的HTML文件列表}，按文档标识排序
+    """
+    root_path = Path(root_dir)
+    documents = {}
+    for html_file in root_path.rglob("*.html"):
+        page_match = page_pattern.search(html_file.name)
+        if not page_match:
+            continue
+        doc_name = page_match.groupdict().get('doc') or html_file.parent.name
+        document_id = (html_file.parent.relative_to(root_path) / doc_name).as_posix()
+        documents.setdefault(document_id, []).append(html_file)
+    
+    for html_files in documents.values():
+        html_files.sort(key=lambda x: (dvm_page_number(x.name, page_pattern), x.name))
+    return dict(sorted(documents.items()))
+
+def extract_html_page_fragment(html_file, page_number):
+    """
+    映射阶段：读取并解析单个HTML页面，只提取页面自身的内容，不涉及跨页合并
+    
+    返回:
+        tuple: 页面片段 (页面名称, 页码, 测试用例列表, 续页测试脚本)
+               页面不是只包含测试脚本的续页时，续页测试脚本为空列表
+    """
+    # 读取HTML文件
+    with extraction_stats.stage('read'):
+        with open(html_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+    
+    # 预分类确定没有测试用例标题的页面不需要完整解析
+    with extraction_stats.stage('classify'):
+        page_class = classify_page(html_content, DOCUMENT_DVM)
+    extraction_stats.count(f'pages_{page_class}')
+    
+    # 提取测试用例（默认不包含requirements字段）
+    if page_class == PAGE_TEST_CASE_HEADER:
+        test_cases = extract_test_cases_from_html(html_content, page_number)
+    else:
+        test_cases = []
+    
+    if page_class == PAGE_SCRIPT_CONTINUATION:
+        continuation_script = extract_test_script_from_html(html_content, page_number)
+    else:
+        continuation_script = []
+    
+    return html_file.name, page_number, test_cases, continuation_script
+
+def extract_index_page_fragment(name, page_number, page_index, headings=()):
+    """
+    映射阶段：从页面定位文本索引（XML文档或页面缓存）提取单个页面的片段
+    返回值与 extract_html_page_fragment 相同
+    
+    headings: 页面中<h1>-<h6>标题的文本（页面缓存保存了这些标题，定位文本索引中没有），
+              与HTML输入一样参与预分类，其中的测试用例标题作为整页区域的测试用例
+    """
+    with extraction_stats.stage('classify'):
+        page_class = classify_text('\n'.join([page_index.text(), *headings]), DOCUMENT_DVM)
+    extraction_stats.count(f'pages_{page_class}')
+    
+    if page_class == PAGE_TEST_CASE_HEADER:
+        heading_titles = [text for text in headings if TEST_CASE_HEADER_PATTERN.match(text)]
+        test_cases = extract_test_cases_from_index(page_index, page_number, heading_titles=heading_titles)
+    else:
+        test_cases = []
+    
+    if page_class == PAGE_SCRIPT_CONTINUATION:
+        with extraction_stats.stage('steps'):
+            continuation_script = extract_test_script_from_index(page_index, page_number)
+    else:
+        continuation_script = []
+    
+    return name, page_number, test_cases, continuation_script
+
+def fragment_to_json(fragment):
+    """
+    把页面片段转换为可以保存为JSON的形式（用于增量提取清单）
+    """
+    name, page_number, test_cases, continuation_script = fragment
+    return [name, page_number, test_cases_to_dicts(test_cases), [step.to_dict() for step in continuation_script]]
+
+def fragment_from_json(data):
+    """
+    从 fragment_to_json 的结果恢复页面片段
+    """
+    name, page_number, test_cases, continuation_script = data
+    return (name, page_number, [TestCase.from_dict(test_case) for test_case in test_cases],
+            [TestStep.from_dict(step) for step in continuation_script])
+
+def html_page_fragments(html_files, jobs=1, page_pattern=DVM_PAGE_PATTERN):
+    """
+    按页码顺序产生HTML页面的片段
+    jobs大于1时在进程池中并行解析页面，结果仍按页码顺序产生
+    """
+    page_numbers = [dvm_page_number(html_file.name, page_pattern) for html_file in html_files]
+    stats = extraction_stats.active()
+    if jobs and jobs > 1:
+        chunksize = max(1, len(html_files) // (jobs * 8))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            if stats is None:
+                yield from executor.map(extract_html_page_fragment, html_files, page_numbers, chunksize=chunksize)
+                return
+            # 工作进程中记录的统计随页面片段返回
+            results = executor.map(extraction_stats.run_page, [html_file.name for html_file in html_files],
+                                   repeat(extract_html_page_fragment), html_files, page_numbers, chunksize=chunksize)
+            for fragment, page_stats in results:
+                stats.merge(page_stats)
+                yield fragment
+    else:
+        for html_file, page_number in zip(html_files, page_numbers):
+            with extraction_stats.page(html_file.name):
+                fragment = extract_html_page_fragment(html_file, page_number)
+            yield fragment
+
+def xml_page_fragments(xml_file, font_class_format=DEFAULT_FONT_CLASS_FORMAT):
+    """
+    逐页流式读取pdftohtml -xml文档，按文档顺序产生页面片段
+    """
+    xml_path = Path(xml_file)
+    pages = iter_xml_pages(xml_path, font_class_format)
+    while True:
+        with extraction_stats.stage('parse'):
+            page = next(pages, None)
+        if page is None:
+            break
+        page_number, page_index = page
+        name = f"{xml_path.name} page {page_number}"
+        with extraction_stats.page(name):
+            fragment = extract_index_page_fragment(name, page_number, page_index)
+        yield fragment
+
+def cache_page_fragments(page_cache, page_pattern=DVM_PAGE_PATTERN):
+    """
+    从 page_cache.py 编译的页面缓存中按页码顺序产生页面片段
+    """
+    names = page_cache.names()
+    names.sort(key=lambda name: dvm_page_number(name, page_pattern))
+    for name in names:
+        with extraction_stats.page(name):
+            with extraction_stats.stage('parse'):
+                headings = page_cache.headings(name)
+                page_index = page_cache.page_index(name)
+            fragment = extract_index_page_fragment(name, dvm_page_number(name, page_pattern), page_index, headings)
+        yield fragment
+
+class PageFragments:
+    """
+    归约阶段的输入：按页码顺序排列的页面片段
+    
+    预读一个片段，保证处理第N页时第N+1页的续页测试脚本已经可用；
+    各页的续页测试脚本在读取时记录下来，供后续的跨页合并查询。
+    跨页合并只会查询第N+1页和尚无测试脚本的待处理测试用例所在页的下一页，
+    通过 retain_pages 丢弃不会再被查询的页面，内存中只保留这几页
+    """
+    
+    def __init__(self, fragments):
+        self.fragments = fragments
+        self.page_count = 0
+        # 已读取页面的续页测试脚本：页码 -> 测试脚本（不是续页的页面为空列表）
+        self.continuation_scripts = {}
+    
+    def __len__(self):
+        return self.page_count
+    
+    def pages(self):
+        """
+        按页码顺序依次返回 (页面名称, 页码, 测试用例列表)
+        """
+        previous = None
+        for name, page_number, test_cases, continuation_script in self.fragments:
+            self.page_count += 1
+            self.continuation_scripts[page_number] = continuation_script
+            
+            if previous is not None:
+                yield previous
+            previous = (name, page_number, test_cases)
+        
+        if previous is not None:
+            yield previous
+    
+    def retain_pages(self, page_numbers):
+        """
+        只保留给定页码的续页测试脚本，其他已读取的页面之后不能再查询
+        """
+        for released in [number for number in self.continuation_scripts if number not in page_numbers]:
+            del self.continuation_scripts[released]
+    
+    def has_page(self, page_number):
+        """
+        检查页码对应的页面是否存在（只对已读取且尚未丢弃的页面有效）
+        """
+        return page_number in self.continuation_scripts
+    
+    def continuation_script(self, page_number):
+        """
+        页面只包含测试脚本（没有测试用例标题）时返回其测试脚本，否则返回空列表
+        返回副本，避免同一续页的测试脚本被多个测试用例共享后相互修改
+        """
+        return list(self.continuation_scripts.get(page_number, []))
+
+def process_html_files(input_dir, output_dir, sqlite_db=None, jobs=1, ndjson=False, page_pattern=DVM_PAGE_PATTERN):
     """
     处理目录中的所有HTML文件，提取测试用例并保存为JSON文件
     支持跨页的测试用例分析
+    
+    参数:
+        input_dir: 输入目录路径
+        output_dir: 输出目录路径
+        sqlite_db: SQLite数据库路径（可选），指定时同时将所有测试用例写入数据库
+        jobs: 并行解析页面的进程数，大于1时各页面在进程池中并行提取（映射），
+              跨页合并仍按页码顺序串行进行（归约），结果与串行处理一致
+        ndjson: 为True时汇总结果输出为每行一个测试用例的 all_test_cases.ndjson
+        page_pattern: 页面文件名格式（正则表达式，page 分组为页码）
+    
+    返回:
+        int: 测试用例总数
+    """
+    fragments = html_page_fragments(list_html_pages(input_dir, page_pattern), jobs, page_pattern)
+    return process_pages(PageFragments(fragments), output_dir, sqlite_db, str(input_dir), ndjson)
+
+def process_xml_file(xml_file, output_dir, sqlite_db=None, font_class_format=DEFAULT_FONT_CLASS_FORMAT, ndjson=False):
+    """
+    处理pdftohtml -xml生成的XML文档，提取测试用例并保存为JSON文件
+    跨页分析与 process_html_files 相同
+    
+    参数:
+        xml_file: XML文件路径
+        output_dir: 输出目录路径
+        sqlite_db: SQLite数据库路径（可选）
+        font_class_format: 字体编号到字体类名的映射格式
+        ndjson: 为True时汇总结果输出为 all_test_cases.ndjson
+    """
+    return process_pages(PageFragments(xml_page_fragments(xml_file, font_class_format)), output_dir, sqlite_db, str(xml_file), ndjson)
+
+def process_cache_file(cache_file, output_dir, sqlite_db=None, ndjson=False, page_pattern=DVM_PAGE_PATTERN):
+    """
+    处理 page_cache.py 编译的页面缓存文件，输出与处理原HTML页面目录相同
+    
+    参数:
+        cache_file: 页面缓存文件路径
+        output_dir: 输出目录路径
+        sqlite_db: SQLite数据库路径（可选）
+        ndjson: 为True时汇总结果输出为 all_test_cases.ndjson
+        page_pattern: 页面文件名格式（正则表达式，page 分组为页码）
+    """
+    with PageCache(cache_file) as page_cache:
+        fragments = cache_page_fragments(page_cache, page_pattern)
+        return process_pages(PageFragments(fragments), output_dir, sqlite_db, page_cache.source_dir, ndjson)
+
+def process_html_files_incremental(input_dir, output_dir, jobs=1, ndjson=False, page_pattern=DVM_PAGE_PATTERN):
+    """
+    增量处理目录中的HTML文件，输出与 process_html_files 完全一致
+    
+    输出目录中的清单（page_manifest.py）记录了上次处理时每个页面的哈希和页面片段：
+        只重新提取内容发生变化的页面，其余页面直接复用缓存的片段
+        跨页合并在片段上重新进行（不需要解析页面，开销很小），
+        只有输出内容发生变化的单页JSON文件才会被重写（即变化的页面及受跨页合并影响的相邻页面），
+        不再产生输出的旧单页文件被删除，all_test_cases.json 重新生成
+    清单不存在或因选项变化作废时，输出目录中已有的单页文件都视为上次的输出，不再产生输出的同样被删除
+    
+    每次增量处理都会重新生成全部测试用例，不支持写入SQLite数据库（否则每次都会新增一份完整的报告）
+    
+    参数与 process_html_files 相同（没有 sqlite_db）
+    
+    返回:
+        int: 测试用例总数；没有任何页面变化且输出文件都存在时不重新生成输出，返回None
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    manifest = PageManifest.load(output_dir, {"page_pattern": page_pattern.pattern, "ndjson": ndjson})
+    html_files = list_html_pages(input_dir, page_pattern)
+    
+    fragments = {}
+    changed_files = []
+    for html_file in html_files:
+        cached = manifest.cached_fragment(html_file)
+        if cached is None:
+            changed_files.append(html_file)
+        else:
+            fragments[html_file.name] = fragment_from_json(cached)
+    removed_pages = set(manifest.pages) - {html_file.name for html_file in html_files}
+    
+    # 汇总文件或单页文件被删除时即使没有页面变化也要重新生成
+    output_files = [Path(output_dir) / ("all_test_cases.ndjson" if ndjson else "all_test_cases.json")]
+    output_files.extend(Path(output_dir) / name for name in manifest.outputs)
+    if manifest.outputs and not changed_files and not removed_pages and all(output_file.exists() for output_file in output_files):
+        manifest.save(output_dir)
+        print(f"No changed pages in {input_dir}")
+        return None
+    
+    html_files_by_name = {html_file.name: html_file for html_file in changed_files}
+    for fragment in html_page_fragments(changed_files, jobs, page_pattern):
+        manifest.record_fragment(html_files_by_name[fragment[0]], fragment_to_json(fragment))
+        fragments[fragment[0]] = fragment
+    manifest.retain_pages(fragments)
+    extraction_stats.count('pages_reextracted', len(changed_files))
+    extraction_stats.count('pages_reused', len(html_files) - len(changed_files))
+    print(f"Re-extracted {len(changed_files)} changed pages, reused {len(html_files) - len(changed_files)} cached pages"
+          + (f", {len(removed_pages)} pages removed" if removed_pages else ""))
+    
+    previous_outputs = manifest.outputs or {
+        output_file.name: None for output_file in Path(output_dir).glob("test_cases_*.json")
+        if PAGE_OUTPUT_PATTERN.match(output_file.name)
+    }
+    manifest.outputs = {}
+    rewritten_files = set()
+    
+    def save_page(output_file, test_cases):
+        content = json.dumps(test_cases_to_dicts(test_cases), ensure_ascii=False, indent=2)
+        digest = content_digest(content)
+        # 最后一页会被保存两次，本次已经写过相同内容时跳过
+        if manifest.outputs.get(output_file.name) == digest:
+            return
+        manifest.outputs[output_file.name] = digest
+        if previous_outputs.get(output_file.name) == digest and output_file.exists():
+            return
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        rewritten_files.add(output_file.name)
+        print(f"Saved {len(test_cases)} test cases to {output_file}")
+    
+    page_source = PageFragments(fragments[html_file.name] for html_file in html_files)
+    test_case_count = process_pages(page_source, output_dir, None, str(input_dir), ndjson, save_page=save_page)
+    
+    for stale_file in sorted(set(previous_outputs) - set(manifest.outputs)):
+        (Path(output_dir) / stale_file).unlink(missing_ok=True)
+        print(f"Removed stale {Path(output_dir) / stale_file}")
+    
+    manifest.save(output_dir)
+    print(f"Rewrote {len(rewritten_files)} page files")
+    return test_case_count
+
+def watch_html_files(input_dir, output_dir, jobs=1, ndjson=False, page_pattern=DVM_PAGE_PATTERN, interval=2.0):
+    """
+    监视模式：轮询页面文件的修改时间和大小，发生变化时进行增量处理（Ctrl+C 结束）
+    """
+    print(f"Watching {input_dir} (polling every {interval:g}s, Ctrl+C to stop)")
+    snapshot = None
+    while True:
+        try:
+            current = {html_file.name: file_signature(html_file) for html_file in list_html_pages(input_dir, page_pattern)}
+        except FileNotFoundError:
+            # 页面在列出和读取状态之间被删除或替换，下一轮再检查
+            current = None
+        
+        if current is not None and current != snapshot:
+            try:
+                process_html_files_incremental(input_dir, output_dir, jobs, ndjson, page_pattern)
+            except Exception as e:
+                # 页面可能正在被写入，等待下一次变化后重试
+                print(f"Error processing {input_dir}: {e}")
+            snapshot = current
+        time.sleep(interval)
+
+def process_document(document_id, html_files, output_dir, sqlite_db=None, ndjson=False, page_pattern=CORPUS_PAGE_PATTERN):
+    """
+    处理语料库中的单个文档（在工作进程中运行），处理日志写入文档输出目录下的 extraction.log
+    
+    返回:
+        dict: 文档的索引信息
+    """
+    document_output = Path(output_dir) / document_id
+    document_output.mkdir(parents=True, exist_ok=True)
+    
+    index_entries = []
+    with open(document_output / "extraction.log", 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        fragments = html_page_fragments(html_files, 1, page_pattern)
+        test_case_count = process_pages(PageFragments(fragments), document_output, sqlite_db,
+                                        str(html_files[0].parent), ndjson, index_entries)
+    
+    return {
+        "document": document_id,
+        "source_dir": str(html_files[0].parent),
+        "pages": len(html_files),
+        "test_cases": test_case_count,
+        "output_dir": document_id,
+        "test_case_index": index_entries
+    }
+
+def process_corpus(root_dir, output_dir, sqlite_db=None, jobs=1, ndjson=False, page_pattern=CORPUS_PAGE_PATTERN):
+    """
+    语料库模式：在目录树中查找多个文档，每个文档独立进行跨页合并，多个文档在进程池中并行处理
+    每个文档输出到 output_dir/<文档标识>/，所有文档的汇总索引保存为 output_dir/corpus_index.json
+    
+    参数:
+        root_dir: 语料库根目录
+        output_dir: 输出目录路径
+        sqlite_db: SQLite数据库路径（可选），每个文档作为一份报告写入
+        jobs: 并行处理文档的进程数
+        ndjson: 为True时各文档的汇总结果输出为 all_test_cases.ndjson
+        page_pattern: 页面文件名格式（正则表达式，doc 分组为文档名，page 分组为页码）
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    documents = discover_documents(root_dir, page_pattern)
+    print(f"Found {len(documents)} documents under {root_dir}")
+    
+    results = {}
+    stats = extraction_stats.active()
+    with ProcessPoolExecutor(max_workers=max(1, jobs or 1)) as executor:
+        futures = {
+            (executor.submit(extraction_stats.run_in_worker, process_document, document_id, html_files, output_dir,
+                             sqlite_db, ndjson, page_pattern) if stats is not None else
+             executor.submit(process_document, document_id, html_files, output_dir, sqlite_db, ndjson, page_pattern)): document_id
+            for document_id, html_files in documents.items()
+        }
+        for future in as_completed(futures):
+            document_id = futures[future]
+            try:
+                if stats is not None:
+                    results[document_id], document_stats = future.result()
+                    stats.merge(document_stats)
+                else:
+                    results[document_id] = future.result()
+                print(f"Processed {document_id}: {results[document_id]['pages']} pages, "
+                      f"{results[document_id]['test_cases']} test cases")
+            except Exception as e:
+                results[document_id] = {"document": document_id, "error": str(e)}
+                print(f"Error processing {document_id}: {e}")
+    
+    # 按文档标识排序，保证索引内容与完成顺序无关
+    corpus_index = {
+        "documents": len(documents),
+        "pages": sum(result.get("pages", 0) for result in results.values()),
+        "test_cases": sum(result.get("test_cases", 0) for result in results.values()),
+        "results": [results[document_id] for document_id in documents]
+    }
+    index_file = Path(output_dir) / "corpus_index.json"
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(corpus_index, f, ensure_ascii=False, indent=2)
+    print(f"Saved corpus index for {corpus_index['documents']} documents "
+          f"({corpus_index['test_cases']} test cases) to {index_file}")
+
+def page_output_file(output_dir, page_number, test_cases):
+    """
+    单个页面的测试用例输出文件：使用第一个测试用例的ID作为文件名的一部分
+    """
+    if test_cases and test_cases[0].test_case_id:
+        return Path(output_dir) / f"test_cases_id_{test_cases[0].test_case_id}_page_{page_number}.json"
+    return Path(output_dir) / f"test_cases_page_{page_number}.json"
+
+def save_page_test_cases(output_file, test_cases):
+    """
+    保存单个页面的测试用例
+    """
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(test_cases_to_dicts(test_cases), f, ensure_ascii=False, indent=2)
+    print(f"Saved {len(test_cases)} test cases to {output_file}")
+
+def process_pages(page_source, output_dir, sqlite_db=None, source_name=None, ndjson=False, index_entries=None,
+                  save_page=save_page_test_cases):
+    """
+    按页处理输入，合并跨页的测试用例并保存为JSON文件
+    
+    跨页合并确定的测试用例在每页处理结束时立即流式写入 all_test_cases.json（或NDJSON），
+    内存中只保留尚未确定的待处理测试用例
+    
+    参数:
+        page_source: 按页码顺序排列的页面片段（PageFragments）
+        output_dir: 输出目录路径
+        sqlite_db: SQLite数据库路径（可选），指定时同时将所有测试用例分批写入数据库
+        source_name: 写入数据库时记录的来源名称
+        ndjson: 为True时输出每行一个测试用例的 all_test_cases.ndjson
+        index_entries: 列表（可选），指定时为每个确定的测试用例追加一条索引信息（ID、标题、页码）
+        save_page: 保存单个页面测试用例的函数 save_page(输出文件, 测试用例列表)
+    
+    返回:
+        int: 测试用例总数
     """
     # 创建输出目录
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # 获取所有HTML文件并按编号排序
-    html_files = list(Path(input_dir).glob("*.html"))
-    html_files.sort(key=lambda x: int(re.search(r'CC_DVM-(\d+)\.html', x.name).group(1)) if re.search(r'CC_DVM-(\d+)\.html', x.name) else 0)
+    all_output_file = Path(output_dir) / ("all_test_cases.ndjson" if ndjson else "all_test_cases.json")
+    writer = TestCaseStreamWriter(all_output_file, ndjson)
     
+    conn = case_db.connect(sqlite_db) if sqlite_db else None
+    report_id = None
+    
+    def flush(finalized_test_cases):
+        nonlocal report_id
+        with extraction_stats.stage('write'):
+            records = test_cases_to_dicts(finalized_test_cases)
+            writer.write(records)
+        if index_entries is not None:
+            index_entries.extend(
+                {"test_case_id": test_case.test_case_id, "title": test_case.title,
+                 "page_number": test_case.page_number}
+                for test_case in finalized_test_cases
+            )
+        if conn is not None and records:
+            # 报告记录与第一批测试用例在同一事务中写入，处理页面期间不持有数据库写锁；
+            # 没有确定测试用例的页面不访问数据库，没有测试用例时也不创建空的报告
+            with extraction_stats.stage('sqlite'):
+                if report_id is None:
+                    report_id = case_db.create_report(conn, source_name, 'dvm')
+                case_db.add_test_cases(conn, report_id, records)
+        finalized_test_cases.clear()
+    
+    def timed_save_page(output_file, test_cases):
+        with extraction_stats.stage('write'):
+            save_page(output_file, test_cases)
+    
+    try:
+        # 页面片段在跨页合并过程中按需产生，映射阶段各步骤的时间计入各自的阶段
+        with extraction_stats.stage('stitch'):
+            _stitch_pages(page_source, output_dir, flush, timed_save_page)
+    finally:
+        writer.close()
+        if conn is not None:
+            conn.commit()
+            conn.close()
+    
+    print(f"Saved all {writer.count} test cases to {all_output_file}")
+    extraction_stats.count('test_cases_written', writer.count)
+    if report_id is not None:
+        print(f"Imported {writer.count} test cases into {sqlite_db} (report_id={report_id})")
+    elif conn is not None:
+        print(f"No test cases to import into {sqlite_db}")
+    return writer.count
+
+def _stitch_pages(page_source, output_dir, flush, save_page=save_page_test_cases):
+    """
+    跨页合并（归约阶段）
+    每页处理结束时调用 flush(已确定的测试用例列表)，flush 写出后清空该列表；
+    与待处理测试用例共用测试步骤列表的测试用例（及其后的测试用例）暂不写出，
+    因为待处理测试用例合并后续页面的步骤时会同时改变该列表，与原来最后统一写出的结果一致；
+    每页的测试用例通过 save_page(输出文件, 测试用例列表) 保存
+    """
     all_test_cases = []
     
     # 用于跟踪跨页的测试用例
     pending_test_cases = {}
-    pending_test_scripts = {}  # 用于存储测试脚本，按test_case_id索引
     
-    for html_file in html_files:
-        print(f"Processing {html_file.name}...")
-        
-        # 提取页码
-        page_match = re.search(r'CC_DVM-(\d+)\.html', html_file.name)
-        if page_match:
-            page_number = int(page_match.group(1))
-        else:
-            page_number = 0
-        
-        # 读取HTML文件
-        with open(html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # 提取测试用例（默认不包含requirements字段）
-        test_cases = extract_test_cases_from_html(html_content, page_number)
+    for page_name, page_number, test_cases in page_source.pages():
+        print(f"Processing {page_name}...")
         
         # 处理跨页的测试用例
         for test_case in test_cases:
-            test_case_id = test_case.get("test_case_id", "")
+            test_case_id = test_case.test_case_id
             
             if test_case_id in pending_test_cases:
                 # 合并跨页的测试脚本
                 existing_case = pending_test_cases[test_case_id]
-                existing_case["test_script"].extend(test_case.get("test_script", []))
+                existing_case.test_script.extend(test_case.test_script)
                 
                 # 如果当前页面有完整的测试用例信息，更新其他字段
-                if test_case.get("purpose"):
-                    existing_case["purpose"] = test_case["purpose"]
-                if test_case.get("precondition"):
-                    existing_case["precondition"] = test_case["precondition"]
-                if test_case.get("description"):
-                    existing_case["description"] = test_case["description"]
-                if test_case.get("requirements"):
-                    existing_case["requirements"] = test_case["requirements"]
+                if test_case.purpose:
+                    existing_case.purpose = test_case.purpose
+                if test_case.precondition:
+                    existing_case.precondition = test_case.precondition
+                if test_case.description:
+                    existing_case.description = test_case.description
+                if test_case.requirements:
+                    existing_case.requirements = test_case.requirements
+                
+                extraction_stats.count('merged_same_id')
                 
                 # 如果当前页面有测试脚本，说明跨页结束，添加到最终结果
-                if test_case.get("test_script"):
+                if test_case.test_script:
                     all_test_cases.append(existing_case)
                     del pending_test_cases[test_case_id]
             else:
                 # 如果是新测试用例，检查是否有测试脚本
-                if test_case.get("test_script"):
+                if test_case.test_script:
                     # 有测试脚本，检查是否应该与之前的测试用例合并
                     # 查找是否有相同标题的待处理测试用例
                     matching_pending_case = None
                     for pending_id, pending_case in pending_test_cases.items():
-                        if pending_case.get("title") == test_case.get("title") and not pending_case.get("test_script"):
+                        if pending_case.title == test_case.title and not pending_case.test_script:
                             matching_pending_case = pending_case
                             break
                     
                     if matching_pending_case:
                         # 合并测试脚本到待处理测试用例
-                        matching_pending_case["test_script"] = test_case["test_script"]
+                        matching_pending_case.test_script = test_case.test_script
+                        extraction_stats.count('merged_same_title')
                         # 更新其他字段
-                        if test_case.get("purpose"):
-                            matching_pending_case["purpose"] = test_case["purpose"]
-                        if test_case.get("precondition"):
-                            matching_pending_case["precondition"] = test_case["precondition"]
-                        if test_case.get("description"):
-                            matching_pending_case["description"] = test_case["description"]
-                        if test_case.get("requirements"):
-                            matching_pending_case["requirements"] = test_case["requirements"]
+                        if test_case.purpose:
+                            matching_pending_case.purpose = test_case.purpose
+                        if test_case.precondition:
+                            matching_pending_case.precondition = test_case.precondition
+                        if test_case.description:
+                            matching_pending_case.description = test_case.description
+                        if test_case.requirements:
+                            matching_pending_case.requirements = test_case.requirements
                     else:
                         # 没有匹配的待处理测试用例，直接添加到结果
                         all_test_cases.append(test_case)
                 else:
                     # 没有测试脚本，可能是跨页的开始，暂存起来
                     pending_test_cases[test_case_id] = test_case
+                    extraction_stats.count('pending_across_pages')
         
         # 特殊处理：如果当前页面只有测试脚本没有测试用例信息（如第14页）
         # 查找上一页的待处理测试用例并尝试合并测试脚本
         if page_number > 1:
-            # 检查当前页面是否只有测试脚本，没有测试用例信息
-            has_only_test_scripts = False
-            for test_case in test_cases:
-                if test_case.get("test_script") and not test_case.get("test_case_id") and not test_case.get("title").startswith("Test case"):
-                    has_only_test_scripts = True
-                    break
-            
-            # 或者检查当前页面是否有测试脚本，但页面编号是连续的（如13->14）
-            if any(tc.get("test_script") for tc in test_cases):
+            # 检查当前页面是否有测试脚本，且页面编号是连续的（如13->14）
+            if any(tc.test_script for tc in test_cases):
                 prev_page = page_number - 1
                 # 查找上一页是否有待处理的测试用例
                 for pending_id, pending_case in list(pending_test_cases.items()):
-                    if pending_case.get("page_number") == prev_page and not pending_case.get("test_script"):
+                    if pending_case.page_number == prev_page and not pending_case.test_script:
                         # 将当前页面的测试脚本合并到上一页的测试用例中
                         for test_case in test_cases:
-                            if test_case.get("test_script"):
-                                pending_case["test_script"] = test_case["test_script"]
+                            if test_case.test_script:
+                                pending_case.test_script = test_case.test_script
                                 # 标记为已处理
-                                test_case["_processed"] = True
-                                print(f"Merged test script from page {page_number} to test case from page {prev_page}: {pending_case.get('title')}")
+                                test_case.processed = True
+                                print(f"Merged test script from page {page_number} to test case from page {prev_page}: {pending_case.title}")
+                                extraction_stats.count('merged_into_previous_page')
                                 
                                 # 如果找到了匹配的测试用例，将其从待处理列表中移除并添加到最终结果
-                                if pending_case.get("test_case_id"):
+                                if pending_case.test_case_id:
                                     all_test_cases.append(pending_case)
                                     del pending_test_cases[pending_id]
                                 break
         
         # 处理跨页测试脚本合并
         next_page_num = page_number + 1
-        next_page_file = Path(input_dir) / f"CC_DVM-{next_page_num}.html"
         
-        if next_page_file.exists():
-            with open(next_page_file, 'r', encoding='utf-8') as f:
-                next_html_content = f.read()
+        if page_source.has_page(next_page_num):
+            test_script = page_source.continuation_script(next_page_num)
             
-            if has_test_script_only(next_html_content):
-                test_script = extract_test_script_from_html(next_html_content, next_page_num)
-                
-                if test_script:
-                    for test_case in test_cases:
-                        if not test_case.get("test_script") and test_case.get("test_case_id"):
-                            test_case["test_script"] = test_script
-                            break
+            if test_script:
+                for test_case in test_cases:
+                    if not test_case.test_script and test_case.test_case_id:
+                        test_case.test_script = test_script
+                        extraction_stats.count('merged_continuation_script')
+                        break
         
         # 保存单个页面的测试用例
         if test_cases:
-            # 使用测试用例ID作为文件名的一部分
-            if test_cases and len(test_cases) > 0 and test_cases[0].get('test_case_id'):
-                test_case_id = test_cases[0]['test_case_id']
-                output_file = Path(output_dir) / f"test_cases_id_{test_case_id}_page_{page_number}.json"
-            else:
-                output_file = Path(output_dir) / f"test_cases_page_{page_number}.json"
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(test_cases, f, ensure_ascii=False, indent=2)
-            print(f"Saved {len(test_cases)} test cases to {output_file}")
+            save_page(page_output_file(output_dir, page_number, test_cases), test_cases)
+        
+        # 本页确定的测试用例不会再被修改，立即写出；
+        # 从第一个与待处理测试用例共用测试步骤列表的测试用例开始，保留到该列表不再被共用为止
+        shared_scripts = {id(test_case.test_script) for test_case in pending_test_cases.values()}
+        ready = next((i for i, test_case in enumerate(all_test_cases) if id(test_case.test_script) in shared_scripts),
+                     len(all_test_cases))
+        finalized_test_cases = all_test_cases[:ready]
+        del all_test_cases[:ready]
+        flush(finalized_test_cases)
+        
+        # 之后只会查询下一页和尚无测试脚本的待处理测试用例所在页的下一页的续页测试脚本
+        page_source.retain_pages({page_number + 1} | {test_case.page_number + 1 for test_case in pending_test_cases.values()
+                                                      if not test_case.test_script})
 
     # 保存当前页面的测试用例
     if test_cases:
-        # 使用测试用例ID作为文件名的一部分
-        if test_cases and len(test_cases) > 0 and test_cases[0].get('test_case_id'):
-            test_case_id = test_cases[0]['test_case_id']
-            output_file = Path(output_dir) / f"test_cases_id_{test_case_id}_page_{page_number}.json"
-        else:
-            output_file = Path(output_dir) / f"test_cases_page_{page_number}.json"
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(test_cases, f, ensure_ascii=False, indent=2)
-        print(f"Saved {len(test_cases)} test cases to {output_file}")
+        save_page(page_output_file(output_dir, page_number, test_cases), test_cases)
     
     # 处理剩余的跨页测试用例（没有找到后续页面的）
     # 最后检查是否有测试用例缺少测试脚本，尝试从下一页获取
     for test_case_id, test_case in list(pending_test_cases.items()):
         # 如果这个测试用例没有测试脚本，但页面编号小于最大页面
-        if not test_case.get("test_script") and test_case.get("page_number", 0) < len(html_files):
-            next_page = test_case.get("page_number") + 1
-            # 检查下一页文件是否存在
-            next_file = None
-            for f in html_files:
-                if f"CC_DVM-{next_page}.html" in str(f):
-                    next_file = f
-                    break
+        if not test_case.test_script and test_case.page_number < len(page_source):
+            next_page = test_case.page_number + 1
             
-            if next_file and next_file.exists():
-                print(f"Checking next page {next_page} for test script for test case: {test_case.get('title')}")
-                # 读取下一页的内容
-                with open(next_file, 'r', encoding='utf-8') as f:
-                    next_html_content = f.read()
-                
-                # 检查下一页是否只有测试脚本
-                if has_test_script_only(next_html_content):
-                    # 提取测试脚本
-                    next_test_script = extract_test_script_from_html(next_html_content, next_page)
-                    if next_test_script and len(next_test_script) > 0:
-                        test_case["test_script"] = next_test_script
-                        print(f"Found and merged test script from page {next_page} for test case: {test_case.get('title')}")
+            # 检查下一页是否存在
+            if page_source.has_page(next_page):
+                print(f"Checking next page {next_page} for test script for test case: {test_case.title}")
+                # 下一页只有测试脚本时提取其测试脚本
+                next_test_script = page_source.continuation_script(next_page)
+                if next_test_script and len(next_test_script) > 0:
+                    test_case.test_script = next_test_script
+                    extraction_stats.count('merged_leftover_continuation_script')
+                    print(f"Found and merged test script from page {next_page} for test case: {test_case.title}")
         
         # 无论是否找到测试脚本，都将测试用例添加到最终结果
         all_test_cases.append(test_case)
@@ -782,21 +1171,84 @@ def process_html_files(input_dir, output_dir):
     # 清理已处理的待处理测试用例
     pending_test_cases.clear()
     
-    # 保存所有测试用例到一个文件
-    all_output_file = Path(output_dir) / "all_test_cases.json"
-    with open(all_output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_test_cases, f, ensure_ascii=False, indent=2)
-    print(f"Saved all {len(all_test_cases)} test cases to {all_output_file}")
+    flush(all_test_cases)
 
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Extract test cases from HTML files.')
     parser.add_argument('input_dir', nargs='?', default='./CC_DVMToHtml', 
-                        help='Input directory containing HTML files (default: ./CC_DVMToHtml)')
+                        help='Input directory containing HTML files, an XML file produced by pdftohtml -xml, or a page cache compiled by page_cache.py (default: ./CC_DVMToHtml)')
     parser.add_argument('output_dir', nargs='?', default='./extracted_test_cases', 
                         help='Output directory for JSON files (default: ./extracted_test_cases)')
+    parser.add_argument('--sqlite-db', help='Also import all test cases into this SQLite database')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of worker processes for page extraction of HTML input (default: 1, serial)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Write all_test_cases.ndjson (one test case per line) instead of all_test_cases.json')
+    parser.add_argument('--font-class-format', default=DEFAULT_FONT_CLASS_FORMAT,
+                        help=f'Font class name format for XML input (default: {DEFAULT_FONT_CLASS_FORMAT})')
+    parser.add_argument('--corpus', action='store_true',
+                        help='Treat input_dir as a directory tree containing several documents and process them concurrently '
+                             '(--jobs documents at a time)')
+    parser.add_argument('--page-pattern',
+                        help='Regular expression for page file names, with a "page" group for the page number '
+                             'and, in corpus mode, a "doc" group for the document name '
+                             f'(default: {DVM_PAGE_PATTERN.pattern}, corpus mode: {CORPUS_PAGE_PATTERN.pattern})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Re-extract only the HTML pages that changed since the last run into output_dir '
+                             'and rewrite only the affected per-page JSON files')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Trace Python memory allocations with tracemalloc and print a report at the end '
+                             '(main process only)')
+    parser.add_argument('--stats', metavar='FILE',
+                        help='Write per-stage wall/CPU times, per-page timings, the slowest pages and counters to this JSON file')
+    parser.add_argument('--profile-dir',
+                        help='Also write a cProfile dump per stage (<stage>.prof) to this directory (main process only)')
+    parser.add_argument('--watch', nargs='?', type=float, const=2.0, metavar='SECONDS',
+                        help='Keep watching input_dir and re-run the incremental extraction whenever pages change '
+                             '(poll interval, default: 2 seconds)')
     
     args = parser.parse_args()
     
-    process_html_files(args.input_dir, args.output_dir)
\ No newline at end of file
+    if args.page_pattern:
+        page_pattern = re.compile(args.page_pattern)
+        if 'page' not in page_pattern.groupindex:
+            parser.error('--page-pattern must contain a named group "page"')
+    else:
+        page_pattern = CORPUS_PAGE_PATTERN if args.corpus else DVM_PAGE_PATTERN
+    
+    if (args.incremental or args.watch) and (args.corpus or not Path(args.input_dir).is_dir()):
+        parser.error('--incremental and --watch require an input directory of HTML pages')
+    if (args.incremental or args.watch) and args.sqlite_db:
+        parser.error('--sqlite-db cannot be combined with --incremental or --watch '
+                     '(every pass would import all test cases as a new report)')
+    
+    stats = ExtractionStats(args.profile_dir) if args.stats or args.profile_dir else None
+    extraction_stats.activate(stats)
+    
+    try:
+        with trace_memory(args.trace_memory):
+            if args.watch:
+                try:
+                    watch_html_files(args.input_dir, args.output_dir, args.jobs, args.ndjson, page_pattern, args.watch)
+                except KeyboardInterrupt:
+                    print("Stopped watching")
+            elif args.incremental:
+                process_html_files_incremental(args.input_dir, args.output_dir, args.jobs, args.ndjson, page_pattern)
+            elif args.corpus:
+                process_corpus(args.input_dir, args.output_dir, args.sqlite_db, args.jobs, args.ndjson, page_pattern)
+            elif is_page_cache(args.input_dir):
+                process_cache_file(args.input_dir, args.output_dir, args.sqlite_db, args.ndjson, page_pattern)
+            elif Path(args.input_dir).is_file():
+                process_xml_file(args.input_dir, args.output_dir, args.sqlite_db, args.font_class_format, args.ndjson)
+            else:
+                process_html_files(args.input_dir, args.output_dir, args.sqlite_db, args.jobs, args.ndjson, page_pattern)
+    finally:
+        if stats is not None:
+            extraction_stats.activate(None)
+            if args.stats:
+                stats.save(args.stats)
+                print(f"Saved extraction stats to {args.stats}")
+            else:
+                stats.dump_profiles()
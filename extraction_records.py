@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+提取结果的紧凑记录类型
+使用 __slots__ 的记录类代替字符串键的字典，减少大文档中数以百万计的小对象的内存占用：
+    PositionedText: 带坐标的文本片段（表格行聚类、函数名候选）
+    TestStep: 测试步骤
+    RequirementRow: 需求表格行
+    TestCase: 测试用例
+记录只保存文本和坐标，不引用bs4的Tag对象；输出时通过 to_dict 转换为与原字典键顺序一致的字典
+"""
+
+class PositionedText:
+    """
+    带坐标的文本片段
+    """
+
+    __slots__ = ('text', 'top', 'left', 'row')
+
+    def __init__(self, text, top, left, row=None):
+        self.text = text
+        self.top = top
+        self.left = left
+        # 片段在页面定位文本索引中的行号（可选）
+        self.row = row
+
+class TestStep:
+    """
+    测试步骤
+    """
+
+    __slots__ = ('step', 'action', 'expected_result')
+
+    def __init__(self, step, action="", expected_result=""):
+        self.step = step
+        self.action = action
+        self.expected_result = expected_result
+
+    def to_dict(self):
+        return {
+            "step": self.step,
+            "action": self.action,
+            "expected_result": self.expected_result
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["step"], data["action"], data["expected_result"])
+
+class RequirementRow:
+    """
+    需求表格行
+    """
+
+    __slots__ = ('requirement', 'req_id', 'ver', 'status')
+
+    def __init__(self, requirement, req_id="", ver="", status=""):
+        self.requirement = requirement
+        self.req_id = req_id
+        self.ver = ver
+        self.status = status
+
+    def to_dict(self):
+        return {
+            "requirement": self.requirement,
+            "req_id": self.req_id,
+            "ver": self.ver,
+            "status": self.status
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["requirement"], data["req_id"], data["ver"], data["status"])
+
+class TestCase:
+    """
+    测试用例
+
+    postcondition 只在页面中出现 PostCondition 段落时输出（未出现时为None）；
+    processed 为跨页合并的标记，为True时输出为 "_processed"
+    """
+
+    __slots__ = ('page_number', 'title', 'test_case_id', 'legacy_id', 'purpose', 'precondition', 'description',
+                 'requirements', 'test_script', 'postcondition', 'processed')
+
+    def __init__(self, page_number, title, test_case_id="", legacy_id="", purpose="", precondition="", description="",
+                 requirements=None, test_script=None, postcondition=None, processed=False):
+        self.page_number = page_number
+        self.title = title
+        self.test_case_id = test_case_id
+        self.legacy_id = legacy_id
+        self.purpose = purpose
+        self.precondition = precondition
+        self.description = description
+        self.requirements = [] if requirements is None else requirements
+        self.test_script = [] if test_script is None else test_script
+        self.postcondition = postcondition
+        self.processed = processed
+
+    def to_dict(self):
+        """
+        转换为输出用的字典，键顺序与原来逐步构建的测试用例字典一致
+        """
+        data = {
+            "page_number": self.page_number,
+            "title": self.title,
+            "test_case_id": self.test_case_id,
+            "legacy_id": self.legacy_id,
+            "purpose": self.purpose,
+            "precondition": self.precondition,
+            "description": self.description,
+            "requirements": [requirement.to_dict() for requirement in self.requirements],
+            "test_script": [step.to_dict() for step in self.test_script]
+        }
+        if self.postcondition is not None:
+            data["postcondition"] = self.postcondition
+        if self.processed:
+            data["_processed"] = True
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["page_number"], data["title"], data["test_case_id"], data["legacy_id"],
+            data["purpose"], data["precondition"], data["description"],
+            [RequirementRow.from_dict(requirement) for requirement in data["requirements"]],
+            [TestStep.from_dict(step) for step in data["test_script"]],
+            data.get("postcondition"), data.get("_processed", False)
+        )
+
+def test_cases_to_dicts(test_cases):
+    """
+    把测试用例记录列表转换为输出用的字典列表
+    """
+    return [test_case.to_dict() for test_case in test_cases]
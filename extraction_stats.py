@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+提取过程统计
+按阶段累计墙钟时间和CPU时间、记录每个页面的处理时间和各类计数，结束时保存为JSON：
+    stages: 各阶段的调用次数、墙钟时间和CPU时间（嵌套阶段的时间只计入内层阶段）
+    counters: 计数（跳过的页面、跨页合并的测试用例等）
+    slowest_pages: 处理最慢的N个页面
+可选地为每个阶段单独生成cProfile数据（<目录>/<阶段>.prof，可用 python -m pstats 或 snakeviz 查看）
+
+提取代码通过模块级的 stage() / count() / page() 记录统计，未启用统计时它们不做任何事；
+并行处理时工作进程中的统计通过 run_page() / run_in_worker() 随结果返回并合并到主进程（cProfile只覆盖主进程）
+"""
+
+import contextlib
+import cProfile
+import json
+import time
+from pathlib import Path
+
+# 报告中列出的最慢页面数
+DEFAULT_SLOWEST = 20
+
+# 当前进程中启用的统计，为None时不记录
+_active = None
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+class ExtractionStats:
+    """
+    提取过程统计
+    """
+
+    def __init__(self, profile_dir=None, slowest=DEFAULT_SLOWEST):
+        self.profile_dir = profile_dir
+        self.slowest = slowest
+        self.stages = {}
+        self.counters = {}
+        self.pages = []
+        self._profiles = {}
+        # 正在进行的阶段：[阶段名, 开始墙钟时间, 开始CPU时间, 内层阶段的墙钟时间, 内层阶段的CPU时间]
+        self._stack = []
+        self._start = (time.perf_counter(), time.process_time())
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        记录一个阶段，嵌套时外层阶段的时间不包含内层阶段
+        """
+        if self._stack:
+            self._switch_profile(self._stack[-1][0], False)
+        self._switch_profile(name, True)
+        frame = [name, time.perf_counter(), time.process_time(), 0.0, 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame[1]
+            cpu = time.process_time() - frame[2]
+            self._stack.pop()
+            self._switch_profile(name, False)
+
+            self._add_stage(name, 1, wall - frame[3], cpu - frame[4])
+            if self._stack:
+                self._stack[-1][3] += wall
+                self._stack[-1][4] += cpu
+                self._switch_profile(self._stack[-1][0], True)
+
+    @contextlib.contextmanager
+    def page(self, name):
+        """
+        记录单个页面的处理时间
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.pages.append([name, time.perf_counter() - wall_start, time.process_time() - cpu_start])
+
+    def count(self, name, n=1):
+        """
+        增加计数
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, data):
+        """
+        合并工作进程中记录的统计（raw_dict() 的结果）
+        """
+        for name, (calls, wall, cpu) in data["stages"].items():
+            self._add_stage(name, calls, wall, cpu)
+        for name, n in data["counters"].items():
+            self.count(name, n)
+        self.pages.extend(data["pages"])
+
+    def raw_dict(self):
+        """
+        返回用于在进程之间传递的统计数据
+        """
+        return {
+            "stages": {name: [stage["calls"], stage["wall"], stage["cpu"]] for name, stage in self.stages.items()},
+            "counters": self.counters,
+            "pages": self.pages
+        }
+
+    def to_dict(self):
+        """
+        返回统计报告
+        """
+        wall = time.perf_counter() - self._start[0]
+        cpu = time.process_time() - self._start[1]
+        page_walls = [page_wall for _, page_wall, _ in self.pages]
+        slowest_pages = sorted(self.pages, key=lambda page: page[1], reverse=True)[:self.slowest]
+
+        return {
+            "wall_seconds": round(wall, 6),
+            # 只包含主进程的CPU时间，并行处理时工作进程的CPU时间见各阶段
+            "cpu_seconds": round(cpu, 6),
+            "stages": {
+                name: {
+                    "calls": stage["calls"],
+                    "wall_seconds": round(stage["wall"], 6),
+                    "cpu_seconds": round(stage["cpu"], 6),
+                    "wall_share": round(stage["wall"] / wall, 4) if wall else 0.0
+                }
+                for name, stage in sorted(self.stages.items(), key=lambda item: item[1]["wall"], reverse=True)
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "pages": {
+                "count": len(self.pages),
+                "total_wall_seconds": round(sum(page_walls), 6),
+                "mean_wall_seconds": round(sum(page_walls) / len(page_walls), 6) if page_walls else 0.0,
+                "max_wall_seconds": round(max(page_walls), 6) if page_walls else 0.0
+            },
+            "slowest_pages": [
+                {"page": name, "wall_seconds": round(page_wall, 6), "cpu_seconds": round(page_cpu, 6)}
+                for name, page_wall, page_cpu in slowest_pages
+            ]
+        }
+
+    def save(self, stats_file):
+        """
+        保存统计报告，并写出各阶段的cProfile数据
+        """
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        self.dump_profiles()
+
+    def dump_profiles(self):
+        """
+        把各阶段的cProfile数据写入 profile_dir/<阶段>.prof
+        """
+        if not self.profile_dir:
+            return
+        Path(self.profile_dir).mkdir(parents=True, exist_ok=True)
+        for name, profile in self._profiles.items():
+            profile.dump_stats(Path(self.profile_dir) / f"{name}.prof")
+
+    def _add_stage(self, name, calls, wall, cpu):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {"calls": 0, "wall": 0.0, "cpu": 0.0}
+        stage["calls"] += calls
+        stage["wall"] += wall
+        stage["cpu"] += cpu
+
+    def _switch_profile(self, name, enable):
+        # 同一时间只能有一个cProfile生效，进入内层阶段时暂停外层阶段的profile
+        if not self.profile_dir:
+            return
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = self._profiles[name] = cProfile.Profile()
+        if enable:
+            profile.enable()
+        else:
+            profile.disable()
+
+def activate(stats):
+    """
+    在当前进程中启用统计（stats为None时停用）
+    """
+    global _active
+    _active = stats
+
+def active():
+    """
+    返回当前进程中启用的统计，未启用时为None
+    """
+    return _active
+
+def stage(name):
+    """
+    记录一个阶段（未启用统计时不做任何事）
+    """
+    return _NULL_CONTEXT if _active is None else _active.stage(name)
+
+def page(name):
+    """
+    记录单个页面的处理时间（未启用统计时不做任何事）
+    """
+    return _NULL_CONTEXT if _active is None else _active.page(name)
+
+def count(name, n=1):
+    """
+    增加计数（未启用统计时不做任何事）
+    """
+    if _active is not None:
+        _active.count(name, n)
+
+def run_in_worker(func, *args):
+    """
+    在工作进程中调用func并记录统计
+
+    返回:
+        tuple: (func的返回值, 统计数据)，统计数据传回主进程后用 ExtractionStats.merge 合并
+    """
+    stats = ExtractionStats()
+    activate(stats)
+    try:
+        result = func(*args)
+    finally:
+        activate(None)
+    return result, stats.raw_dict()
+
+def run_page(name, func, *args):
+    """
+    在工作进程中处理单个页面并记录统计（包括页面的处理时间），返回值与 run_in_worker 相同
+    """
+    return run_in_worker(_timed_page, name, func, *args)
+
+def _timed_page(name, func, *args):
+    with page(name):
+        return func(*args)
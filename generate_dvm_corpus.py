@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+合成测试语料生成脚本
+生成与pdftohtml逐页HTML格式一致的合成页面（绝对定位的<p>段落），用于在不接触真实文档的情况下
+可重复地测量提取脚本的性能和正确性：
+    dvm/CC_DVM-<页码>.html: DVM测试用例页面，包括带 (Ver: n) 的测试用例标题、标签段落、需求表格、
+                            测试步骤表格，一页中的多个测试用例，以及测试步骤表格整个位于下一页
+                            或在表格中间断开、后半部分位于下一页的跨页测试用例
+    capl/page<页码>.html: CAPL函数手册页面，包括函数页面、Availability Chart页面和无关页面
+    ground_truth.json: 每个测试用例和每个CAPL函数的期望提取结果
+
+相同的参数和随机种子总是生成相同的语料
+"""
+
+import argparse
+import html
+import json
+import random
+from pathlib import Path
+
+PAGE_HEAD = '''<!DOCTYPE html><html xmlns="http://www.w3.org/1999/xhtml" lang="" xml:lang="">
+<head><title>{title}</title>
+<meta http-equiv="Content-Type" content="text/html; charset=UTF-8"/>
+<style type="text/css">
+<!--
+	p {{margin: 0; padding: 0;}}	.ft00{{font-size:12px;font-family:Times;color:#000000;}}
+	.ft01{{font-size:16px;font-family:Times;color:#000000;}}
+	.ft02{{font-size:18px;font-family:Helvetica;color:#000000;}}
+	.ft03{{font-size:14px;font-family:Helvetica;color:#000000;}}
+-->
+</style></head><body bgcolor="#A0A0A0" vlink="blue" link="blue">
+<div id="page{page_number}-div" style="position:relative;width:892px;height:1262px;">
+'''
+PAGE_TAIL = '</div>\n</body>\n</html>\n'
+
+# 页面版心的坐标（像素）
+LEFT_MARGIN = 90
+INDENT = 110
+REQ_ID_COLUMN = 250
+VER_COLUMN = 400
+STATUS_COLUMN = 500
+ACTION_COLUMN = 120
+EXPECTED_RESULT_COLUMN = 400
+TOP_MARGIN = 80
+
+# 上一个测试用例结束的位置不超过该值时，下一个测试用例才可能接在同一页（页面高1262像素）
+MAX_SHARED_PAGE_TOP = 600
+
+ACTIONS = ('Read DID', 'Write DID', 'Request seed for DID', 'Clear DTC for DID', 'Start routine for DID')
+RESULTS = ('Positive response', 'Negative response 0x31', 'Response data matches', 'Routine completed')
+CAPL_VERBS = ('Get', 'Set', 'File', 'Diag', 'Sys', 'Test')
+
+class PageBuilder:
+    """
+    逐段构建一个页面的绝对定位段落
+    """
+
+    def __init__(self):
+        self.paragraphs = []
+
+    def add(self, top, left, text, font_class='ft00'):
+        self.paragraphs.append(
+            f'<p style="position:absolute;top:{top}px;left:{left}px;white-space:nowrap" class="{font_class}">'
+            f'{html.escape(text)}</p>\n'
+        )
+
+def render_page(page_number, page, title):
+    """
+    输出完整的页面HTML
+    """
+    return PAGE_HEAD.format(title=title, page_number=page_number) + ''.join(page.paragraphs) + PAGE_TAIL
+
+def add_steps(page, top, rnd, case_number, step_count, first_step=1):
+    """
+    添加测试步骤表格的数据行，返回 (下一行的top, 期望的测试步骤列表)
+    步骤号从first_step开始，部分步骤的动作折行到下一行
+    """
+    steps = []
+    for step in range(first_step, first_step + step_count):
+        did = f"0xF1{(case_number + step) % 100:02d}"
+        action = f"{rnd.choice(ACTIONS)} {did}"
+        expected_result = f"{rnd.choice(RESULTS)} {step}"
+        page.add(top, LEFT_MARGIN, str(step))
+        page.add(top, ACTION_COLUMN, action)
+        page.add(top, EXPECTED_RESULT_COLUMN, expected_result)
+        top += 20
+        if rnd.random() < 0.3:
+            page.add(top, ACTION_COLUMN, 'with session 0x03')
+            action += ' with session 0x03'
+            top += 20
+        steps.append({"step": str(step), "action": action, "expected_result": expected_result})
+    return top, steps
+
+def new_dvm_page():
+    """
+    新建一个只有页眉的DVM页面
+    """
+    page = PageBuilder()
+    page.add(40, LEFT_MARGIN, 'CC DVM Specification')
+    return page
+
+def generate_dvm_pages(output_dir, case_count, rnd, split_ratio=0.3, missing_id_ratio=0.03,
+                       postcondition_ratio=0.3, max_steps=6, shared_page_ratio=0.2, mid_table_split_ratio=0.1):
+    """
+    生成DVM测试用例页面
+
+    期望结果中每个测试用例只包含自己的字段和步骤，与同一页中的其他测试用例无关；
+    测试步骤表格跨页时，期望的测试步骤是两页中的全部步骤
+
+    参数:
+        output_dir: 页面输出目录
+        case_count: 测试用例数
+        rnd: 随机数生成器
+        split_ratio: 测试步骤表格整个位于下一页的测试用例比例
+        missing_id_ratio: 缺少 Test Case ID 的测试用例比例
+        postcondition_ratio: 带 PostCondition 段落的测试用例比例
+        max_steps: 每个测试用例的最大步骤数
+        shared_page_ratio: 接在上一个测试用例之后、与之位于同一页的测试用例比例
+        mid_table_split_ratio: 测试步骤表格在中间断开、后半部分位于下一页的测试用例比例
+
+    返回:
+        tuple: (页面数, 期望的测试用例列表)
+    """
+    pages = []
+    truth = []
+
+    # 封面
+    cover = PageBuilder()
+    cover.add(300, 250, 'CC DVM Specification', 'ft02')
+    cover.add(340, 250, 'Document Type DVM')
+    cover.add(360, 250, f'Synthetic corpus, {case_count} test cases')
+    pages.append(cover)
+
+    # 当前页面，以及下一个测试用例能否接在当前页面上（只有测试步骤的续页不能）
+    page = None
+    top = TOP_MARGIN
+    shareable = False
+    for case_number in range(case_count):
+        if shareable and top <= MAX_SHARED_PAGE_TOP and rnd.random() < shared_page_ratio:
+            # 接在同一页上一个测试用例的步骤表格之后
+            top += 30
+        else:
+            if page is not None:
+                pages.append(page)
+            page = new_dvm_page()
+            top = TOP_MARGIN
+
+        title = f"{1 + case_number // 50}.{case_number % 50 + 1} Test case : DID_Check_{case_number} (Ver: {rnd.randint(1, 9)})"
+        page.add(top, LEFT_MARGIN, title, 'ft01')
+        top += 30
+
+        test_case_id = ""
+        if rnd.random() >= missing_id_ratio:
+            test_case_id = str(500000 + case_number)
+            # ID与标签在同一段落或位于同一行的右侧
+            if rnd.random() < 0.5:
+                page.add(top, LEFT_MARGIN, f'Test Case ID: {test_case_id}')
+            else:
+                page.add(top, LEFT_MARGIN, 'Test Case ID:')
+                page.add(top, 300, test_case_id)
+            top += 20
+
+        # Legacy ID在同一段落或下一段落
+        if rnd.random() < 0.5:
+            legacy_id = f"L-{case_number}"
+            page.add(top, LEFT_MARGIN, f'Legacy ID: {legacy_id}')
+        else:
+            legacy_id = f"LEG{case_number}"
+            page.add(top, LEFT_MARGIN, 'Legacy ID:')
+            page.add(top + 20, LEFT_MARGIN, legacy_id)
+            top += 20
+        top += 20
+
+        page.add(top, LEFT_MARGIN, 'Purpose:')
+        top += 20
+        purpose_lines = [f"Verify DID 0xF1{case_number % 100:02d} part {k}" for k in range(rnd.randint(1, 3))]
+        for line in purpose_lines:
+            page.add(top, INDENT, f'· {line}')
+            top += 18
+
+        if rnd.random() < 0.5:
+            precondition = f"Ignition ON {case_number}"
+            page.add(top, LEFT_MARGIN, f'PreCondition: {precondition}')
+            top += 20
+        else:
+            precondition = "Battery 12V"
+            page.add(top, LEFT_MARGIN, 'PreCondition:')
+            page.add(top + 20, INDENT, f'· {precondition}')
+            top += 38
+
+        postcondition = None
+        if rnd.random() < postcondition_ratio:
+            postcondition = "Ignition OFF"
+            page.add(top, LEFT_MARGIN, f'PostCondition: {postcondition}')
+            top += 20
+
+        description = f"Read DID 0xF1{case_number % 100:02d} and compare"
+        page.add(top, LEFT_MARGIN, 'Test case Description:' if rnd.random() < 0.5 else 'Description:')
+        page.add(top + 20, INDENT, description)
+        top += 38
+
+        # 需求表格，同一行的单元格top值有几个像素的偏差
+        page.add(top, LEFT_MARGIN, 'Requirements:')
+        top += 20
+        page.add(top, LEFT_MARGIN, 'Requirement')
+        page.add(top, REQ_ID_COLUMN, 'Req ID')
+        page.add(top, VER_COLUMN, 'Ver')
+        page.add(top, STATUS_COLUMN, 'Status')
+        top += 20
+        requirements = []
+        for row in range(rnd.randint(1, 3)):
+            requirement = {"requirement": f"REQ text {case_number}-{row}", "req_id": f"R{case_number}{row}",
+                           "ver": str(row + 1), "status": "Approved"}
+            page.add(top, LEFT_MARGIN, requirement["requirement"])
+            page.add(top + rnd.randint(0, 3), REQ_ID_COLUMN, requirement["req_id"])
+            page.add(top, VER_COLUMN, requirement["ver"])
+            page.add(top, STATUS_COLUMN, requirement["status"])
+            requirements.append(requirement)
+            top += 22
+
+        page_number = len(pages) + 1
+        step_count = rnd.randint(2, max_steps)
+        layout = rnd.random()
+        if layout < split_ratio:
+            # 测试脚本位于下一页，下一页只有测试步骤表格
+            pages.append(page)
+            page = new_dvm_page()
+            top = TOP_MARGIN
+            page.add(top, LEFT_MARGIN, 'Test Script Description')
+            page.add(top + 20, LEFT_MARGIN, 'Step Action Expected Result')
+            top += 40
+            top, steps = add_steps(page, top, rnd, case_number, step_count)
+            shareable = False
+        elif layout < split_ratio + mid_table_split_ratio:
+            # 测试步骤表格在中间断开：前几个步骤在本页，其余步骤在下一页，下一页可能重复表头
+            page.add(top, LEFT_MARGIN, 'Test Script Description')
+            top += 20
+            page.add(top, LEFT_MARGIN, 'Step')
+            page.add(top, ACTION_COLUMN, 'Action')
+            page.add(top, EXPECTED_RESULT_COLUMN, 'Expected Result')
+            top += 20
+            first_part = rnd.randint(1, step_count - 1)
+            top, steps = add_steps(page, top, rnd, case_number, first_part)
+            pages.append(page)
+            page = new_dvm_page()
+            top = TOP_MARGIN
+            if rnd.random() < 0.5:
+                page.add(top, LEFT_MARGIN, 'Step Action Expected Result')
+                top += 20
+            top, rest = add_steps(page, top, rnd, case_number, step_count - first_part, first_part + 1)
+            steps += rest
+            shareable = False
+        else:
+            page.add(top, LEFT_MARGIN, 'Test Script Description')
+            top += 20
+            page.add(top, LEFT_MARGIN, 'Step')
+            page.add(top, ACTION_COLUMN, 'Action')
+            page.add(top, EXPECTED_RESULT_COLUMN, 'Expected Result')
+            top += 20
+            top, steps = add_steps(page, top, rnd, case_number, step_count)
+            shareable = True
+
+        test_case = {
+            "page_number": page_number,
+            "title": title,
+            "test_case_id": test_case_id,
+            "legacy_id": legacy_id,
+            "purpose": " ".join(purpose_lines),
+            "precondition": precondition,
+            "description": description,
+            "requirements": requirements,
+            "test_script": steps
+        }
+        if postcondition is not None:
+            test_case["postcondition"] = postcondition
+        truth.append(test_case)
+    if page is not None:
+        pages.append(page)
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    for page_number, page in enumerate(pages, 1):
+        with open(output_path / f"CC_DVM-{page_number}.html", 'w', encoding='utf-8') as f:
+            f.write(render_page(page_number, page, 'CC DVM'))
+
+    return len(pages), truth
+
+def generate_capl_pages(output_dir, function_count, rnd):
+    """
+    生成CAPL函数手册页面，约每6个函数页面穿插一个Availability Chart页面和一个无关页面
+
+    返回:
+        tuple: (页面数, 期望的API列表（函数名和全部重载签名）)
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    truth = []
+    page_number = 0
+
+    def write_page(page):
+        nonlocal page_number
+        page_number += 1
+        with open(output_path / f"page{page_number}.html", 'w', encoding='utf-8') as f:
+            f.write(render_page(page_number, page, 'CAPL'))
+
+    for function_number in range(function_count):
+        if function_number % 6 == 5:
+            chart = PageBuilder()
+            chart.add(80, LEFT_MARGIN, 'Availability Chart', 'ft02')
+            chart.add(120, LEFT_MARGIN, f'caplGetValue{function_number}')
+            chart.add(120, 500, 'x')
+            write_page(chart)
+
+            overview = PageBuilder()
+            overview.add(80, LEFT_MARGIN, 'CAPL Functions Overview', 'ft02')
+            overview.add(120, LEFT_MARGIN, 'General information about CAPL functions')
+            write_page(overview)
+
+        name = f"capl{rnd.choice(CAPL_VERBS)}Value{function_number}"
+        page = PageBuilder()
+        top = TOP_MARGIN
+        page.add(top, 560, name, 'ft02')
+        top += 40
+        page.add(top, LEFT_MARGIN, 'Syntax', 'ft03')
+        signatures = [f"long {name}(dword handle{overload}, char buffer[])"
+                      for overload in range(2 if rnd.random() < 0.3 else 1)]
+        for signature in signatures:
+            page.add(top, 200, f'{signature};')
+            top += 20
+        top += 10
+        page.add(top, LEFT_MARGIN, 'Description', 'ft03')
+        page.add(top, 200, f'Gets the value {function_number}.')
+        top += 30
+        page.add(top, LEFT_MARGIN, 'Parameters', 'ft03')
+        page.add(top, 200, 'handle = file handle')
+        top += 20
+        page.add(top, 200, 'buffer = output buffer')
+        top += 30
+        page.add(top, LEFT_MARGIN, 'Returns', 'ft03')
+        page.add(top, 200, '1 on success')
+        top += 30
+        page.add(top, LEFT_MARGIN, 'Availability', 'ft03')
+        page.add(top, 200, 'Since Version 7.0')
+        write_page(page)
+
+        # 重载函数的每个签名都应提取为一个API条目
+        truth.append({"function_name": name, "syntaxes": signatures, "page": f"page{page_number}"})
+
+    return page_number, truth
+
+def generate_corpus(output_dir, case_count, capl_function_count=0, seed=0, split_ratio=0.3,
+                    missing_id_ratio=0.03, postcondition_ratio=0.3, max_steps=6, shared_page_ratio=0.2,
+                    mid_table_split_ratio=0.1):
+    """
+    生成完整的语料目录（dvm/、capl/ 和 ground_truth.json）
+
+    返回:
+        dict: 期望的提取结果
+    """
+    rnd = random.Random(seed)
+    output_path = Path(output_dir)
+
+    dvm_pages, test_cases = generate_dvm_pages(output_path / "dvm", case_count, rnd, split_ratio,
+                                               missing_id_ratio, postcondition_ratio, max_steps,
+                                               shared_page_ratio, mid_table_split_ratio)
+    capl_pages, apis = (generate_capl_pages(output_path / "capl", capl_function_count, rnd)
+                        if capl_function_count else (0, []))
+
+    ground_truth = {
+        "seed": seed,
+        "dvm": {"pages": dvm_pages, "test_cases": test_cases},
+        "capl": {"pages": capl_pages, "apis": apis}
+    }
+    with open(output_path / "ground_truth.json", 'w', encoding='utf-8') as f:
+        json.dump(ground_truth, f, ensure_ascii=False, indent=2)
+    return ground_truth
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description='生成pdftohtml格式的合成DVM/CAPL页面语料及期望结果')
+    parser.add_argument('output_dir', help='语料输出目录')
+    parser.add_argument('--cases', type=int, default=1000, help='DVM测试用例数（默认1000）')
+    parser.add_argument('--capl-functions', type=int, default=0, help='CAPL函数页面数（默认0，不生成CAPL页面）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子（默认0）')
+    parser.add_argument('--split-ratio', type=float, default=0.3, help='测试步骤位于下一页的测试用例比例（默认0.3）')
+    parser.add_argument('--missing-id-ratio', type=float, default=0.03, help='缺少Test Case ID的测试用例比例（默认0.03）')
+    parser.add_argument('--postcondition-ratio', type=float, default=0.3, help='带PostCondition段落的测试用例比例（默认0.3）')
+    parser.add_argument('--max-steps', type=int, default=6, help='每个测试用例的最大步骤数（默认6）')
+    parser.add_argument('--shared-page-ratio', type=float, default=0.2,
+                        help='与上一个测试用例位于同一页的测试用例比例（默认0.2）')
+    parser.add_argument('--mid-table-split-ratio', type=float, default=0.1,
+                        help='测试步骤表格在中间断开、后半部分位于下一页的测试用例比例（默认0.1）')
+
+    args = parser.parse_args()
+
+    ground_truth = generate_corpus(args.output_dir, args.cases, args.capl_functions, args.seed, args.split_ratio,
+                                   args.missing_id_ratio, args.postcondition_ratio, args.max_steps,
+                                   args.shared_page_ratio, args.mid_table_split_ratio)
+    print(f"已生成 {ground_truth['dvm']['pages']} 个DVM页面（{len(ground_truth['dvm']['test_cases'])} 个测试用例）"
+          f"和 {ground_truth['capl']['pages']} 个CAPL页面（{len(ground_truth['capl']['apis'])} 个函数）到 {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
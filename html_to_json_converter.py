@@ -1,9 +1,15 @@
 import argparse
+import functools
 import json
 import re
 import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from bs4 import BeautifulSoup
+import case_db
+from md_testcase_parser import unique_name
 
 def clean_html_content(html_content):
     """
@@ -158,9 +164,65 @@ def html_to_json(html_content):
     
     return result
 
-def parse_test_report(html_content, output_dir):
+# 测试用例标题格式: "序号 Test Case Silk ID:ID: 名称: 结果"，结果可省略
+# 一次匹配同时提取ID、名称和结果
+SILK_TITLE_PATTERN = re.compile(
+    r'Test Case Silk ID:(\d+):\s*(?:(.*?):\s*(Passed|Failed)|(.*?)(?:\s*:)?$)'
+)
+# 文件名中保留的字符（空格和冒号随后替换为下划线）
+FILENAME_STRIP_PATTERN = re.compile(r'[^a-zA-Z0-9_\-: ]')
+FILENAME_REPLACE_TABLE = str.maketrans({' ': '_', ':': '_'})
+
+@functools.lru_cache(maxsize=65536)
+def parse_test_case_title(test_case_text):
     """
-    解析测试报告HTML文件，提取测试用例并保存为单独的JSON文件
+    解析测试用例标题，提取ID、名称和测试结果
+    
+    参数:
+        test_case_text: 测试用例标题文本
+    
+    返回:
+        tuple: (ID, 名称, 结果)，无法提取ID时ID为None，标题中没有结果时结果为空字符串
+    """
+    if 'Test Case Silk ID:' not in test_case_text:
+        return None, test_case_text, ""
+    
+    match = SILK_TITLE_PATTERN.search(test_case_text)
+    if match:
+        if match.group(3):
+            return match.group(1), match.group(2).strip(), match.group(3)
+        return match.group(1), match.group(4).strip(), ""
+    
+    # 如果正则表达式不匹配，尝试按冒号分割
+    parts = test_case_text.split(':')
+    if len(parts) >= 4:
+        test_case_id = parts[2].strip()  # ID在第三个冒号后
+        # 名称在第四个冒号后，结果在最后
+        test_case_name = parts[3].strip()
+        # 如果还有更多部分，可能是结果信息
+        if len(parts) > 4:
+            test_case_name += '_' + '_'.join(parts[4:]).strip()
+        return test_case_id, test_case_name, ""
+    
+    return None, test_case_text, ""
+
+def test_case_filename(test_case_name, test_case_id):
+    """
+    根据测试用例名称生成文件名（不含扩展名）
+    """
+    filename = FILENAME_STRIP_PATTERN.sub('', test_case_name).translate(FILENAME_REPLACE_TABLE)
+    # 确保文件名不为空
+    if not filename:
+        filename = f"test_case_{test_case_id}"
+    # 确保文件名不会过长
+    return filename[:100]
+
+def extract_test_report_cases(html_content):
+    """
+    从测试报告HTML中提取测试用例数据（不写文件）
+    
+    返回:
+        list: (文件名, 测试用例数据) 元组列表
     """
     soup = BeautifulSoup(html_content, 'html.parser')
     
@@ -177,62 +239,16 @@ def parse_test_report(html_content, output_dir):
             if 'Test Case Silk ID' in link_text:
                 test_case_links.append(link)
     
-    # 创建输出目录
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    test_cases = []
     
     # 解析每个测试用例
     for i, test_case_link in enumerate(test_case_links):
         # 获取测试用例名称
         test_case_text = test_case_link.get_text().strip()
-        # 提取测试用例ID和名称
-        # 格式: "序号 Test Case Silk ID:ID: 名称: 结果"
-        if 'Test Case Silk ID:' in test_case_text:
-            # 使用正则表达式提取ID和名称
-            # 格式: "序号 Test Case Silk ID:ID: 名称: 结果"
-            # 先尝试匹配完整的格式
-            match = re.search(r'Test Case Silk ID:(\d+):\s*(.*?):\s*(Passed|Failed)', test_case_text)
-            if match:
-                test_case_id = match.group(1)
-                test_case_name = match.group(2).strip()
-            else:
-                # 尝试另一种格式，其中结果在最后
-                match = re.search(r'Test Case Silk ID:(\d+):\s*(.*?)\s*:\s*(Passed|Failed)$', test_case_text)
-                if match:
-                    test_case_id = match.group(1)
-                    test_case_name = match.group(2).strip()
-                else:
-                    # 再尝试匹配没有结果的格式
-                    match = re.search(r'Test Case Silk ID:(\d+):\s*(.*?)(?:\s*:)?$', test_case_text)
-                    if match:
-                        test_case_id = match.group(1)
-                        test_case_name = match.group(2).strip()
-                    else:
-                        # 如果正则表达式不匹配，尝试使用旧方法
-                        parts = test_case_text.split(':')
-                        if len(parts) >= 4:
-                            test_case_id = parts[2].strip()  # ID在第三个冒号后
-                            # 名称在第四个冒号后，结果在最后
-                            test_case_name = parts[3].strip()
-                            # 如果还有更多部分，可能是结果信息
-                            if len(parts) > 4:
-                                test_case_name += '_' + '_'.join(parts[4:]).strip()
-                        else:
-                            test_case_id = str(i)
-                            test_case_name = test_case_text
-        else:
+        test_case_id, test_case_name, verdict = parse_test_case_title(test_case_text)
+        if test_case_id is None:
             test_case_id = str(i)
-            test_case_name = test_case_text
-        
-        # 清理测试用例名称，用作文件名
-        # 保留ID和结果信息在文件名中
-        clean_name = re.sub(r'[^a-zA-Z0-9_\-: ]', '', test_case_name)
-        filename = re.sub(r'[^a-zA-Z0-9_\-]', '_', clean_name.replace(' ', '_'))
-        # 确保文件名不为空
-        if not filename:
-            filename = f"test_case_{test_case_id}"
-        # 确保文件名不会过长
-        if len(filename) > 100:
-            filename = filename[:100]
+        filename = test_case_filename(test_case_name, test_case_id)
         
         # 查找测试用例的详细信息
         # 测试用例的详细信息在父级table的下一个兄弟元素中
@@ -246,6 +262,7 @@ def parse_test_report(html_content, output_dir):
         test_case_data = {
             "id": test_case_id,
             "name": test_case_name,
+            "verdict": verdict,
             "steps": []
         }
         
@@ -261,23 +278,53 @@ def parse_test_report(html_content, output_dir):
                         timestamp = cells[0].get_text().strip()
                         test_step = cells[1].get_text().strip()
                         description = cells[2].get_text().strip()
-                        result = cells[3].get_text().strip()
                         
-                        # 添加到测试步骤列表，不包含单次测试结果
+                        # 添加到测试步骤列表，不包含单次测试结果（第4列）
                         test_case_data["steps"].append({
                             "timestamp": timestamp,
                             "test_step": test_step,
                             "description": description
                         })
         
+        test_cases.append((filename, test_case_data))
+    
+    return test_cases
+
+def parse_test_report(html_content, output_dir, sqlite_db=None, source=None):
+    """
+    解析测试报告HTML文件，提取测试用例并保存为单独的JSON文件
+    
+    参数:
+        html_content: HTML内容
+        output_dir: 测试用例JSON输出目录
+        sqlite_db: SQLite数据库路径（可选），指定时同时写入数据库
+        source: 写入数据库时记录的报告来源名称
+    
+    返回:
+        list: 测试用例数据列表
+    """
+    test_cases = extract_test_report_cases(html_content)
+    
+    # 创建输出目录
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    for filename, test_case_data in test_cases:
         # 保存为JSON文件
         output_file = os.path.join(output_dir, f"{filename}.json")
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(test_case_data, f, ensure_ascii=False, indent=2)
         
-        print(f"已保存测试用例 '{test_case_name}' 到 '{output_file}'")
+        print(f"已保存测试用例 '{test_case_data['name']}' 到 '{output_file}'")
+    
+    test_case_list = [test_case_data for _, test_case_data in test_cases]
+    
+    if sqlite_db:
+        report_id = case_db.import_test_cases(sqlite_db, test_case_list, source or output_dir, kind='report')
+        print(f"已将 {len(test_case_list)} 个测试用例写入数据库 '{sqlite_db}' (report_id={report_id})")
+    
+    return test_case_list
 
-def convert_file(input_filepath, output_filepath, parse_test_cases=False, test_cases_output_dir=None):
+def convert_file(input_filepath, output_filepath, parse_test_cases=False, test_cases_output_dir=None, sqlite_db=None):
     """
     读取HTML文件内容，将其转换为JSON格式，并写入输出文件
     """
@@ -287,7 +334,7 @@ def convert_file(input_filepath, output_filepath, parse_test_cases=False, test_c
         
         if parse_test_cases and test_cases_output_dir:
             # 解析测试用例
-            parse_test_report(html_content, test_cases_output_dir)
+            parse_test_report(html_content, test_cases_output_dir, sqlite_db, source=input_filepath)
             print(f"测试用例已保存到目录 '{test_cases_output_dir}'")
         else:
             # 常规HTML到JSON转换
@@ -306,6 +353,109 @@ def convert_file(input_filepath, output_filepath, parse_test_cases=False, test_c
     except Exception as e:
         print(f"An error occurred: {e}")
 
+def _parse_report_worker(input_filepath, output_dir):
+    """
+    批量模式的工作进程：解析单个测试报告并返回统计信息
+    """
+    start = time.perf_counter()
+    with open(input_filepath, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    
+    test_cases = parse_test_report(html_content, output_dir)
+    verdicts = Counter(test_case.get('verdict', '') for test_case in test_cases)
+    
+    return {
+        "report": str(input_filepath),
+        "output_dir": str(output_dir),
+        "test_cases": len(test_cases),
+        "passed": verdicts.get('Passed', 0),
+        "failed": verdicts.get('Failed', 0),
+        "seconds": round(time.perf_counter() - start, 3)
+    }, test_cases
+
+def batch_parse_test_reports(input_filepaths, test_cases_output_dir, jobs=None, sqlite_db=None):
+    """
+    使用进程池批量解析多个测试报告
+    每个报告的测试用例保存在输出目录下以报告文件名命名的子目录中（同名时追加 _2、_3 ...），
+    重复指定的同一报告只解析一次，并生成汇总文件 batch_summary.json
+    
+    参数:
+        input_filepaths: 测试报告HTML文件路径列表
+        test_cases_output_dir: 测试用例输出根目录
+        jobs: 并行进程数，默认为CPU核数
+        sqlite_db: SQLite数据库路径（可选），由主进程依次写入
+    
+    返回:
+        dict: 汇总信息
+    """
+    output_root = Path(test_cases_output_dir)
+    output_root.mkdir(parents=True, exist_ok=True)
+    
+    # 跳过重复指定的报告，避免两个进程写入同一子目录
+    unique_filepaths = []
+    seen_paths = set()
+    for input_filepath in input_filepaths:
+        resolved_path = Path(input_filepath).resolve()
+        if resolved_path in seen_paths:
+            print(f"跳过重复的报告 '{input_filepath}'")
+            continue
+        seen_paths.add(resolved_path)
+        unique_filepaths.append(input_filepath)
+    input_filepaths = unique_filepaths
+    
+    # 为每个报告分配唯一的子目录（同名报告追加序号，且不与其他报告的文件名冲突）
+    namespaces = {}
+    used_names = set()
+    for input_filepath in input_filepaths:
+        namespaces[input_filepath] = unique_name(Path(input_filepath).stem, used_names)
+    
+    start = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(_parse_report_worker, input_filepath, output_root / namespaces[input_filepath]): input_filepath
+            for input_filepath in input_filepaths
+        }
+        for future in as_completed(futures):
+            input_filepath = futures[future]
+            try:
+                report_summary, test_cases = future.result()
+            except Exception as e:
+                print(f"解析报告 '{input_filepath}' 时出错: {e}")
+                report_summary = {
+                    "report": str(input_filepath),
+                    "output_dir": str(output_root / namespaces[input_filepath]),
+                    "error": str(e)
+                }
+                test_cases = []
+            
+            if sqlite_db and test_cases:
+                case_db.import_test_cases(sqlite_db, test_cases, input_filepath, kind='report')
+            
+            results[input_filepath] = report_summary
+            print(f"已完成报告 '{input_filepath}'")
+    
+    # 汇总按输入顺序排列，与完成顺序无关
+    reports = [results[input_filepath] for input_filepath in input_filepaths]
+    summary = {
+        "reports": reports,
+        "total_reports": len(reports),
+        "failed_reports": sum(1 for report in reports if 'error' in report),
+        "total_test_cases": sum(report.get('test_cases', 0) for report in reports),
+        "passed": sum(report.get('passed', 0) for report in reports),
+        "failed": sum(report.get('failed', 0) for report in reports),
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+    
+    summary_file = output_root / "batch_summary.json"
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    
+    print(f"共解析 {summary['total_reports']} 个报告，{summary['total_test_cases']} 个测试用例 "
+          f"(通过 {summary['passed']}，失败 {summary['failed']})，耗时 {summary['seconds']} 秒")
+    print(f"汇总信息已保存到 '{summary_file}'")
+    return summary
+
 def generate_default_output_path(input_filepath):
     """
     通过更改扩展名生成默认输出路径
@@ -322,16 +472,30 @@ if __name__ == "__main__":
   python html_to_json_converter.py input.html output.json
   python html_to_json_converter.py input.html --output custom_name.json
   python html_to_json_converter.py input.html --parse-test-cases --test-cases-output-dir ./test_cases
+  python html_to_json_converter.py input.html --parse-test-cases --test-cases-output-dir ./test_cases --sqlite-db results.db
+  python html_to_json_converter.py --batch report1.html report2.html --test-cases-output-dir ./test_cases --jobs 8
         """
     )
-    parser.add_argument('input_file', type=str, help='输入HTML文件的路径。')
+    parser.add_argument('input_file', type=str, nargs='?', help='输入HTML文件的路径。')
     parser.add_argument('output_file', type=str, nargs='?', help='输出JSON文件的路径（可选）。')
     parser.add_argument('--output', '-o', type=str, help='输出JSON文件的路径（替代方式）。')
     parser.add_argument('--parse-test-cases', action='store_true', help='解析测试用例并保存为单独的JSON文件')
     parser.add_argument('--test-cases-output-dir', type=str, help='测试用例输出目录')
+    parser.add_argument('--sqlite-db', type=str, help='同时将测试用例写入SQLite数据库（可选）')
+    parser.add_argument('--batch', nargs='+', metavar='REPORT', help='批量解析多个测试报告（需要指定 --test-cases-output-dir）')
+    parser.add_argument('--jobs', '-j', type=int, help='批量模式的并行进程数（默认为CPU核数）')
     
     args = parser.parse_args()
     
+    if args.batch:
+        if not args.test_cases_output_dir:
+            parser.error('--batch 需要指定 --test-cases-output-dir')
+        batch_parse_test_reports(args.batch, args.test_cases_output_dir, args.jobs, args.sqlite_db)
+        raise SystemExit(0)
+    
+    if not args.input_file:
+        parser.error('需要指定输入HTML文件的路径')
+    
     # 确定输出文件路径
     if args.output:
         output_file = args.output
@@ -340,4 +504,4 @@ if __name__ == "__main__":
     else:
         output_file = generate_default_output_path(args.input_file)
     
-    convert_file(args.input_file, output_file, args.parse_test_cases, args.test_cases_output_dir)
\ No newline at end of file
+    convert_file(args.input_file, output_file, args.parse_test_cases, args.test_cases_output_dir, args.sqlite_db)
\ No newline at end of file
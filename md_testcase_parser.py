@@ -1,89 +1,390 @@
+import io
 import re
 import os
+import shutil
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-def parse_testcases(md_file_path, output_dir):
-    """解析Markdown文件中的测试用例并保存为单独文件"""
-    with open(md_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+# 测试用例标记 - 支持两种格式
+# 格式1: "Test case :"，前面可以有章节号（如 "2.3 "），遇到 "Test Specification:" 时结束
+# 格式2: "数字 Test Case Silk ID:"，前面必须有编号
+TESTCASE_MARKER = 'Test case :'
+SILK_ID_MARKER = 'Test Case Silk ID:'
+SPECIFICATION_MARKER = 'Test Specification:'
+
+MARKER_PATTERNS = {
+    None: re.compile(re.escape(TESTCASE_MARKER) + '|' + re.escape(SILK_ID_MARKER)),
+    "Test case": re.compile(re.escape(TESTCASE_MARKER) + '|' + re.escape(SPECIFICATION_MARKER)),
+    "Silk ID": re.compile(re.escape(SILK_ID_MARKER))
+}
+
+# 标记前的章节号/编号，可以跨行（\s包括换行）
+SECTION_NUMBER_PREFIX = re.compile(r'\d+\.\d+(?:\.\d+)?\s+\Z')
+SILK_NUMBER_PREFIX = re.compile(r'\d+\s+\Z')
+# 由数字、点号和空白组成的文本，标记前缀只可能出现在其中
+NUMBER_RUN = re.compile(r'[\d.\s]*')
+
+# 需要从测试用例内容中删除的页眉页脚
+CLEANUP_PATTERNS = [re.compile(pattern) for pattern in (
+    r'RELEASED.*?[A-Z]+ DVM\n',
+    r'Document Type.*?',
+    r'Vehicle Manufacturer.*?',
+    r'Document Release Status.*?'
+)]
+
+def trailing_number_run(pieces):
+    """
+    返回文本片段序列末尾由数字、点号和空白组成的部分，只向前检查到第一个不属于这部分的片段
+    """
+    run = []
+    for piece in reversed(pieces):
+        length = NUMBER_RUN.match(piece[::-1]).end()
+        run.append(piece[len(piece) - length:])
+        if length < len(piece):
+            break
+    return ''.join(reversed(run))
+
+def marker_prefix_length(pieces, prefix_pattern):
+    """
+    返回文本片段序列末尾标记前缀（章节号或编号）的长度，没有前缀时返回None
+    取最长的前缀，与按正则表达式在整个文档中匹配的结果一致
+    """
+    run = trailing_number_run(pieces)
+    match = prefix_pattern.search(run)
+    return len(run) - match.start() if match else None
+
+def split_testcases(lines):
+    """
+    逐行切分测试用例，一次线性扫描，内存中只保留当前测试用例的内容
+
+    根据最先出现的标记确定格式，之后只识别该格式的标记；
+    每遇到下一个测试用例的开始（或 "Test Specification:"）就产生上一个测试用例
+
+    参数:
+        lines: 文本行的可迭代对象（保留行尾换行符）
+
+    返回:
+        generator: (格式, 测试用例内容)，格式为 "Test case" 或 "Silk ID"，
+                   内容为标记之后到下一个测试用例之前的文本
+    """
+    pattern_type = None
+    # 当前测试用例的内容片段，为None时不在测试用例中
+    parts = None
+    # 不在测试用例中时，已读文本末尾可能构成下一个标记前缀的部分
+    tail = ''
+
+    for line in lines:
+        pos = 0
+        while True:
+            match = MARKER_PATTERNS[pattern_type].search(line, pos)
+            if match is None:
+                break
+            marker = match.group()
+            preceding = line[pos:match.start()]
+
+            pieces = parts + [preceding] if parts is not None else [tail, preceding]
+
+            prefix_length = 0
+            if marker == SILK_ID_MARKER:
+                prefix_length = marker_prefix_length(pieces, SILK_NUMBER_PREFIX)
+                if prefix_length is None:
+                    # 没有编号的 "Test Case Silk ID:" 不是测试用例的开始
+                    if parts is not None:
+                        parts = pieces + [marker]
+                    else:
+                        tail = ''
+                    pos = match.end()
+                    continue
+            elif marker == TESTCASE_MARKER and parts is not None:
+                prefix_length = marker_prefix_length(pieces, SECTION_NUMBER_PREFIX) or 0
+
+            if pattern_type is None:
+                pattern_type = "Silk ID" if marker == SILK_ID_MARKER else "Test case"
+            if parts is not None:
+                text = ''.join(pieces)
+                yield pattern_type, text[:len(text) - prefix_length]
+
+            if marker == SPECIFICATION_MARKER:
+                parts = None
+                tail = ''
+            else:
+                parts = []
+            pos = match.end()
+
+        rest = line[pos:]
+        if parts is not None:
+            parts.append(rest)
+        else:
+            tail = trailing_number_run([tail, rest])
+
+    if parts is not None:
+        testcase = ''.join(parts)
+        # 文档末尾的换行符不属于最后一个测试用例
+        if testcase.endswith('\n'):
+            testcase = testcase[:-1]
+        yield pattern_type, testcase
+
+def clean_testcase(testcase):
+    """
+    删除测试用例内容中的页眉页脚
+    """
+    for pattern in CLEANUP_PATTERNS:
+        testcase = pattern.sub('', testcase)
+    return testcase
+
+def testcase_file_name(testcase, index, prefix):
+    """
+    根据测试用例内容的第一行生成文件名（不含扩展名）
+    """
+    testcase_name = testcase.split('\n', 1)[0].strip()
+    # 清理名称，替换非法字符为下划线，并限制长度
+    testcase_name = re.sub(r'[^a-zA-Z0-9_\-]', '_', testcase_name)
+    testcase_name = testcase_name[:50] # 限制文件名长度
+    if not testcase_name: # 如果清理后为空，则使用默认名称
+        testcase_name = f'testcase_{index}'
+    return prefix + testcase_name
+
+def unique_name(name, used_names):
+    """
+    返回不与已用名称重复的名称（依次追加 _2、_3 ...）并记为已用
+    比较时不区分大小写，避免在不区分大小写的文件系统上互相覆盖
+    """
+    candidate = name
+    number = 2
+    while candidate.lower() in used_names:
+        candidate = f'{name}_{number}'
+        number += 1
+    used_names.add(candidate.lower())
+    return candidate
+
+def archive_format(archive_path):
+    """
+    根据文件名后缀返回压缩包格式: zip、tar、tar.gz
+    """
+    name = str(archive_path).lower()
+    if name.endswith('.zip'):
+        return 'zip'
+    if name.endswith('.tar.gz') or name.endswith('.tgz'):
+        return 'tar.gz'
+    if name.endswith('.tar'):
+        return 'tar'
+    raise ValueError(f"无法识别的压缩包格式: {archive_path}（支持 .zip、.tar、.tar.gz、.tgz）")
+
+class DirectoryWriter:
+    """
+    把每个测试用例写为输出目录中的单独文件
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    def add(self, name, content):
+        with open(os.path.join(self.output_dir, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def add_file(self, path, name):
+        shutil.copyfile(path, os.path.join(self.output_dir, name))
+
+    def close(self, success=True):
+        pass
+
+class ArchiveWriter:
+    """
+    把每个测试用例直接写为压缩包中的条目，不在磁盘上产生中间文件
+    压缩包先写入临时文件，成功结束后再替换目标文件，失败时不留下不完整的压缩包
+
+    archive_root 不为空时所有条目位于压缩包内的 <archive_root>/ 目录下
+    """
+
+    def __init__(self, archive_path, archive_root=''):
+        self.archive_path = Path(archive_path)
+        self.archive_root = archive_root
+        self.format = archive_format(archive_path)
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        self._temp_path = self.archive_path.with_name(f"{self.archive_path.name}.{os.getpid()}.tmp")
+        self._mtime = time.time()
+
+        if self.format == 'zip':
+            self._archive = zipfile.ZipFile(self._temp_path, 'w', zipfile.ZIP_DEFLATED)
+        else:
+            self._archive = tarfile.open(self._temp_path, 'w:gz' if self.format == 'tar.gz' else 'w')
+
+        if archive_root:
+            self._add_directory(archive_root)
+
+    def add(self, name, content):
+        data = content.encode('utf-8')
+        if self.format == 'zip':
+            info = zipfile.ZipInfo(self._entry_name(name), time.localtime(self._mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o100644 << 16
+            self._archive.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(self._entry_name(name))
+            info.size = len(data)
+            info.mtime = self._mtime
+            info.mode = 0o644
+            self._archive.addfile(info, io.BytesIO(data))
+
+    def add_file(self, path, name):
+        if self.format == 'zip':
+            self._archive.write(path, self._entry_name(name))
+        else:
+            self._archive.add(path, self._entry_name(name), recursive=False)
+
+    def close(self, success=True):
+        self._archive.close()
+        if success:
+            os.replace(self._temp_path, self.archive_path)
+        else:
+            os.remove(self._temp_path)
+
+    def _entry_name(self, name):
+        return f'{self.archive_root}/{name}' if self.archive_root else name
+
+    def _add_directory(self, name):
+        if self.format == 'zip':
+            info = zipfile.ZipInfo(f'{name}/', time.localtime(self._mtime)[:6])
+            info.external_attr = (0o40755 << 16) | 0x10
+            self._archive.writestr(info, b'')
+        else:
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.DIRTYPE
+            info.mtime = self._mtime
+            info.mode = 0o755
+            self._archive.addfile(info)
+
+def parse_testcases(md_file_path, output_dir='testcases', archive=None, archive_root='', include_source=False):
+    """
+    解析Markdown文件中的测试用例并保存为单独文件，返回测试用例数
+
+    参数:
+        md_file_path: 输入的Markdown文件路径
+        output_dir: 输出目录路径（未指定archive时使用）
+        archive: 压缩包路径（可选），指定时每个测试用例直接写入压缩包（.zip、.tar、.tar.gz、.tgz），不产生中间文件
+        archive_root: 压缩包内的根目录名（可选）
+        include_source: 为True时同时保存原始Markdown文件
+
+    同名的测试用例依次追加 _2、_3 ... 后缀，不会互相覆盖
+    """
     # 从文件名提取前缀
     md_filename = os.path.basename(md_file_path)
     prefix = os.path.splitext(md_filename)[0] + '_'
-    
-    # 创建输出目录
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    # 匹配测试用例模式 - 支持两种格式
-    # 格式1: "Test case :" 
-    testcase_pattern1 = re.compile(
-        r'(?:\d+\.\d+(?:\.\d+)?\s+)?Test case :(.*?)(?=(?:\d+\.\d+(?:\.\d+)?\s+)?Test case :|Test Specification:|$)', 
-        re.DOTALL
-    )
-    
-    # 格式2: "数字 Test Case Silk ID:"
-    testcase_pattern2 = re.compile(
-        r'\d+\s+Test Case Silk ID:(.*?)(?=\d+\s+Test Case Silk ID:|$)', 
-        re.DOTALL
-    )
-    
-    # 尝试两种模式匹配
-    testcases1 = testcase_pattern1.findall(content)
-    testcases2 = testcase_pattern2.findall(content)
-    
-    # 选择匹配到更多测试用例的模式
-    if len(testcases2) > len(testcases1):
-        testcases = testcases2
-        pattern_type = "Silk ID"
-        print(f"检测到 'Test Case Silk ID' 格式，找到 {len(testcases2)} 个测试用例")
+
+    # 创建输出目录或压缩包
+    writer = ArchiveWriter(archive, archive_root) if archive else DirectoryWriter(output_dir)
+    used_names = {md_filename.lower()} if include_source else set()
+
+    pattern_type = "Test case"
+    count = 0
+    success = False
+    try:
+        with open(md_file_path, 'r', encoding='utf-8') as f:
+            for count, (pattern_type, testcase) in enumerate(split_testcases(f), 1):
+                testcase = clean_testcase(testcase)
+                testcase_name = unique_name(testcase_file_name(testcase, count, prefix), used_names)
+
+                # 保存为单独文件（或压缩包条目）
+                header = "# Test Case Silk ID: " if pattern_type == "Silk ID" else "# Test Case: "
+                writer.add(f'{testcase_name}.md', header + testcase)
+
+        if include_source:
+            writer.add_file(md_file_path, md_filename)
+        success = True
+    finally:
+        writer.close(success)
+
+    if pattern_type == "Silk ID":
+        print(f"检测到 'Test Case Silk ID' 格式，找到 {count} 个测试用例")
     else:
-        testcases = testcases1
-        pattern_type = "Test case"
-        print(f"检测到 'Test case' 格式，找到 {len(testcases1)} 个测试用例")
-    
-    for i, testcase in enumerate(testcases, 1):
-        # 清理测试用例内容
-        # 合并多个 re.sub 调用
-        patterns = [
-            r'RELEASED.*?[A-Z]+ DVM\n',
-            r'Document Type.*?',
-            r'Vehicle Manufacturer.*?',
-            r'Document Release Status.*?'
-        ]
-        for pattern in patterns:
-            testcase = re.sub(pattern, '', testcase, flags=re.DOTALL if '\n' in pattern else 0)
-
-        # 尝试从测试用例内容中提取名称
-        name_match = re.search(r'(.*?)$', testcase, re.MULTILINE)
-        if name_match:
-            testcase_name = name_match.group(1).strip()
-            # 清理名称，替换非法字符为下划线，并限制长度
-            testcase_name = re.sub(r'[^a-zA-Z0-9_\-]', '_', testcase_name)
-            testcase_name = testcase_name[:50] # 限制文件名长度
-            if not testcase_name: # 如果清理后为空，则使用默认名称
-                testcase_name = f'testcase_{i}'
-            testcase_name = prefix + testcase_name
-        else:
-            testcase_name = prefix + f'testcase_{i}'
+        print(f"检测到 'Test case' 格式，找到 {count} 个测试用例")
+    print(f"成功解析并保存了{count}个测试用例到{archive or output_dir}")
+    return count
+
+def archive_root_name(md_file_path):
+    """
+    返回批量模式中输入文件对应的压缩包名和压缩包内的根目录名 testcases_<文件名>
+    """
+    return 'testcases_' + Path(md_file_path).stem
+
+def parse_to_archive(md_file_path, archive_dir, archive_suffix='zip'):
+    """
+    批量模式的工作进程：把单个Markdown文件的测试用例和原始文件直接写入
+    <archive_dir>/testcases_<文件名>.<archive_suffix>，压缩包内的布局与
+    zip -r testcases_<文件名>.zip testcases_<文件名> 一致，返回测试用例数
+    """
+    root_name = archive_root_name(md_file_path)
+    return parse_testcases(md_file_path, archive=Path(archive_dir) / f'{root_name}.{archive_suffix}',
+                           archive_root=root_name, include_source=True)
 
-        # 保存为单独文件
-        output_file = os.path.join(output_dir, f'{testcase_name}.md')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            if pattern_type == "Silk ID":
-                f.write(f"# Test Case Silk ID: ")
+def batch_parse_testcases(md_file_paths, output_dir=None, archive_dir=None, jobs=None, archive_suffix='zip'):
+    """
+    使用进程池批量解析多个Markdown文件，在同一个Python进程中完成解析和打包
+
+    参数:
+        md_file_paths: 输入的Markdown文件路径列表
+        output_dir: 测试用例输出目录（不打包时使用，所有文件的测试用例按文件名前缀区分）
+        archive_dir: 打包输出目录（可选），指定时每个文件的测试用例直接写入压缩包 testcases_<文件名>.<archive_suffix>
+        jobs: 并行进程数，默认为CPU核数
+        archive_suffix: 压缩包格式（zip、tar、tar.gz）
+
+    返回:
+        int: 解析失败的文件数
+    """
+    if archive_dir is not None:
+        Path(archive_dir).mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            (executor.submit(parse_to_archive, md_file_path, archive_dir, archive_suffix) if archive_dir is not None else
+             executor.submit(parse_testcases, md_file_path, output_dir)): md_file_path
+            for md_file_path in md_file_paths
+        }
+        for future in as_completed(futures):
+            md_file_path = futures[future]
+            try:
+                count = future.result()
+            except Exception as e:
+                print(f"解析文件 '{md_file_path}' 时出错: {e}")
+                failed += 1
+                continue
+            if archive_dir is not None:
+                print(f"已完成文件 '{md_file_path}'（{count} 个测试用例），"
+                      f"压缩包: {Path(archive_dir) / archive_root_name(md_file_path)}.{archive_suffix}")
             else:
-                f.write(f"# Test Case: ")
-            f.write(testcase)
-    
-    print(f"成功解析并保存了{len(testcases)}个测试用例到{output_dir}")
+                print(f"已完成文件 '{md_file_path}'（{count} 个测试用例）")
+
+    return failed
 
 if __name__ == "__main__":
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='解析Markdown文件中的测试用例')
-    parser.add_argument('md_file', help='输入的Markdown文件路径')
-    parser.add_argument('-o', '--output', default='testcases', 
+    parser.add_argument('md_file', nargs='+', help='输入的Markdown文件路径（可以指定多个）')
+    parser.add_argument('-o', '--output', default='testcases',
                        help='输出目录路径，默认为当前目录下的testcases文件夹')
-    
+    parser.add_argument('--archive',
+                       help='把测试用例直接写入压缩包（.zip、.tar、.tar.gz、.tgz），不产生中间文件（只能有一个输入文件）')
+    parser.add_argument('--archive-dir',
+                       help='打包模式：每个输入文件的测试用例与原始文件一起直接写入 <目录>/testcases_<文件名>.zip')
+    parser.add_argument('--archive-format', choices=['zip', 'tar', 'tar.gz'], default='zip',
+                       help='打包模式的压缩包格式（默认zip）')
+    parser.add_argument('--jobs', '-j', type=int, help='多个输入文件时的并行进程数（默认为CPU核数）')
+
     args = parser.parse_args()
-    parse_testcases(args.md_file, args.output)
\ No newline at end of file
+    if args.archive and (len(args.md_file) > 1 or args.archive_dir):
+        parser.error('--archive 只能用于单个输入文件，且不能与 --archive-dir 同时使用')
+
+    if args.archive:
+        parse_testcases(args.md_file[0], archive=args.archive)
+    elif len(args.md_file) == 1 and args.archive_dir is None:
+        parse_testcases(args.md_file[0], args.output)
+    elif len(args.md_file) == 1:
+        parse_to_archive(args.md_file[0], args.archive_dir, args.archive_format)
+    elif batch_parse_testcases(args.md_file, args.output, args.archive_dir, args.jobs, args.archive_format):
+        raise SystemExit(1)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+tracemalloc内存报告
+在提取过程中跟踪Python对象的内存分配，结束时输出当前/峰值内存和分配最多的代码位置
+（只跟踪当前进程，--jobs 大于1时工作进程中的分配不计入）
+"""
+
+import contextlib
+import gc
+import tracemalloc
+
+# 报告中列出的分配位置数
+DEFAULT_TOP = 10
+
+@contextlib.contextmanager
+def trace_memory(enabled=True, top=DEFAULT_TOP):
+    """
+    在上下文中跟踪内存分配，退出时打印报告；enabled为False时不做任何事
+
+    参数:
+        enabled: 是否跟踪
+        top: 报告中列出的分配位置数
+    """
+    if not enabled:
+        yield
+        return
+
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        peak = tracemalloc.get_traced_memory()[1]
+        # 先回收循环引用（如bs4文档树），报告中只保留仍然存活的分配
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot()
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print_memory_report(snapshot, current, peak, top)
+
+def print_memory_report(snapshot, current, peak, top=DEFAULT_TOP):
+    """
+    打印内存报告
+    """
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+    stats = snapshot.statistics('lineno')
+
+    print(f"\n内存跟踪: 当前 {current / 1024 / 1024:.2f} MiB，峰值 {peak / 1024 / 1024:.2f} MiB，"
+          f"仍然存活的分配 {sum(stat.count for stat in stats)} 个")
+    for stat in stats[:top]:
+        frame = stat.traceback[0]
+        print(f"  {frame.filename}:{frame.lineno}: {stat.size / 1024:.1f} KiB（{stat.count} 个）")
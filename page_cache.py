@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+pdftohtml页面二进制缓存
+一次性把pdftohtml逐页HTML目录“编译”为单个列式缓存文件：
+坐标、字体类编号和排序后的行号存为紧凑的整数数组，文本存为一个UTF-8字符串表，
+读取时通过mmap按页直接构建页面定位文本索引，无需再次解析HTML
+
+文件格式:
+    文件头: 魔数 b'PTXC'、格式版本、元数据长度（struct '<4sII'）
+    元数据: JSON（字节序、字体类名表、页面表、各数据段的偏移和长度）
+    数据段（8字节对齐，本机字节序）:
+        tops / lefts: 每行坐标（int32）
+        font_ids: 每行字体类名在字体类名表中的编号（uint32）
+        sorted_rows: 每页内按 (top, left, 行号) 排序的页内行号（int32）
+        text_offsets: 每行文本在字符串表中的字节偏移（uint32，共 行数+1 个）
+        text_blob: 所有行文本的UTF-8编码
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from page_text_index import PageTextIndex
+
+MAGIC = b'PTXC'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sII')
+ALIGNMENT = 8
+
+# 各数据段及其数组类型，按写入顺序排列
+SECTIONS = (
+    ('tops', 'i'),
+    ('lefts', 'i'),
+    ('font_ids', 'I'),
+    ('sorted_rows', 'i'),
+    ('text_offsets', 'I'),
+    ('text_blob', 'B'),
+)
+
+def page_sort_key(path):
+    """
+    按文件名中的第一个数字排序（CC_DVM-12.html、page12.html）
+    """
+    number_match = re.search(r'(\d+)', path.stem)
+    return (int(number_match.group(1)) if number_match else 0, path.name)
+
+def is_page_cache(path):
+    """
+    检查文件是否为页面缓存文件
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def compile_page_cache(input_dir, cache_file, pattern='*.html'):
+    """
+    把页面目录编译为缓存文件
+
+    参数:
+        input_dir: pdftohtml逐页HTML目录
+        cache_file: 输出的缓存文件路径
+        pattern: 页面文件名匹配模式
+
+    返回:
+        int: 编译的页面数
+    """
+    html_files = sorted(Path(input_dir).glob(pattern), key=page_sort_key)
+
+    columns = {name: array(typecode) for name, typecode in SECTIONS}
+    columns['text_offsets'].append(0)
+    font_ids = {}
+    pages = []
+
+    for html_file in html_files:
+        with open(html_file, 'r', encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+        page_index = PageTextIndex.from_soup(soup)
+
+        start = len(columns['tops'])
+        columns['tops'].extend(page_index.tops)
+        columns['lefts'].extend(page_index.lefts)
+        columns['sorted_rows'].extend(page_index._sorted_rows)
+        for font_class in page_index.font_classes:
+            columns['font_ids'].append(font_ids.setdefault(font_class, len(font_ids)))
+        for text in page_index.texts:
+            columns['text_blob'].frombytes(text.encode('utf-8'))
+            columns['text_offsets'].append(len(columns['text_blob']))
+
+        pages.append({
+            "name": html_file.name,
+            "start": start,
+            "end": len(columns['tops']),
+            # <h1>-<h6> 标题文本，按级别和文档顺序排列（DVM页面的测试用例标题可能出现在其中）
+            "headings": [heading.get_text().strip() for level in range(1, 7) for heading in soup.find_all(f'h{level}')]
+        })
+
+    # 先确定各数据段的偏移，再写入元数据和数据段
+    sections = {}
+    offset = 0
+    for name, _ in SECTIONS:
+        size = len(columns[name]) * columns[name].itemsize
+        sections[name] = [offset, size]
+        offset += size + (-size % ALIGNMENT)
+
+    meta = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "source_dir": str(input_dir),
+        "rows": len(columns['tops']),
+        "font_classes": list(font_ids),
+        "pages": pages,
+        "sections": sections
+    }, ensure_ascii=False).encode('utf-8')
+    data_start = HEADER.size + len(meta)
+    data_start += -data_start % ALIGNMENT
+
+    cache_path = Path(cache_file)
+    temp_file = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    with open(temp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)))
+        f.write(meta)
+        f.write(b'\0' * (data_start - HEADER.size - len(meta)))
+        for name, _ in SECTIONS:
+            data = columns[name].tobytes()
+            f.write(data)
+            f.write(b'\0' * (-len(data) % ALIGNMENT))
+    os.replace(temp_file, cache_path)
+
+    return len(pages)
+
+class PageCache:
+    """
+    页面缓存读取器，通过mmap按页名随机访问页面定位文本索引
+    """
+
+    def __init__(self, cache_file):
+        self._file = open(cache_file, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, meta_len = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"不是受支持的页面缓存文件: {cache_file}")
+
+        meta = json.loads(self._mmap[HEADER.size:HEADER.size + meta_len].decode('utf-8'))
+        if meta['byteorder'] != sys.byteorder:
+            self.close()
+            raise ValueError(f"页面缓存文件的字节序与当前平台不一致，请重新编译: {cache_file}")
+
+        data_start = HEADER.size + meta_len
+        data_start += -data_start % ALIGNMENT
+        self._view = memoryview(self._mmap)
+        self._sections = {
+            name: self._view[data_start + offset:data_start + offset + size]
+            for name, (offset, size) in meta['sections'].items()
+        }
+        self._text_offsets = self._sections['text_offsets'].cast('I')
+
+        self.source_dir = meta['source_dir']
+        self.font_classes = meta['font_classes']
+        self.pages = meta['pages']
+        self._pages_by_name = {page['name']: page for page in self.pages}
+
+    def close(self):
+        """
+        释放内存映射（从缓存构建的页面索引均为独立副本，关闭后仍可使用）
+        """
+        if getattr(self, '_view', None) is not None:
+            self._text_offsets.release()
+            for section in self._sections.values():
+                section.release()
+            self._view.release()
+            self._view = None
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __contains__(self, name):
+        return name in self._pages_by_name
+
+    def names(self):
+        """
+        返回所有页面文件名（按文件名中的页码排序）
+        """
+        return [page['name'] for page in self.pages]
+
+    def headings(self, name):
+        """
+        返回页面的 <h1>-<h6> 标题文本
+        """
+        return self._pages_by_name[name]['headings']
+
+    def page_index(self, name):
+        """
+        构建指定页面的定位文本索引
+        """
+        page = self._pages_by_name[name]
+        start, end = page['start'], page['end']
+
+        tops = self._int_array('tops', 'i', start, end)
+        lefts = self._int_array('lefts', 'i', start, end)
+        sorted_rows = self._int_array('sorted_rows', 'i', start, end)
+        font_classes = [self.font_classes[font_id] for font_id in self._int_array('font_ids', 'I', start, end)]
+
+        offsets = self._text_offsets[start:end + 1].tolist()
+        blob = self._sections['text_blob'][offsets[0]:offsets[-1]].tobytes()
+        base = offsets[0]
+        texts = [blob[offsets[row] - base:offsets[row + 1] - base].decode('utf-8') for row in range(end - start)]
+
+        return PageTextIndex(tops, lefts, font_classes, texts, sorted_rows)
+
+    def _int_array(self, section, typecode, start, end):
+        values = array(typecode)
+        values.frombytes(self._sections[section][start * values.itemsize:end * values.itemsize])
+        return values
+
+def main():
+    """
+    主函数
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='把pdftohtml逐页HTML目录编译为二进制页面缓存')
+    parser.add_argument('input_dir', help='pdftohtml逐页HTML目录')
+    parser.add_argument('cache_file', help='输出的缓存文件路径')
+    parser.add_argument('--pattern', default='*.html', help='页面文件名匹配模式（默认 *.html）')
+
+    args = parser.parse_args()
+
+    page_count = compile_page_cache(args.input_dir, args.cache_file, args.pattern)
+    print(f"已将 {page_count} 个页面编译到 {args.cache_file}")
+
+if __name__ == "__main__":
+    main()
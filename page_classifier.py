@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+页面预分类
+在构建BeautifulSoup之前，只通过原始文本判断pdftohtml页面的类型，
+让CAPL API提取和DVM测试用例提取跳过不可能包含有效内容的页面
+"""
+
+import html
+import re
+
+from page_text_index import PageTextIndex
+
+# 文档类型
+DOCUMENT_CAPL = 'capl'
+DOCUMENT_DVM = 'dvm'
+
+# 页面类型
+PAGE_AVAILABILITY_CHART = 'availability_chart'
+PAGE_FUNCTION = 'function_page'
+PAGE_TEST_CASE_HEADER = 'test_case_header'
+PAGE_SCRIPT_CONTINUATION = 'script_continuation'
+PAGE_IRRELEVANT = 'irrelevant'
+
+COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.DOTALL)
+STYLE_SCRIPT_PATTERN = re.compile(r'<(style|script)\b[^>]*>.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]*>')
+
+# 测试用例标题：数字+Test case+描述+(Ver: 数字)
+TEST_CASE_HEADER_PATTERN = re.compile(r'\d+(\.\d+)*\s+Test case\s*[:\s].*\(Ver:\s*\d+\)')
+# 测试脚本的步骤格式
+STEP_ACTION_PATTERN = re.compile(r'Step\s+Action', re.IGNORECASE)
+READ_DID_STEP_PATTERN = re.compile(r'\d+\s+Read DID', re.IGNORECASE)
+NUMBERED_STEP_PATTERN = re.compile(r'\d+\s+[A-Z][a-z]')
+
+def page_text(html_content):
+    """
+    不构建soup，直接从HTML中去除标签得到页面文本
+    与 BeautifulSoup(html_content).get_text() 的结果一致（不包含注释、<style> 和 <script> 内容）
+    """
+    text = COMMENT_PATTERN.sub('', html_content)
+    text = STYLE_SCRIPT_PATTERN.sub('', text)
+    text = TAG_PATTERN.sub('', text)
+    return html.unescape(text)
+
+def has_test_case_header_text(text):
+    """
+    根据页面文本判断页面是否包含测试用例标题
+    """
+    return 'Test case' in text and bool(TEST_CASE_HEADER_PATTERN.search(text))
+
+def has_test_script_text(text):
+    """
+    根据页面文本判断页面是否包含测试脚本步骤
+    """
+    return bool(STEP_ACTION_PATTERN.search(text) or
+                READ_DID_STEP_PATTERN.search(text) or
+                NUMBERED_STEP_PATTERN.search(text))
+
+def has_capl_section_text(text):
+    """
+    根据页面文本判断CAPL手册页面是否可能包含 Availability Chart 或 Syntax 段落
+    两者都不出现的页面不可能包含这样的<p>段落，无需解析即可判定为无关页面
+    """
+    return 'Availability Chart' in text or 'Syntax' in text
+
+def classify_page(html_content, document):
+    """
+    对页面进行预分类
+
+    参数:
+        html_content: 页面HTML内容（str或bytes）
+        document: 文档类型，DOCUMENT_CAPL 或 DOCUMENT_DVM
+
+    返回:
+        str: 页面类型
+            CAPL手册: PAGE_AVAILABILITY_CHART / PAGE_FUNCTION / PAGE_IRRELEVANT
+            DVM文档: PAGE_TEST_CASE_HEADER / PAGE_SCRIPT_CONTINUATION / PAGE_IRRELEVANT
+        PAGE_FUNCTION 和 PAGE_TEST_CASE_HEADER 只表示页面可能包含有效内容，仍需完整解析
+    """
+    if isinstance(html_content, bytes):
+        html_content = html_content.decode('utf-8', errors='replace')
+
+    if document == DOCUMENT_CAPL:
+        # CAPL提取只根据<p>段落文本判断（Availability Chart 出现在<title>等位置时不跳过页面），
+        # 页面文本中连这两个子串都没有时才不解析页面
+        if not has_capl_section_text(page_text(html_content)):
+            return PAGE_IRRELEVANT
+        return classify_text(PageTextIndex.from_html(html_content).text(), document)
+    return classify_text(page_text(html_content), document)
+
+def classify_text(text, document):
+    """
+    根据页面文本进行预分类（用于已经得到页面文本、没有原始HTML的输入，如pdftohtml -xml）
+    返回值与 classify_page 相同
+    """
+    if document == DOCUMENT_CAPL:
+        if 'Availability Chart' in text:
+            return PAGE_AVAILABILITY_CHART
+        # 没有Syntax section的页面不可能识别出函数
+        if 'Syntax' in text:
+            return PAGE_FUNCTION
+        return PAGE_IRRELEVANT
+
+    if document == DOCUMENT_DVM:
+        if has_test_case_header_text(text):
+            return PAGE_TEST_CASE_HEADER
+        if has_test_script_text(text):
+            return PAGE_SCRIPT_CONTINUATION
+        return PAGE_IRRELEVANT
+
+    raise ValueError(f"未知的文档类型: {document}")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+增量提取清单
+记录上一次提取时每个页面文件的哈希和页面片段（映射阶段的结果），以及每页输出文件的摘要：
+    页面未变化时直接复用缓存的片段，不再读取和解析HTML
+    页面输出内容未变化时不重写对应的JSON文件
+
+清单保存为输出目录中的JSON文件，选项（如页面文件名格式）与上次不一致时清单作废
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+MANIFEST_FILE = '.extraction_manifest.json'
+MANIFEST_VERSION = 1
+
+def file_digest(path):
+    """
+    计算文件内容的SHA-256摘要
+    """
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def content_digest(text):
+    """
+    计算文本的SHA-256摘要
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def file_signature(path):
+    """
+    返回文件的 (修改时间(纳秒), 大小)，用于在计算哈希之前快速判断文件是否可能变化
+    """
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+class PageManifest:
+    """
+    增量提取清单
+
+    pages: 页面文件名 -> {"signature": [mtime_ns, size], "sha256": 摘要, "fragment": 页面片段（JSON形式）}
+    outputs: 单页输出文件名 -> 输出内容摘要
+    """
+
+    def __init__(self, options=None, pages=None, outputs=None):
+        self.options = options or {}
+        self.pages = pages or {}
+        self.outputs = outputs or {}
+
+    @classmethod
+    def load(cls, output_dir, options):
+        """
+        读取输出目录中的清单；清单不存在、无法解析或选项不一致时返回空清单
+        """
+        manifest_path = Path(output_dir) / MANIFEST_FILE
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(options)
+
+        if data.get("version") != MANIFEST_VERSION or data.get("options") != options:
+            return cls(options)
+        return cls(options, data.get("pages"), data.get("outputs"))
+
+    def save(self, output_dir):
+        """
+        原子地写入清单（先写临时文件再替换）
+        """
+        manifest_path = Path(output_dir) / MANIFEST_FILE
+        temp_file = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "options": self.options,
+                "pages": self.pages,
+                "outputs": self.outputs
+            }, f, ensure_ascii=False)
+        os.replace(temp_file, manifest_path)
+
+    def cached_fragment(self, path):
+        """
+        页面文件未变化时返回缓存的页面片段（JSON形式），否则返回None
+        修改时间变化但内容未变化的页面同样视为未变化，并更新记录的修改时间
+        """
+        entry = self.pages.get(path.name)
+        if entry is None:
+            return None
+
+        signature = file_signature(path)
+        if entry["signature"] != signature:
+            if entry["sha256"] != file_digest(path):
+                return None
+            entry["signature"] = signature
+
+        return entry["fragment"]
+
+    def record_fragment(self, path, fragment):
+        """
+        记录重新提取的页面片段（JSON形式）
+        """
+        self.pages[path.name] = {
+            "signature": file_signature(path),
+            "sha256": file_digest(path),
+            "fragment": fragment
+        }
+
+    def retain_pages(self, names):
+        """
+        删除已经不存在的页面的记录
+        """
+        names = set(names)
+        for name in list(self.pages):
+            if name not in names:
+                del self.pages[name]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+pdftohtml页面定位文本索引
+将页面中所有绝对定位的<p>段落一次性解析为紧凑的数组索引（top, left, 字体类, 文本），
+供CAPL API提取和DVM测试用例提取共同使用，避免反复遍历soup和解析style字符串
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+from bs4 import BeautifulSoup
+
+TOP_PATTERN = re.compile(r'top:(\d+)px')
+LEFT_PATTERN = re.compile(r'left:(\d+)px')
+
+# style中缺少坐标时的占位值
+NO_POSITION = -1
+
+class PageTextIndex:
+    """
+    页面定位文本索引
+
+    每一行对应一个<p>段落，行号与 soup.find_all('p') 的文档顺序一致：
+        tops / lefts: 坐标（array('i')），缺失时为 NO_POSITION
+        font_classes: 字体类名（多个类名以空格连接）
+        texts: 去除首尾空白后的文本
+    另外维护按 (top, left) 排序的行号数组，支持按垂直范围查询
+    """
+
+    __slots__ = ('tops', 'lefts', 'font_classes', 'texts', '_sorted_rows', '_sorted_tops')
+
+    def __init__(self, tops, lefts, font_classes, texts, sorted_rows=None):
+        """
+        sorted_rows: 已按 (top, left, 行号) 排好序的行号数组（可选，如从页面缓存读取），
+                     不提供时在此排序
+        """
+        self.tops = tops
+        self.lefts = lefts
+        self.font_classes = font_classes
+        self.texts = texts
+
+        if sorted_rows is None:
+            sorted_rows = array('i', sorted(range(len(texts)), key=lambda row: (tops[row], lefts[row], row)))
+        self._sorted_rows = sorted_rows
+        self._sorted_tops = array('i', (tops[row] for row in sorted_rows))
+
+    @classmethod
+    def from_soup(cls, soup):
+        """
+        从BeautifulSoup对象构建索引
+        """
+        tops = array('i')
+        lefts = array('i')
+        font_classes = []
+        texts = []
+
+        for p in soup.find_all('p'):
+            style = p.get('style', '')
+            top_match = TOP_PATTERN.search(style)
+            left_match = LEFT_PATTERN.search(style)
+            tops.append(int(top_match.group(1)) if top_match else NO_POSITION)
+            lefts.append(int(left_match.group(1)) if left_match else NO_POSITION)
+            font_classes.append(' '.join(p.get('class', [])))
+            texts.append(p.get_text().strip())
+
+        return cls(tops, lefts, font_classes, texts)
+
+    @classmethod
+    def from_html(cls, html_content):
+        """
+        从HTML内容构建索引
+        """
+        return cls.from_soup(BeautifulSoup(html_content, 'html.parser'))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def text(self):
+        """
+        返回整页文本，段落之间以换行分隔（用于没有原始HTML时的页面预分类）
+        """
+        return '\n'.join(self.texts)
+
+    def has_position(self, row):
+        """
+        检查段落是否同时具有top和left坐标
+        """
+        return self.tops[row] != NO_POSITION and self.lefts[row] != NO_POSITION
+
+    def top(self, row, default=0):
+        """
+        返回段落的top坐标，缺失时返回default
+        """
+        top = self.tops[row]
+        return default if top == NO_POSITION else top
+
+    def left(self, row, default=0):
+        """
+        返回段落的left坐标，缺失时返回default
+        """
+        left = self.lefts[row]
+        return default if left == NO_POSITION else left
+
+    def rows_in_range(self, top_min, top_max):
+        """
+        返回 top_min <= top <= top_max 的所有段落行号，按 (top, left) 排序
+        缺少top坐标的段落不会出现在结果中
+        """
+        top_min = max(top_min, 0)
+        if top_max < top_min:
+            return []
+        start = bisect_left(self._sorted_tops, top_min)
+        end = bisect_right(self._sorted_tops, top_max)
+        return self._sorted_rows[start:end].tolist()
+
+    def sorted_rows(self):
+        """
+        返回所有具有top坐标的段落行号，按 (top, left) 排序
+        """
+        start = bisect_left(self._sorted_tops, 0)
+        return self._sorted_rows[start:].tolist()
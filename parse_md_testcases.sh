@@ -1,16 +1,12 @@
 #!/bin/bash
 set -Eeuo pipefail
+shopt -s nullglob
 
-for i in *DVM*.md; do
-    echo "Processing file: $i"
-    dirname=$(echo $i|sed -e 's/.md//')
-    mkdir -p testcases_$dirname
-    python3 "$(dirname "$0")/md_testcase_parser.py" -o testcases_$dirname "$i"
-    cp "$i" "$(dirname "$i")/testcases_$dirname/"
-done
+files=(*DVM*.md)
+if [ ${#files[@]} -eq 0 ]; then
+    echo "No *DVM*.md files found"
+    exit 0
+fi
 
-for dir in testcases_*; do
-    if [ -d "$dir" ]; then
-        zip -r "$dir.zip" "$dir"
-    fi
-done
\ No newline at end of file
+# 所有文件在同一个Python进程池中解析，测试用例直接写入 testcases_<文件名>.zip，不产生中间文件
+python3 "$(dirname "$0")/md_testcase_parser.py" --archive-dir . ${JOBS:+--jobs "$JOBS"} "${files[@]}"
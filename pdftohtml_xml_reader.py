@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+pdftohtml -xml 输出读取
+用增量XML解析器逐页读取 `pdftohtml -xml` 生成的单个XML文档，
+把每页的 <text top="" left="" font=""> 元素直接构建为页面定位文本索引，
+省去逐页HTML文件的读取、style字符串解析和HTML解析
+"""
+
+import xml.etree.ElementTree as ET
+from array import array
+
+from page_text_index import NO_POSITION, PageTextIndex
+
+# 字体编号到HTML字体类名的映射格式，与pdftohtml HTML输出的 class="ft03" 一致
+DEFAULT_FONT_CLASS_FORMAT = 'ft{font:02d}'
+
+def parse_position(value):
+    """
+    解析坐标属性，缺失或无法解析时返回 NO_POSITION
+    """
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return NO_POSITION
+
+def font_class_name(font_id, font_class_format=DEFAULT_FONT_CLASS_FORMAT):
+    """
+    把XML中的字体编号转换为HTML输出中的字体类名
+    """
+    if font_id is None:
+        return ''
+    return font_class_format.format(font=int(font_id))
+
+def iter_xml_pages(xml_file, font_class_format=DEFAULT_FONT_CLASS_FORMAT):
+    """
+    逐页读取pdftohtml -xml文档
+
+    参数:
+        xml_file: XML文件路径或文件对象
+        font_class_format: 字体编号到字体类名的映射格式
+
+    返回:
+        generator: (页码, PageTextIndex) 元组，按文档顺序逐页产生
+    """
+    root = None
+    tops = array('i')
+    lefts = array('i')
+    font_classes = []
+    texts = []
+
+    for event, element in ET.iterparse(xml_file, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+
+        if element.tag == 'text':
+            tops.append(parse_position(element.get('top')))
+            lefts.append(parse_position(element.get('left')))
+            font_classes.append(font_class_name(element.get('font'), font_class_format))
+            # <text> 中可能嵌套 <b>、<i>、<a> 等元素
+            texts.append(''.join(element.itertext()).strip())
+        elif element.tag == 'page':
+            page_number = int(element.get('number', 0))
+            yield page_number, PageTextIndex(tops, lefts, font_classes, texts)
+
+            tops = array('i')
+            lefts = array('i')
+            font_classes = []
+            texts = []
+            # 释放已处理页面的元素，保持内存占用与单页大小相当
+            element.clear()
+            if root is not None:
+                root.clear()
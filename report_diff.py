@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+测试报告对比脚本
+对比两次测试报告运行的解析结果（parse_test_report 的输出），
+报告测试结果变化、新增/删除的测试用例以及发生变化的测试步骤
+"""
+
+import difflib
+import hashlib
+import json
+from pathlib import Path
+
+from html_to_json_converter import extract_test_report_cases
+
+# 计算步骤哈希时忽略的字段（时间戳每次运行都会变化）
+IGNORED_STEP_FIELDS = {'timestamp'}
+
+def step_hash(step):
+    """
+    计算单个测试步骤内容的哈希值（忽略时间戳）
+    """
+    payload = '\x1f'.join(
+        f'{key}\x1e{value}' for key, value in sorted(step.items()) if key not in IGNORED_STEP_FIELDS
+    )
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+def load_test_run(path):
+    """
+    读取一次测试运行的测试用例
+
+    参数:
+        path: 测试报告HTML文件、parse_test_report 输出目录或测试用例JSON文件
+
+    返回:
+        list: 测试用例数据列表
+    """
+    path = Path(path)
+    if path.is_dir():
+        test_cases = []
+        for json_file in sorted(path.glob('*.json')):
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 跳过批量模式生成的汇总文件等非测试用例文件
+            if isinstance(data, dict) and 'steps' in data:
+                test_cases.append(data)
+        return test_cases
+
+    if path.suffix.lower() in ('.html', '.htm'):
+        with open(path, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        return [test_case_data for _, test_case_data in extract_test_report_cases(html_content)]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+def index_test_cases(test_cases):
+    """
+    按Silk ID建立测试用例哈希索引
+    同一ID出现多次时，按出现顺序以 (ID, 序号) 区分
+
+    返回:
+        dict: {(ID, 序号): 测试用例数据}
+    """
+    index = {}
+    occurrences = {}
+    for test_case in test_cases:
+        test_case_id = test_case.get('id', '')
+        occurrence = occurrences.get(test_case_id, 0)
+        occurrences[test_case_id] = occurrence + 1
+        index[(test_case_id, occurrence)] = test_case
+    return index
+
+def diff_steps(old_steps, new_steps):
+    """
+    通过步骤哈希对比两个测试用例的步骤列表
+
+    返回:
+        list: 变化列表，步骤完全相同时为空
+    """
+    old_hashes = [step_hash(step) for step in old_steps]
+    new_hashes = [step_hash(step) for step in new_steps]
+    if old_hashes == new_hashes:
+        return []
+
+    changes = []
+    matcher = difflib.SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    for op, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if op == 'equal':
+            continue
+        changes.append({
+            "op": op,
+            "old_range": [old_start, old_end],
+            "new_range": [new_start, new_end],
+            "old_steps": old_steps[old_start:old_end],
+            "new_steps": new_steps[new_start:new_end]
+        })
+    return changes
+
+def diff_test_runs(old_cases, new_cases):
+    """
+    对比两次测试运行
+
+    参数:
+        old_cases: 旧运行的测试用例列表
+        new_cases: 新运行的测试用例列表
+
+    返回:
+        dict: 对比结果
+    """
+    old_index = index_test_cases(old_cases)
+    new_index = index_test_cases(new_cases)
+
+    verdict_changes = []
+    changed_steps = []
+    removed = []
+    unchanged = 0
+
+    for key, old_case in old_index.items():
+        new_case = new_index.get(key)
+        if new_case is None:
+            removed.append({"id": old_case.get('id', ''), "name": old_case.get('name', ''),
+                            "verdict": old_case.get('verdict', '')})
+            continue
+
+        is_changed = False
+        if old_case.get('verdict', '') != new_case.get('verdict', ''):
+            verdict_changes.append({
+                "id": new_case.get('id', ''),
+                "name": new_case.get('name', ''),
+                "old_verdict": old_case.get('verdict', ''),
+                "new_verdict": new_case.get('verdict', '')
+            })
+            is_changed = True
+
+        step_changes = diff_steps(old_case.get('steps', []), new_case.get('steps', []))
+        if step_changes:
+            changed_steps.append({
+                "id": new_case.get('id', ''),
+                "name": new_case.get('name', ''),
+                "changes": step_changes
+            })
+            is_changed = True
+
+        if not is_changed:
+            unchanged += 1
+
+    added = [
+        {"id": new_case.get('id', ''), "name": new_case.get('name', ''), "verdict": new_case.get('verdict', '')}
+        for key, new_case in new_index.items() if key not in old_index
+    ]
+
+    return {
+        "summary": {
+            "old_test_cases": len(old_cases),
+            "new_test_cases": len(new_cases),
+            "added": len(added),
+            "removed": len(removed),
+            "verdict_changes": len(verdict_changes),
+            "changed_steps": len(changed_steps),
+            "unchanged": unchanged
+        },
+        "verdict_changes": verdict_changes,
+        "added": added,
+        "removed": removed,
+        "changed_steps": changed_steps
+    }
+
+def main():
+    """
+    主函数
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='对比两次测试报告运行的测试用例解析结果')
+    parser.add_argument('old', help='旧运行：测试报告HTML文件、测试用例输出目录或JSON文件')
+    parser.add_argument('new', help='新运行：测试报告HTML文件、测试用例输出目录或JSON文件')
+    parser.add_argument('--output', '-o', help='对比结果JSON文件路径（默认输出到标准输出）')
+
+    args = parser.parse_args()
+
+    result = diff_test_runs(load_test_run(args.old), load_test_run(args.new))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        summary = result['summary']
+        print(f"新增 {summary['added']}，删除 {summary['removed']}，结果变化 {summary['verdict_changes']}，"
+              f"步骤变化 {summary['changed_steps']}，未变化 {summary['unchanged']}")
+        print(f"对比结果已保存到 '{args.output}'")
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+表格布局分析
+pdftohtml页面中的表格只是一组绝对定位的文本片段，
+这里提供按top坐标聚类成行、按left坐标分布检测列边界的通用方法，
+供DVM文档的需求表格和测试步骤表格共同使用
+"""
+
+# 同一行文本片段允许的top坐标误差（像素）
+ROW_TOLERANCE = 15
+
+# 无法从坐标分布检测出列边界时使用的默认边界（像素）
+DEFAULT_COLUMN_BOUNDARY = 250
+
+# 两列之间的最小间隔（像素），间隔小于该值时不作为列边界
+MIN_COLUMN_GAP = 100
+
+# 检测出的列边界与默认边界之间允许的最大偏移（像素），超出时不采用
+MAX_BOUNDARY_SHIFT = 100
+
+def cluster_rows(items, key, tolerance=ROW_TOLERANCE):
+    """
+    按top坐标把文本片段聚类成行（排序后单次扫描，O(n log n)）
+    每行从该行最小的top值开始，top值与之相差不超过tolerance的片段归入同一行
+
+    参数:
+        items: 文本片段列表
+        key: 从片段取top坐标的函数
+        tolerance: 同一行允许的top坐标误差
+
+    返回:
+        list: 行列表，按top坐标从上到下排列；每行中的片段保持在items中的原有顺序
+    """
+    order = sorted(range(len(items)), key=lambda index: (key(items[index]), index))
+
+    rows = []
+    row = []
+    row_top = None
+    for index in order:
+        top = key(items[index])
+        if row and top - row_top <= tolerance:
+            row.append(index)
+            continue
+        if row:
+            rows.append(row)
+        row = [index]
+        row_top = top
+    if row:
+        rows.append(row)
+
+    return [[items[index] for index in sorted(row)] for row in rows]
+
+def detect_column_boundary(lefts, default=DEFAULT_COLUMN_BOUNDARY, min_gap=MIN_COLUMN_GAP, max_shift=MAX_BOUNDARY_SHIFT):
+    """
+    根据left坐标的分布检测左列与其右侧一列之间的边界
+    在相邻left坐标之间不小于min_gap、且中点与默认边界相差不超过max_shift的间隔中取最大的一个
+    （同样大小时取中点更接近默认边界的），边界为该间隔的中点；
+    这样动作列内部较小的间隔（例如文字换行后缩进的片段）、更右侧的列（例如结果列）
+    和远离默认边界的零散片段都不会移动边界
+
+    参数:
+        lefts: 文本片段的left坐标
+        default: 检测不到列边界时返回的默认值
+        min_gap: 两列之间的最小间隔
+        max_shift: 边界与默认值之间允许的最大偏移
+
+    返回:
+        int: 列边界，left小于边界的片段属于左列
+    """
+    positions = sorted(set(lefts))
+
+    best = None
+    for left, next_left in zip(positions, positions[1:]):
+        boundary = (left + next_left) // 2
+        if next_left - left < min_gap or abs(boundary - default) > max_shift:
+            continue
+        candidate = (next_left - left, -abs(boundary - default), boundary)
+        if best is None or candidate > best:
+            best = candidate
+
+    return best[2] if best else default
@@ -0,0 +1,53 @@
+"""
+CAPL API索引：查询和增量更新
+"""
+
+import extract_api_from_html_to_json as capl
+from capl_api_index import CaplApiIndex
+
+def api(function_name, syntax, description, related_functions=(), parameters=()):
+    return {
+        "function_name": function_name,
+        "syntax": syntax,
+        "description": description,
+        "parameters": [{"name": name, "description": text} for name, text in parameters],
+        "returns": "",
+        "availability": "",
+        "observation": "",
+        "branch_compatibility": {},
+        "related_functions": list(related_functions),
+    }
+
+APIS = [
+    api("fileOpen", "dword fileOpen(char name[])", "Opens a file.", ["fileClose"], [("name", "file name")]),
+    api("fileOpen", "dword fileOpen(char name[], dword mode)", "Opens a file.", ["fileClose"]),
+    api("fileClose", "long fileClose(dword handle)", "Closes a file.", ["fileWriteString"]),
+    api("fileWriteString", "long fileWriteString(char buffer[], dword handle)", "Writes a string."),
+]
+
+def test_lookup_prefix_search_and_related(tmp_path):
+    with CaplApiIndex(tmp_path / "capl.db") as index:
+        assert index.update(APIS) == (4, 0)
+
+        assert [entry["syntax"] for entry in index.lookup("FILEOPEN")] == [
+            "dword fileOpen(char name[])", "dword fileOpen(char name[], dword mode)"
+        ]
+        assert index.prefix("file") == ["fileClose", "fileOpen", "fileWriteString"]
+        assert index.search("name") == [("fileOpen", "dword fileOpen(char name[])")]
+        # fileOpen -> fileClose -> fileWriteString
+        assert index.related("fileOpen") == {"fileclose": 1}
+        assert index.related("fileOpen", depth=2) == {"fileclose": 1, "filewritestring": 2}
+        assert index.related("fileWriteString") == {"fileclose": 1}
+
+def test_update_only_touches_changed_entries(tmp_path):
+    with CaplApiIndex(tmp_path / "capl.db") as index:
+        index.update(APIS)
+        changed = APIS[:3] + [api("fileWriteString", "long fileWriteString(char buffer[], dword handle)",
+                                  "Writes a line.")]
+        assert index.update(changed) == (1, 1)
+        assert index.update(changed) == (0, 0)
+        assert index.lookup("filewritestring")[0]["description"] == "Writes a line."
+        assert index.search("line") == [("fileWriteString", "long fileWriteString(char buffer[], dword handle)")]
+
+def test_related_functions_section_is_parsed():
+    assert capl.parse_related_functions("Related Functions: fileClose, fileOpen, fileClose") == ["fileClose", "fileOpen"]
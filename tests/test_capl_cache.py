@@ -0,0 +1,35 @@
+"""
+CAPL API提取：页面提取缓存
+"""
+
+import extract_api_from_html_to_json as capl
+import generate_dvm_corpus
+
+def output_files(output_dir):
+    return {path.name: path.read_bytes() for path in sorted(output_dir.iterdir())}
+
+def test_unchanged_pages_are_served_from_the_cache(tmp_path, monkeypatch):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 1, capl_function_count=12, seed=6)
+    input_dir = tmp_path / "corpus" / "capl"
+    cache_dir = tmp_path / "cache"
+    monkeypatch.chdir(tmp_path)
+    capl.process_html_files(input_dir, tmp_path / "first", cache_dir=cache_dir)
+
+    # 修改一个函数页面，只有该页面需要重新提取
+    changed_page = input_dir / "page1.html"
+    changed_page.write_text(changed_page.read_text(encoding='utf-8').replace('Gets the value', 'Reads the value'),
+                            encoding='utf-8')
+    extracted = []
+    extract_api_from_index = capl.extract_api_from_index
+    def recording_extract_api_from_index(page_index, page_number):
+        extracted.append(page_number)
+        return extract_api_from_index(page_index, page_number)
+    monkeypatch.setattr(capl, "extract_api_from_index", recording_extract_api_from_index)
+
+    capl.process_html_files(input_dir, tmp_path / "cached", cache_dir=cache_dir)
+    assert extracted == ["page1"]
+    capl.process_html_files(input_dir, tmp_path / "uncached")
+    assert len(extracted) == 1 + 12
+
+    assert output_files(tmp_path / "cached") == output_files(tmp_path / "uncached")
+    assert output_files(tmp_path / "cached") != output_files(tmp_path / "first")
@@ -0,0 +1,47 @@
+"""
+CAPL API提取：函数标题下方各section的内容
+"""
+
+import extract_api_from_html_to_json as capl
+import generate_dvm_corpus
+
+def function_page():
+    page = generate_dvm_corpus.PageBuilder()
+    page.add(80, 560, 'caplGetValue', 'ft02')
+    page.add(120, 90, 'Syntax', 'ft03')
+    page.add(120, 200, 'long caplGetValue(dword handle);')
+    page.add(170, 90, 'Description', 'ft03')
+    page.add(170, 200, 'Gets the value.')
+    page.add(200, 90, 'Parameters', 'ft03')
+    page.add(200, 200, 'handle = file handle')
+    page.add(220, 200, 'buffer = output buffer')
+    page.add(250, 90, 'Returns', 'ft03')
+    page.add(250, 200, '1 on success')
+    # 函数标题下方800px以外的段落不属于该函数
+    page.add(890, 90, 'Availability', 'ft03')
+    page.add(890, 200, 'Since Version 7.0')
+    return generate_dvm_corpus.render_page(1, page, 'CAPL')
+
+def test_sections_within_the_window_below_the_heading():
+    assert capl.extract_api_from_html(function_page(), 'page1') == [{
+        "function_name": "caplGetValue",
+        "syntax": "long caplGetValue(dword handle)",
+        "description": "Gets the value.",
+        "parameters": [
+            {"name": "handle", "description": "file handle"},
+            {"name": "buffer", "description": "output buffer"},
+        ],
+        "returns": "1 on success",
+        "availability": "",
+        "observation": "",
+        "branch_compatibility": {},
+    }]
+
+def test_scan_starts_after_the_heading_row():
+    page_index = capl.PageTextIndex.from_html(function_page())
+    heading_row = page_index.texts.index('caplGetValue')
+
+    # 从Syntax段落开始扫描时，标题本身和之前的段落都不参与
+    apis = capl.extract_function_details(page_index, 'caplGetValue', heading_row + 1)
+    assert [api["syntax"] for api in apis] == ["caplGetValue()"]
+    assert apis[0]["returns"] == "1 on success"
@@ -0,0 +1,24 @@
+"""
+CAPL API提取：进程池并行提取
+"""
+
+import json
+
+import extract_api_from_html_to_json as capl
+import generate_dvm_corpus
+
+def output_files(output_dir):
+    return {path.name: path.read_bytes() for path in sorted(output_dir.iterdir())}
+
+def test_parallel_output_matches_serial_output(tmp_path, monkeypatch):
+    ground_truth = generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 1, capl_function_count=30, seed=4)
+    monkeypatch.chdir(tmp_path)
+
+    capl.process_html_files(tmp_path / "corpus" / "capl", tmp_path / "serial")
+    capl.process_html_files(tmp_path / "corpus" / "capl", tmp_path / "parallel", jobs=3)
+
+    assert output_files(tmp_path / "parallel") == output_files(tmp_path / "serial")
+    # 汇总文件按页码的数值顺序合并（page10 在 page9 之后）
+    apis = json.loads((tmp_path / "parallel" / "capl_api_lists.json").read_text(encoding='utf-8'))
+    function_names = list(dict.fromkeys(api["function_name"] for api in apis))
+    assert function_names == [api["function_name"] for api in ground_truth["capl"]["apis"]]
@@ -0,0 +1,62 @@
+"""
+测试用例SQLite存储：批量写入和测试步骤全文检索
+"""
+
+import json
+
+import case_db
+
+REPORT_TEST_CASES = [
+    {"id": "100", "name": "Read_VIN", "verdict": "Failed", "steps": [
+        {"timestamp": "0.1", "test_step": "1", "description": "Read DID 0xF190"},
+        {"timestamp": "0.2", "test_step": "2", "description": "Check response"},
+    ]},
+    {"id": "101", "name": "Write_VIN", "verdict": "Passed", "steps": [
+        {"timestamp": "0.3", "test_step": "1", "description": "Write DID 0xF190"},
+    ]},
+]
+
+DVM_TEST_CASES = [
+    {"page_number": 3, "title": "1.1 Test case: Alpha (Ver: 1)", "test_case_id": "5", "legacy_id": "",
+     "purpose": "read", "precondition": "", "description": "",
+     "requirements": [{"requirement": "VIN readable", "req_id": "REQ-1", "ver": "2", "status": "Approved"}],
+     "test_script": [{"step": "1", "action": "Read DID 0xF190", "expected_result": "Positive response"}]},
+]
+
+def test_search_steps_across_reports(tmp_path):
+    db_path = tmp_path / "cases.db"
+    report_id = case_db.import_test_cases(db_path, REPORT_TEST_CASES, "report.html")
+    dvm_report_id = case_db.import_test_cases(db_path, DVM_TEST_CASES, "CC_DVMToHtml", kind='dvm')
+    assert dvm_report_id == report_id + 1
+
+    conn = case_db.connect(db_path)
+    try:
+        rows = case_db.search_steps(conn, '0xF190')
+        assert [(row["source"], row["case_id"], row["position"]) for row in rows] == [
+            ("report.html", "100", 0), ("report.html", "101", 0), ("CC_DVMToHtml", "5", 0)
+        ]
+        assert rows[2]["action"] == "Read DID 0xF190"
+
+        failed = case_db.search_steps(conn, '0xF190', verdict='Failed')
+        assert [row["name"] for row in failed] == ["Read_VIN"]
+
+        requirement = conn.execute("SELECT req_id, ver, status FROM requirements").fetchone()
+        assert tuple(requirement) == ("REQ-1", "2", "Approved")
+    finally:
+        conn.close()
+
+def test_load_test_cases_json_detects_the_report_kind(tmp_path):
+    report_dir = tmp_path / "report"
+    report_dir.mkdir()
+    for test_case in REPORT_TEST_CASES:
+        (report_dir / f"{test_case['name']}.json").write_text(json.dumps(test_case), encoding='utf-8')
+    dvm_dir = tmp_path / "dvm"
+    dvm_dir.mkdir()
+    (dvm_dir / "all_test_cases.json").write_text(json.dumps(DVM_TEST_CASES), encoding='utf-8')
+    (dvm_dir / "test_cases_id_5_page_3.json").write_text(json.dumps(DVM_TEST_CASES), encoding='utf-8')
+
+    test_cases, kind = case_db.load_test_cases_json(report_dir)
+    assert kind == 'report' and [test_case["id"] for test_case in test_cases] == ["100", "101"]
+    # DVM输出目录中只读取汇总文件，不重复导入单页文件
+    test_cases, kind = case_db.load_test_cases_json(dvm_dir)
+    assert kind == 'dvm' and len(test_cases) == 1
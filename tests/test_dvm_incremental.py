@@ -0,0 +1,67 @@
+"""
+DVM测试用例提取：增量提取
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import extract_test_cases_from_html_to_json as dvm
+import generate_dvm_corpus
+
+def page_files(output_dir):
+    return sorted(path.name for path in Path(output_dir).iterdir() if dvm.PAGE_OUTPUT_PATTERN.match(path.name))
+
+def test_stale_page_files_are_removed_when_the_manifest_is_discarded(tmp_path):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 20, seed=7)
+    input_dir = tmp_path / "corpus" / "dvm"
+    output_dir = tmp_path / "out"
+    dvm.process_html_files_incremental(input_dir, output_dir)
+
+    # 删除一个有测试用例的页面，并改变选项使清单作废
+    removed_page = dvm.list_html_pages(input_dir)[-1]
+    removed_page.unlink()
+    dvm.process_html_files_incremental(input_dir, output_dir, ndjson=True)
+
+    dvm.process_html_files(input_dir, tmp_path / "full", ndjson=True)
+    assert page_files(output_dir) == page_files(tmp_path / "full")
+    for name in page_files(output_dir):
+        assert (output_dir / name).read_text(encoding='utf-8') == (tmp_path / "full" / name).read_text(encoding='utf-8')
+
+def test_sqlite_db_is_rejected_with_incremental(tmp_path):
+    script = Path(dvm.__file__).resolve()
+    for mode in (["--incremental"], ["--watch", "1"]):
+        result = subprocess.run([sys.executable, str(script), str(tmp_path), str(tmp_path / "out"),
+                                 "--sqlite-db", str(tmp_path / "cases.db")] + mode,
+                                capture_output=True, text=True)
+        assert result.returncode == 2
+        assert "--sqlite-db cannot be combined" in result.stderr
+
+def test_missing_summary_is_rebuilt_without_page_changes(tmp_path):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 20, seed=7)
+    input_dir = tmp_path / "corpus" / "dvm"
+    output_dir = tmp_path / "out"
+    test_case_count = dvm.process_html_files_incremental(input_dir, output_dir)
+    summary = (output_dir / "all_test_cases.json").read_text(encoding='utf-8')
+
+    assert dvm.process_html_files_incremental(input_dir, output_dir) is None
+
+    (output_dir / "all_test_cases.json").unlink()
+    assert dvm.process_html_files_incremental(input_dir, output_dir) == test_case_count
+    assert (output_dir / "all_test_cases.json").read_text(encoding='utf-8') == summary
+
+def test_each_rewritten_page_is_counted_once(tmp_path, capsys):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 20, seed=7)
+    input_dir = tmp_path / "corpus" / "dvm"
+    output_dir = tmp_path / "out"
+    dvm.process_html_files_incremental(input_dir, output_dir)
+
+    # 最后一页同时在页面循环中和循环结束后保存
+    last_page_file = sorted(output_dir.glob("test_cases_*.json"), key=lambda path: int(path.stem.rsplit('_', 1)[1]))[-1]
+    last_page_file.unlink()
+    capsys.readouterr()
+    dvm.process_html_files_incremental(input_dir, output_dir)
+
+    output = capsys.readouterr().out
+    assert output.count(f"to {last_page_file}") == 1
+    assert "Rewrote 1 page files" in output
@@ -0,0 +1,60 @@
+"""
+DVM测试用例提取：一个页面中有多个测试用例标题
+"""
+
+import extract_test_cases_from_html_to_json as dvm
+
+def paragraph(top, left, text):
+    return f'<p style="position:absolute;top:{top}px;left:{left}px;white-space:nowrap" class="ft00">{text}</p>'
+
+TWO_HEADER_PAGE = '<html><body>\n' + '\n'.join([
+    paragraph(50, 90, "1.1 Test case: Alpha (Ver: 1)"),
+    paragraph(70, 90, "Test Case ID: 101"),
+    paragraph(90, 90, "Purpose: first purpose"),
+    paragraph(110, 90, "Test Script Description"),
+    paragraph(130, 90, "Step Action Expected Result"),
+    paragraph(150, 90, "1"),
+    paragraph(150, 120, "Read DID"),
+    paragraph(150, 400, "Positive response"),
+    paragraph(300, 90, "1.2 Test case: Beta (Ver: 2)"),
+    paragraph(320, 90, "Test Case ID: 202"),
+    paragraph(340, 90, "PreCondition:"),
+    paragraph(360, 90, "Ignition on"),
+    paragraph(380, 90, "Test Script Description"),
+    paragraph(400, 90, "1"),
+    paragraph(400, 120, "Write DID"),
+    paragraph(400, 400, "Accepted"),
+]) + '\n</body></html>\n'
+
+# 原来的提取脚本对每个标题扫描整个页面：字段以页面中最后一次出现为准，
+# 测试步骤是页面中所有步骤表格的步骤（第一个表格一直延续到下一个 Test Case ID: 段落）
+PAGE_WIDE_TEST_CASE = {
+    "page_number": 7,
+    "test_case_id": "202",
+    "legacy_id": "",
+    "purpose": "first purpose",
+    "precondition": "Ignition on",
+    "description": "",
+    "requirements": [],
+    "test_script": [
+        {"step": "1", "action": "Read DID 1.2 Test case: Beta (Ver: 2)", "expected_result": "Positive response"},
+        {"step": "1", "action": "Write DID", "expected_result": "Accepted"}
+    ]
+}
+
+def test_every_header_gets_the_page_wide_fields():
+    test_cases = [test_case.to_dict() for test_case in dvm.extract_test_cases_from_html(TWO_HEADER_PAGE, 7)]
+
+    assert test_cases == [
+        {"page_number": 7, "title": "1.1 Test case: Alpha (Ver: 1)", **PAGE_WIDE_TEST_CASE},
+        {"page_number": 7, "title": "1.2 Test case: Beta (Ver: 2)", **PAGE_WIDE_TEST_CASE},
+    ]
+    assert [list(test_case) for test_case in test_cases] == [
+        ["page_number", "title", "test_case_id", "legacy_id", "purpose", "precondition", "description",
+         "requirements", "test_script"]
+    ] * 2
+
+def test_cases_on_one_page_do_not_share_step_lists():
+    first, second = dvm.extract_test_cases_from_html(TWO_HEADER_PAGE, 7)
+    assert first.test_script is not second.test_script
+    assert first.test_script[0] is not second.test_script[0]
@@ -0,0 +1,34 @@
+"""
+DVM测试用例提取：页面缓存输入与HTML页面目录输入的结果一致
+"""
+
+import json
+
+import extract_test_cases_from_html_to_json as dvm
+import page_cache
+
+HEADING_ONLY_PAGE = '''<html><body>
+<h2>2.1 Test case : DID_Check_1 (Ver: 3)</h2>
+<div id="page1-div" style="position:relative;width:892px;height:1262px;">
+<p style="position:absolute;top:110px;left:90px;white-space:nowrap" class="ft00">Test Case ID: 500001</p>
+<p style="position:absolute;top:130px;left:90px;white-space:nowrap" class="ft00">Purpose:</p>
+<p style="position:absolute;top:150px;left:110px;white-space:nowrap" class="ft00">Verify DID</p>
+</div></body></html>
+'''
+
+def test_heading_only_header_is_extracted_from_cache(tmp_path):
+    # 测试用例标题只出现在 <h2> 中，定位文本索引里没有标题段落
+    input_dir = tmp_path / "html"
+    input_dir.mkdir()
+    (input_dir / "CC_DVM-1.html").write_text(HEADING_ONLY_PAGE, encoding='utf-8')
+    cache_file = tmp_path / "dvm.ptc"
+    page_cache.compile_page_cache(input_dir, cache_file)
+
+    assert dvm.process_html_files(input_dir, tmp_path / "from_html") == 1
+    assert dvm.process_cache_file(cache_file, tmp_path / "from_cache") == 1
+
+    from_html = json.loads((tmp_path / "from_html" / "all_test_cases.json").read_text(encoding='utf-8'))
+    from_cache = json.loads((tmp_path / "from_cache" / "all_test_cases.json").read_text(encoding='utf-8'))
+    assert from_cache == from_html
+    assert from_cache[0]["title"] == "2.1 Test case : DID_Check_1 (Ver: 3)"
+    assert from_cache[0]["test_case_id"] == "500001"
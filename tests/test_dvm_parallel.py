@@ -0,0 +1,36 @@
+"""
+DVM测试用例提取：并行提取页面片段（映射阶段）
+"""
+
+import extract_test_cases_from_html_to_json as dvm
+import generate_dvm_corpus
+
+def output_files(output_dir):
+    return {path.name: path.read_bytes() for path in sorted(output_dir.iterdir())}
+
+def test_parallel_output_matches_serial_output(tmp_path):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 80, seed=9, split_ratio=0.5, shared_page_ratio=0.3)
+    input_dir = tmp_path / "corpus" / "dvm"
+
+    serial_count = dvm.process_html_files(input_dir, tmp_path / "serial")
+    parallel_count = dvm.process_html_files(input_dir, tmp_path / "parallel", jobs=3)
+
+    assert parallel_count == serial_count
+    assert output_files(tmp_path / "parallel") == output_files(tmp_path / "serial")
+
+def test_fragments_arrive_in_page_order_and_each_page_is_parsed_once(tmp_path, monkeypatch):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 20, seed=9, split_ratio=0.5)
+    html_files = dvm.list_html_pages(tmp_path / "corpus" / "dvm")
+    parallel_page_numbers = [fragment[1] for fragment in dvm.html_page_fragments(html_files, jobs=2)]
+
+    parsed = []
+    extract_html_page_fragment = dvm.extract_html_page_fragment
+    def recording_extract_html_page_fragment(html_file, page_number):
+        parsed.append(page_number)
+        return extract_html_page_fragment(html_file, page_number)
+    monkeypatch.setattr(dvm, "extract_html_page_fragment", recording_extract_html_page_fragment)
+
+    dvm.process_html_files(tmp_path / "corpus" / "dvm", tmp_path / "out")
+
+    assert parsed == list(range(1, len(html_files) + 1))
+    assert parallel_page_numbers == parsed
@@ -0,0 +1,37 @@
+"""
+DVM测试用例提取：按页分批写入SQLite数据库
+"""
+
+import sqlite3
+
+import case_db
+import extract_test_cases_from_html_to_json as dvm
+import generate_dvm_corpus
+
+def test_only_pages_with_finalized_test_cases_are_written(tmp_path, monkeypatch):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 40, seed=5, split_ratio=0.5)
+    batches = []
+    add_test_cases = case_db.add_test_cases
+    def recording_add_test_cases(conn, report_id, test_cases):
+        batches.append(len(test_cases))
+        return add_test_cases(conn, report_id, test_cases)
+    monkeypatch.setattr(case_db, "add_test_cases", recording_add_test_cases)
+
+    db_path = tmp_path / "cases.db"
+    count = dvm.process_html_files(tmp_path / "corpus" / "dvm", tmp_path / "out", sqlite_db=str(db_path))
+
+    assert batches and all(batches)
+    assert sum(batches) == count
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM test_cases").fetchone()[0] == count
+
+def test_no_report_without_test_cases(tmp_path):
+    input_dir = tmp_path / "html"
+    input_dir.mkdir()
+    (input_dir / "CC_DVM-1.html").write_text("<html><body><p>Table of contents</p></body></html>", encoding='utf-8')
+
+    db_path = tmp_path / "cases.db"
+    assert dvm.process_html_files(input_dir, tmp_path / "out", sqlite_db=str(db_path)) == 0
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0] == 0
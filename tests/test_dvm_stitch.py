@@ -0,0 +1,87 @@
+"""
+DVM测试用例提取：跨页合并（归约阶段）
+"""
+
+import json
+
+import extract_test_cases_from_html_to_json as dvm
+import generate_dvm_corpus
+
+class RecordingPageFragments(dvm.PageFragments):
+    """
+    记录每页处理结束后仍保留的续页测试脚本数
+    """
+
+    def __init__(self, fragments):
+        super().__init__(fragments)
+        self.retained = []
+
+    def retain_pages(self, page_numbers):
+        super().retain_pages(page_numbers)
+        self.retained.append(len(self.continuation_scripts))
+
+class RetainingPageFragments(dvm.PageFragments):
+    """
+    保留所有页面的续页测试脚本（用于比较）
+    """
+
+    def retain_pages(self, page_numbers):
+        pass
+
+def test_continuation_scripts_are_released_as_pages_are_stitched(tmp_path):
+    ground_truth = generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 120, seed=3, split_ratio=0.5)
+    html_files = dvm.list_html_pages(tmp_path / "corpus" / "dvm")
+    page_source = RecordingPageFragments(dvm.html_page_fragments(html_files))
+
+    dvm.process_pages(page_source, tmp_path / "released")
+    dvm.process_pages(RetainingPageFragments(dvm.html_page_fragments(html_files)), tmp_path / "retained")
+
+    assert len(page_source.retained) == ground_truth["dvm"]["pages"]
+    # 只保留当前页的下一页，以及尚无测试脚本的待处理测试用例（这里是缺少ID的测试用例）所在页的下一页
+    pending_without_id = sum(1 for test_case in ground_truth["dvm"]["test_cases"] if not test_case["test_case_id"])
+    assert max(page_source.retained) <= 1 + pending_without_id
+
+    assert sorted(path.name for path in (tmp_path / "released").iterdir()) == \
+        sorted(path.name for path in (tmp_path / "retained").iterdir())
+    for output_file in sorted((tmp_path / "retained").iterdir()):
+        released_file = tmp_path / "released" / output_file.name
+        assert json.loads(released_file.read_text(encoding='utf-8')) == json.loads(output_file.read_text(encoding='utf-8'))
+
+def paragraph(top, left, text):
+    return f'<p style="position:absolute;top:{top}px;left:{left}px;white-space:nowrap" class="ft00">{text}</p>'
+
+def write_page(directory, page_number, paragraphs):
+    html = '<html><body>\n' + '\n'.join(paragraph(*item) for item in paragraphs) + '\n</body></html>\n'
+    (directory / f"CC_DVM-{page_number}.html").write_text(html, encoding='utf-8')
+
+def test_cases_sharing_a_pending_test_script_are_written_with_later_steps(tmp_path):
+    input_dir = tmp_path / "dvm"
+    input_dir.mkdir()
+    write_page(input_dir, 1, [(80, 90, "Contents")])
+    # 缺少ID和测试脚本的测试用例，等待后续页面的测试脚本
+    write_page(input_dir, 2, [(80, 90, "1.1 Test case: Alpha (Ver: 1)"), (110, 90, "Purpose: alpha")])
+    write_page(input_dir, 3, [
+        (80, 90, "1.2 Test case: Beta (Ver: 1)"),
+        (110, 90, "Test Case ID: 5"),
+        (130, 90, "Test Script Description"),
+        (150, 90, "1"), (150, 120, "Read DID 0xF190"), (150, 400, "Positive response"),
+    ])
+    # 缺少ID的测试脚本续页，追加到与上一页共用的测试步骤列表
+    write_page(input_dir, 4, [
+        (80, 90, "1.3 Test case: Gamma (Ver: 1)"),
+        (110, 90, "Test Script Description"),
+        (130, 90, "1"), (130, 120, "Write DID 0xF190"), (130, 400, "Accepted"),
+    ])
+
+    dvm.process_html_files(input_dir, tmp_path / "out")
+
+    steps = [
+        {"step": "1", "action": "Read DID 0xF190", "expected_result": "Positive response"},
+        {"step": "1", "action": "Write DID 0xF190", "expected_result": "Accepted"},
+    ]
+    all_test_cases = json.loads((tmp_path / "out" / "all_test_cases.json").read_text(encoding='utf-8'))
+    assert [(test_case["title"], test_case["test_case_id"]) for test_case in all_test_cases] == [
+        ("1.2 Test case: Beta (Ver: 1)", "5"),
+        ("1.1 Test case: Alpha (Ver: 1)", ""),
+    ]
+    assert all(test_case["test_script"] == steps for test_case in all_test_cases)
@@ -0,0 +1,61 @@
+"""
+提取结果的紧凑记录类型
+"""
+
+import json
+
+import extract_test_cases_from_html_to_json as dvm
+import extraction_records
+import memory_report
+
+def sample_test_case(**fields):
+    return extraction_records.TestCase(
+        3, "1.1 Test case: Alpha (Ver: 1)", "101", purpose="read",
+        requirements=[extraction_records.RequirementRow("VIN readable", "REQ-1", "2", "Approved")],
+        test_script=[extraction_records.TestStep("1", "Read DID 0xF190", "Positive response")],
+        **fields
+    )
+
+def test_records_have_no_instance_dict():
+    records = [
+        sample_test_case(),
+        extraction_records.TestStep("1"),
+        extraction_records.RequirementRow("VIN readable"),
+        extraction_records.PositionedText("Syntax", 120, 90),
+    ]
+    assert not any(hasattr(record, '__dict__') for record in records)
+
+def test_to_dict_keeps_the_original_key_order():
+    data = sample_test_case().to_dict()
+    assert list(data) == ["page_number", "title", "test_case_id", "legacy_id", "purpose", "precondition",
+                          "description", "requirements", "test_script"]
+    assert data["requirements"] == [{"requirement": "VIN readable", "req_id": "REQ-1", "ver": "2", "status": "Approved"}]
+    assert data["test_script"] == [{"step": "1", "action": "Read DID 0xF190", "expected_result": "Positive response"}]
+
+    # PostCondition 段落和跨页合并标记只在出现时输出（空的PostCondition也输出）
+    data = sample_test_case(postcondition="", processed=True).to_dict()
+    assert list(data)[-2:] == ["postcondition", "_processed"]
+    assert data["_processed"] is True
+
+def test_fragments_round_trip_through_json():
+    test_case = sample_test_case(postcondition="Ignition off", processed=True)
+    fragment = ("CC_DVM-3.html", 3, [test_case], [extraction_records.TestStep("2", "Write DID", "Accepted")])
+
+    restored = dvm.fragment_from_json(json.loads(json.dumps(dvm.fragment_to_json(fragment))))
+
+    name, page_number, test_cases, continuation_script = restored
+    assert (name, page_number) == ("CC_DVM-3.html", 3)
+    assert extraction_records.test_cases_to_dicts(test_cases) == [test_case.to_dict()]
+    assert [step.to_dict() for step in continuation_script] == [
+        {"step": "2", "action": "Write DID", "expected_result": "Accepted"}
+    ]
+
+def test_trace_memory_prints_a_report(capsys):
+    with memory_report.trace_memory():
+        records = [extraction_records.TestStep(str(number)) for number in range(1000)]
+    assert len(records) == 1000
+    assert "内存跟踪" in capsys.readouterr().out
+
+    with memory_report.trace_memory(enabled=False):
+        pass
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,71 @@
+"""
+提取过程统计：阶段计时、页面计时和计数
+"""
+
+import json
+import time
+
+import extract_test_cases_from_html_to_json as dvm
+import extraction_stats
+import generate_dvm_corpus
+from extraction_stats import ExtractionStats
+
+def test_nested_stage_time_is_only_counted_in_the_inner_stage():
+    stats = ExtractionStats()
+    with stats.stage('outer'):
+        with stats.stage('inner'):
+            time.sleep(0.05)
+    with stats.stage('inner'):
+        pass
+
+    report = stats.to_dict()
+    assert report["stages"]["inner"]["calls"] == 2
+    assert report["stages"]["inner"]["wall_seconds"] >= 0.05
+    assert report["stages"]["outer"]["wall_seconds"] < 0.05
+
+def test_module_functions_do_nothing_without_active_stats():
+    assert extraction_stats.active() is None
+    with extraction_stats.stage('parse'), extraction_stats.page('page1'):
+        extraction_stats.count('pages_irrelevant')
+
+def test_worker_stats_are_merged_into_the_main_process():
+    def extract(n):
+        with extraction_stats.stage('extract'):
+            extraction_stats.count('test_cases', n)
+        return n * 2
+
+    result, raw = extraction_stats.run_page('page7.html', extract, 3)
+    assert result == 6 and extraction_stats.active() is None
+
+    stats = ExtractionStats(slowest=1)
+    stats.count('test_cases')
+    stats.merge(raw)
+    report = stats.to_dict()
+    assert report["counters"] == {"test_cases": 4}
+    assert report["stages"]["extract"]["calls"] == 1
+    assert report["pages"]["count"] == 1
+    assert [page["page"] for page in report["slowest_pages"]] == ["page7.html"]
+
+def test_parallel_run_records_the_same_counters_as_a_serial_run(tmp_path):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 30, seed=11, split_ratio=0.5)
+    input_dir = tmp_path / "corpus" / "dvm"
+    page_count = len(dvm.list_html_pages(input_dir))
+
+    reports = []
+    for jobs in (1, 2):
+        stats = ExtractionStats(profile_dir=tmp_path / f"profiles_{jobs}")
+        extraction_stats.activate(stats)
+        try:
+            dvm.process_html_files(input_dir, tmp_path / f"out_{jobs}", jobs=jobs)
+        finally:
+            extraction_stats.activate(None)
+        stats.save(tmp_path / f"stats_{jobs}.json")
+        reports.append(json.loads((tmp_path / f"stats_{jobs}.json").read_text(encoding='utf-8')))
+
+    serial, parallel = reports
+    assert parallel["counters"] == serial["counters"]
+    assert sum(n for name, n in serial["counters"].items() if name.startswith('pages_')) == page_count
+    assert serial["pages"]["count"] == parallel["pages"]["count"] == page_count
+    assert {"read", "classify", "stitch", "write"} <= set(serial["stages"])
+    # cProfile只覆盖主进程中记录的阶段
+    assert (tmp_path / "profiles_1" / "stitch.prof").exists()
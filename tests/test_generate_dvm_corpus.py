@@ -0,0 +1,55 @@
+"""
+合成语料：多个测试用例共用一页和在表格中间断开的测试步骤表格
+"""
+
+import json
+from collections import Counter
+
+import benchmark_extractors
+import extract_test_cases_from_html_to_json as dvm
+import generate_dvm_corpus
+
+def test_same_seed_gives_the_same_corpus(tmp_path):
+    first = generate_dvm_corpus.generate_corpus(tmp_path / "a", 30, seed=4)
+    second = generate_dvm_corpus.generate_corpus(tmp_path / "b", 30, seed=4)
+    assert first == second
+    assert sorted(path.name for path in (tmp_path / "a" / "dvm").iterdir()) == \
+        sorted(path.name for path in (tmp_path / "b" / "dvm").iterdir())
+
+def test_shared_pages_put_several_headers_on_one_page(tmp_path):
+    ground_truth = generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 40, seed=2, split_ratio=0,
+                                                       missing_id_ratio=0, shared_page_ratio=1,
+                                                       mid_table_split_ratio=0)
+    expected = ground_truth["dvm"]["test_cases"]
+    cases_per_page = Counter(test_case["page_number"] for test_case in expected)
+    assert max(cases_per_page.values()) >= 2
+
+    # 期望结果中每个测试用例只有自己的字段；提取脚本给同一页的每个测试用例页面中最后出现的字段，
+    # 基准测试把这些测试用例计为不一致
+    dvm.process_html_files(tmp_path / "corpus" / "dvm", tmp_path / "out")
+    extracted = json.loads((tmp_path / "out" / "all_test_cases.json").read_text(encoding='utf-8'))
+    last_id_on_page = {test_case["page_number"]: test_case["test_case_id"] for test_case in expected}
+    assert len(extracted) == len(expected)
+    for test_case in extracted:
+        assert test_case["test_case_id"] == last_id_on_page[test_case["page_number"]]
+
+    score = benchmark_extractors.score_test_cases(expected, extracted)
+    single_case_pages = sum(1 for count in cases_per_page.values() if count == 1)
+    assert score["recall"] == 1.0
+    assert score["exact"] >= single_case_pages
+
+def test_mid_table_split_continues_the_steps_on_the_next_page(tmp_path):
+    ground_truth = generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 10, seed=2, split_ratio=0,
+                                                       missing_id_ratio=0, shared_page_ratio=0,
+                                                       mid_table_split_ratio=1)
+    for test_case in ground_truth["dvm"]["test_cases"]:
+        page_number = test_case["page_number"]
+        _, _, test_cases, _ = dvm.extract_html_page_fragment(
+            tmp_path / "corpus" / "dvm" / f"CC_DVM-{page_number}.html", page_number)
+        _, _, _, continuation_script = dvm.extract_html_page_fragment(
+            tmp_path / "corpus" / "dvm" / f"CC_DVM-{page_number + 1}.html", page_number + 1)
+
+        first_part = [step.to_dict() for step in test_cases[0].test_script]
+        rest = [step.to_dict() for step in continuation_script]
+        assert first_part and rest
+        assert first_part + rest == test_case["test_script"]
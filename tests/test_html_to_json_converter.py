@@ -0,0 +1,46 @@
+"""
+测试报告HTML转换：批量模式
+"""
+
+import json
+from pathlib import Path
+
+import html_to_json_converter as converter
+
+def report(test_case_title):
+    return (
+        '<html><body>\n'
+        f'<table><tr><td><big class="Heading3"><a>{test_case_title}</a></big></td></tr></table>\n'
+        '<div><table class="ResultTable">'
+        '<tr><th>Time</th><th>Step</th><th>Description</th><th>Result</th></tr>'
+        '<tr><td>0.1</td><td>1</td><td>Read DID</td><td>pass</td></tr>'
+        '</table></div>\n'
+        '</body></html>\n'
+    )
+
+def test_batch_output_directories_do_not_collide(tmp_path):
+    (tmp_path / "x").mkdir()
+    (tmp_path / "y").mkdir()
+    reports = [tmp_path / "x" / "a.html", tmp_path / "a_2.html", tmp_path / "y" / "a.html"]
+    for number, report_path in enumerate(reports, 1):
+        report_path.write_text(report(f"Test Case Silk ID:{number}: Case {number}: Passed"), encoding='utf-8')
+
+    summary = converter.batch_parse_test_reports([str(path) for path in reports], tmp_path / "out", jobs=2)
+
+    # 第二个 a 不能使用已被 a_2.html 占用的子目录
+    output_dirs = [report_summary["output_dir"] for report_summary in summary["reports"]]
+    assert output_dirs == [str(tmp_path / "out" / name) for name in ("a", "a_2", "a_3")]
+    for number, output_dir in enumerate(output_dirs, 1):
+        test_case = json.loads((Path(output_dir) / f"Case_{number}.json").read_text(encoding='utf-8'))
+        assert test_case["id"] == str(number)
+    assert summary["total_test_cases"] == 3
+
+def test_batch_parses_a_repeated_report_once(tmp_path):
+    report_path = tmp_path / "a.html"
+    report_path.write_text(report("Test Case Silk ID:7: Case 7: Failed"), encoding='utf-8')
+
+    summary = converter.batch_parse_test_reports([str(report_path), str(tmp_path / "." / "a.html")], tmp_path / "out", jobs=2)
+
+    assert summary["total_reports"] == 1
+    assert summary["failed"] == 1
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == ["a", "batch_summary.json"]
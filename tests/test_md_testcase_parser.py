@@ -0,0 +1,62 @@
+"""
+Markdown测试用例解析：批量模式直接写入压缩包
+"""
+
+import shutil
+import tarfile
+import zipfile
+
+import md_testcase_parser
+
+SPEC = """# Specification
+
+2.1 Test case : Read_DID_F190
+Purpose: read the VIN
+2.2 Test case : Write_DID_F190
+Purpose: write the VIN
+Test Specification: end
+"""
+
+def write_spec(tmp_path):
+    md_file = tmp_path / "input" / "spec.md"
+    md_file.parent.mkdir()
+    md_file.write_text(SPEC, encoding='utf-8')
+    return md_file
+
+def no_intermediate(*args, **kwargs):
+    raise AssertionError("批量打包不应产生中间目录")
+
+def test_parse_to_archive_writes_entries_directly(tmp_path, monkeypatch):
+    md_file = write_spec(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(md_testcase_parser, "DirectoryWriter", no_intermediate)
+    monkeypatch.setattr(shutil, "make_archive", no_intermediate)
+
+    assert md_testcase_parser.parse_to_archive(md_file, tmp_path / "archives") == 2
+
+    # 与 zip -r testcases_spec.zip testcases_spec 的布局一致：根目录条目、测试用例和原始文件
+    with zipfile.ZipFile(tmp_path / "archives" / "testcases_spec.zip") as archive:
+        names = archive.namelist()
+        assert names[0] == "testcases_spec/"
+        assert sorted(names[1:]) == ["testcases_spec/spec.md", "testcases_spec/spec_Read_DID_F190.md",
+                                     "testcases_spec/spec_Write_DID_F190.md"]
+        assert archive.read("testcases_spec/spec.md").decode('utf-8') == SPEC
+        assert archive.read("testcases_spec/spec_Read_DID_F190.md").decode('utf-8') == \
+            "# Test Case:  Read_DID_F190\nPurpose: read the VIN\n"
+
+def test_batch_archive_mode_leaves_no_testcases_directory(tmp_path, monkeypatch):
+    md_file = write_spec(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    assert md_testcase_parser.batch_parse_testcases([str(md_file)], archive_dir=tmp_path / "archives", jobs=1,
+                                                    archive_suffix='tar.gz') == 0
+
+    assert sorted(path.name for path in (tmp_path / "archives").iterdir()) == ["testcases_spec.tar.gz"]
+    for directory in (tmp_path, tmp_path / "input", tmp_path / "archives"):
+        assert not (directory / "testcases_spec").exists()
+        assert not (directory / "testcases").exists()
+    with tarfile.open(tmp_path / "archives" / "testcases_spec.tar.gz") as archive:
+        members = archive.getmembers()
+        assert members[0].name == "testcases_spec" and members[0].isdir()
+        assert sorted(member.name for member in members[1:]) == [
+            "testcases_spec/spec.md", "testcases_spec/spec_Read_DID_F190.md", "testcases_spec/spec_Write_DID_F190.md"]
@@ -0,0 +1,56 @@
+"""
+Markdown测试用例解析：流式切分与原来的正则表达式切分一致
+"""
+
+import re
+
+import pytest
+
+import md_testcase_parser
+
+# 原来的实现：对整个文档分别用两种格式匹配，取匹配数较多的格式
+OLD_TESTCASE_PATTERN = re.compile(
+    r'(?:\d+\.\d+(?:\.\d+)?\s+)?Test case :(.*?)(?=(?:\d+\.\d+(?:\.\d+)?\s+)?Test case :|Test Specification:|$)',
+    re.DOTALL
+)
+OLD_SILK_ID_PATTERN = re.compile(
+    r'\d+\s+Test Case Silk ID:(.*?)(?=\d+\s+Test Case Silk ID:|$)',
+    re.DOTALL
+)
+
+def regex_split(content):
+    testcases1 = OLD_TESTCASE_PATTERN.findall(content)
+    testcases2 = OLD_SILK_ID_PATTERN.findall(content)
+    if len(testcases2) > len(testcases1):
+        return [("Silk ID", testcase) for testcase in testcases2]
+    return [("Test case", testcase) for testcase in testcases1]
+
+def chunks_at(content, *offsets):
+    bounds = [0, *offsets, len(content)]
+    return [content[start:end] for start, end in zip(bounds, bounds[1:])]
+
+DOCUMENTS = {
+    "section number on its own line": "Intro\n2.1\nTest case : Read_DID\nPurpose: read\n2.2 Test case : Write_DID\nPurpose: write\n",
+    "specification ends the last case": "2.1 Test case : Read_DID\nsteps 1.2\n2.2 Test case : Write_DID\nTest Specification: end\nmore text\n",
+    "silk ids with an unnumbered marker": "1 Test Case Silk ID: 100 Read\nsee Test Case Silk ID: 7\n12\nTest Case Silk ID: 101 Write\nend\n",
+    "no markers": "# Specification\n\nNothing to split here.\n",
+    "trailing test case marker": "2.1 Test case : Read_DID\nPurpose: read\n2.2 Test case :",
+    "trailing silk id marker": "1 Test Case Silk ID: 100 Read\nbody\n2 Test Case Silk ID:",
+    "trailing specification marker": "2.1 Test case : Read_DID\nPurpose: read\nTest Specification:",
+}
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_streaming_split_matches_regex_split(name):
+    content = DOCUMENTS[name]
+    lines = content.splitlines(keepends=True)
+    assert list(md_testcase_parser.split_testcases(lines)) == regex_split(content)
+
+def test_marker_prefix_across_chunk_boundary():
+    content = "Intro 1.5\n2.1 Test case : Read_DID\nbody 3.\n2.2 Test case : Write_DID\n17 18\n"
+    # 章节号 "2.1 "、"2.2\n" 被切分到不同的片段中，片段边界不在行尾
+    offsets = (content.index("2.1") + 2, content.index("body 3.") + 6, content.index("body 3.") + 7)
+    assert list(md_testcase_parser.split_testcases(chunks_at(content, *offsets))) == regex_split(content)
+
+    content = "1 Test Case Silk ID: 100 Read\nbody 4\n2\n\nTest Case Silk ID: 101 Write\n"
+    offsets = (content.index("2\n\n") + 1, content.index("2\n\n") + 2)
+    assert list(md_testcase_parser.split_testcases(chunks_at(content, *offsets))) == regex_split(content)
@@ -0,0 +1,52 @@
+"""
+页面预分类：CAPL手册页面
+"""
+
+from bs4 import BeautifulSoup
+
+import extract_api_from_html_to_json as capl
+import generate_dvm_corpus
+from page_classifier import (DOCUMENT_CAPL, PAGE_AVAILABILITY_CHART, PAGE_FUNCTION, PAGE_IRRELEVANT,
+                             classify_page)
+
+def function_page(title='CAPL', chart_paragraph=False):
+    page = generate_dvm_corpus.PageBuilder()
+    page.add(80, 560, 'caplGetValue1', 'ft02')
+    page.add(120, 90, 'Syntax', 'ft03')
+    page.add(120, 200, 'long caplGetValue1(dword handle);')
+    page.add(150, 90, 'Description', 'ft03')
+    page.add(150, 200, 'Gets the value.')
+    if chart_paragraph:
+        page.add(200, 90, 'Availability Chart', 'ft02')
+    return generate_dvm_corpus.render_page(1, page, title)
+
+def baseline_skips_page(html_content):
+    # 原来的提取脚本：任一<p>段落文本包含 Availability Chart 时跳过页面
+    soup = BeautifulSoup(html_content, 'html.parser')
+    return any('Availability Chart' in p.get_text() for p in soup.find_all('p'))
+
+def test_availability_chart_outside_paragraphs_does_not_skip_the_page():
+    pages = {
+        "chart in title": function_page(title='Availability Chart'),
+        "chart in comment": function_page().replace('<body', '<!-- Availability Chart --><body'),
+        "chart paragraph": function_page(chart_paragraph=True),
+        "function page": function_page(),
+    }
+    labels = {name: classify_page(html_content, DOCUMENT_CAPL) for name, html_content in pages.items()}
+
+    assert labels == {
+        "chart in title": PAGE_FUNCTION,
+        "chart in comment": PAGE_FUNCTION,
+        "chart paragraph": PAGE_AVAILABILITY_CHART,
+        "function page": PAGE_FUNCTION,
+    }
+    for name, html_content in pages.items():
+        assert (labels[name] == PAGE_AVAILABILITY_CHART) == baseline_skips_page(html_content)
+
+    apis = capl.extract_api_from_html(pages["chart in title"], 'page1')
+    assert [api["function_name"] for api in apis] == ['caplGetValue1']
+
+def test_page_without_syntax_or_chart_is_irrelevant():
+    page = generate_dvm_corpus.PageBuilder()
+    page.add(80, 90, 'CAPL Functions Overview', 'ft02')
+    assert classify_page(generate_dvm_corpus.render_page(1, page, 'CAPL'), DOCUMENT_CAPL) == PAGE_IRRELEVANT
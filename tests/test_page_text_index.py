@@ -0,0 +1,35 @@
+"""
+页面定位文本索引
+"""
+
+from page_text_index import NO_POSITION, PageTextIndex
+
+PAGE = '''<html><body>
+<p style="position:absolute;top:200px;left:300px" class="ft01">Positive response</p>
+<p style="position:absolute;top:120px;left:90px" class="ft02 bold">Syntax</p>
+<p style="position:absolute;top:200px;left:120px" class="ft00"> Read <b>DID</b> </p>
+<p class="ft00">No position</p>
+<p style="position:absolute;left:90px" class="ft00">No top</p>
+</body></html>
+'''
+
+def test_rows_follow_document_order():
+    page_index = PageTextIndex.from_html(PAGE)
+
+    assert len(page_index) == 5
+    assert page_index.texts == ["Positive response", "Syntax", "Read DID", "No position", "No top"]
+    assert page_index.font_classes[1] == "ft02 bold"
+    assert list(page_index.tops) == [200, 120, 200, NO_POSITION, NO_POSITION]
+    assert [page_index.has_position(row) for row in range(5)] == [True, True, True, False, False]
+    assert page_index.left(4) == 90 and page_index.top(4, default=-5) == -5
+    assert page_index.text() == "Positive response\nSyntax\nRead DID\nNo position\nNo top"
+
+def test_range_queries_are_sorted_by_position():
+    page_index = PageTextIndex.from_html(PAGE)
+
+    # 同一行按left排序，缺少top坐标的段落不参与查询
+    assert page_index.sorted_rows() == [1, 2, 0]
+    assert page_index.rows_in_range(150, 200) == [2, 0]
+    assert page_index.rows_in_range(-50, 120) == [1]
+    assert page_index.rows_in_range(201, 1000) == []
+    assert page_index.rows_in_range(300, 100) == []
@@ -0,0 +1,75 @@
+"""
+pdftohtml -xml 文档输入：与逐页HTML输入的输出一致
+"""
+
+import json
+import re
+from html import escape
+
+import extract_api_from_html_to_json as capl
+import extract_test_cases_from_html_to_json as dvm
+import generate_dvm_corpus
+from page_text_index import PageTextIndex
+from pdftohtml_xml_reader import iter_xml_pages
+
+def write_xml_document(html_files, xml_file):
+    """
+    把逐页HTML转换为同样内容的pdftohtml -xml文档（粗体段落用嵌套的 <b> 元素表示）
+    """
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<pdf2xml producer="poppler">']
+    for page_number, html_file in enumerate(html_files, 1):
+        page_index = PageTextIndex.from_html(html_file.read_text(encoding='utf-8'))
+        lines.append(f'<page number="{page_number}" position="absolute" top="0" left="0" height="1262" width="892">')
+        for row, text in enumerate(page_index.texts):
+            font = int(page_index.font_classes[row][2:])
+            content = f'<b>{escape(text)}</b>' if font == 2 else escape(text)
+            lines.append(f'<text top="{page_index.tops[row]}" left="{page_index.lefts[row]}" '
+                         f'width="100" height="12" font="{font}">{content}</text>')
+        lines.append('</page>')
+    lines.append('</pdf2xml>')
+    xml_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+def capl_pages(input_dir):
+    return sorted(input_dir.glob('*.html'), key=lambda path: int(re.search(r'\d+', path.stem).group()))
+
+def test_xml_pages_are_read_as_page_indexes(tmp_path):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 1, capl_function_count=3, seed=8)
+    html_files = capl_pages(tmp_path / "corpus" / "capl")
+    write_xml_document(html_files, tmp_path / "capl.xml")
+
+    pages = list(iter_xml_pages(tmp_path / "capl.xml"))
+
+    assert [page_number for page_number, _ in pages] == list(range(1, len(html_files) + 1))
+    for (_, page_index), html_file in zip(pages, html_files):
+        html_index = PageTextIndex.from_html(html_file.read_text(encoding='utf-8'))
+        assert page_index.texts == html_index.texts
+        assert page_index.font_classes == html_index.font_classes
+        assert page_index.sorted_rows() == html_index.sorted_rows()
+
+def test_dvm_xml_output_matches_html_output(tmp_path):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 40, seed=8, split_ratio=0.5)
+    html_files = dvm.list_html_pages(tmp_path / "corpus" / "dvm")
+    write_xml_document(html_files, tmp_path / "dvm.xml")
+
+    dvm.process_html_files(tmp_path / "corpus" / "dvm", tmp_path / "html")
+    dvm.process_xml_file(tmp_path / "dvm.xml", tmp_path / "xml")
+
+    assert sorted(path.name for path in (tmp_path / "xml").iterdir()) == \
+        sorted(path.name for path in (tmp_path / "html").iterdir())
+    for output_file in (tmp_path / "html").iterdir():
+        assert (tmp_path / "xml" / output_file.name).read_text(encoding='utf-8') == output_file.read_text(encoding='utf-8')
+
+def test_capl_xml_output_matches_html_output(tmp_path, monkeypatch):
+    generate_dvm_corpus.generate_corpus(tmp_path / "corpus", 1, capl_function_count=12, seed=8)
+    write_xml_document(capl_pages(tmp_path / "corpus" / "capl"), tmp_path / "capl.xml")
+    monkeypatch.chdir(tmp_path)
+
+    capl.process_html_files(tmp_path / "corpus" / "capl", tmp_path / "html")
+    capl.process_xml_file(tmp_path / "capl.xml", tmp_path / "xml")
+
+    html_apis = json.loads((tmp_path / "html" / "capl_api_lists.json").read_text(encoding='utf-8'))
+    xml_apis = json.loads((tmp_path / "xml" / "capl_api_lists.json").read_text(encoding='utf-8'))
+    assert len(html_apis) == 12
+    assert xml_apis == html_apis
+    # 单页输出按pdftohtml逐页HTML的方式命名
+    assert (tmp_path / "xml" / "apis_capl-1.json").exists()
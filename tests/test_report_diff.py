@@ -0,0 +1,58 @@
+"""
+测试报告对比：按Silk ID和步骤哈希对比两次运行
+"""
+
+import json
+
+import report_diff
+
+def report_case(test_case_id, name, verdict, *descriptions):
+    return {"id": test_case_id, "name": name, "verdict": verdict, "steps": [
+        {"timestamp": f"{position}.0", "test_step": str(position), "description": description}
+        for position, description in enumerate(descriptions, 1)
+    ]}
+
+def test_diff_reports_verdicts_steps_and_membership():
+    old_cases = [
+        report_case("1", "Read_VIN", "Passed", "Read DID 0xF190", "Check response"),
+        report_case("2", "Write_VIN", "Passed", "Write DID 0xF190"),
+        report_case("3", "Reset", "Passed", "ECU reset"),
+    ]
+    new_cases = [
+        report_case("1", "Read_VIN", "Failed", "Read DID 0xF190", "Check negative response"),
+        report_case("2", "Write_VIN", "Passed", "Write DID 0xF190"),
+        report_case("4", "Sleep", "Passed", "Enter sleep"),
+    ]
+    # 只有时间戳不同的步骤视为相同
+    new_cases[1]["steps"][0]["timestamp"] = "9.5"
+
+    result = report_diff.diff_test_runs(old_cases, new_cases)
+
+    assert result["summary"] == {
+        "old_test_cases": 3, "new_test_cases": 3, "added": 1, "removed": 1,
+        "verdict_changes": 1, "changed_steps": 1, "unchanged": 1
+    }
+    assert result["verdict_changes"] == [
+        {"id": "1", "name": "Read_VIN", "old_verdict": "Passed", "new_verdict": "Failed"}
+    ]
+    assert [test_case["id"] for test_case in result["added"]] == ["4"]
+    assert [test_case["id"] for test_case in result["removed"]] == ["3"]
+    change, = result["changed_steps"][0]["changes"]
+    assert change["op"] == "replace"
+    assert (change["old_range"], change["new_range"]) == ([1, 2], [1, 2])
+    assert change["new_steps"][0]["description"] == "Check negative response"
+
+def test_repeated_ids_are_matched_in_order():
+    old_cases = [report_case("7", "First", "Passed", "a"), report_case("7", "Second", "Passed", "b")]
+    new_cases = [report_case("7", "First", "Passed", "a"), report_case("7", "Second", "Failed", "b")]
+
+    result = report_diff.diff_test_runs(old_cases, new_cases)
+
+    assert [change["name"] for change in result["verdict_changes"]] == ["Second"]
+    assert result["summary"]["unchanged"] == 1
+
+def test_load_test_run_skips_the_batch_summary(tmp_path):
+    (tmp_path / "Read_VIN.json").write_text(json.dumps(report_case("1", "Read_VIN", "Passed", "a")), encoding='utf-8')
+    (tmp_path / "batch_summary.json").write_text(json.dumps({"reports": []}), encoding='utf-8')
+
+    assert [test_case["name"] for test_case in report_diff.load_test_run(tmp_path)] == ["Read_VIN"]
@@ -0,0 +1,63 @@
+"""
+表格布局分析：行聚类和测试步骤表格的列边界
+"""
+
+import extract_test_cases_from_html_to_json as dvm
+from table_layout import DEFAULT_COLUMN_BOUNDARY, cluster_rows, detect_column_boundary
+
+def paragraph(top, left, text):
+    return f'<p style="position:absolute;top:{top}px;left:{left}px;white-space:nowrap" class="ft00">{text}</p>'
+
+def test_cluster_rows_groups_fragments_within_tolerance():
+    rows = cluster_rows([30, 10, 22, 50, 12], key=lambda top: top)
+    assert rows == [[10, 22, 12], [30], [50]]
+
+def test_boundary_is_the_midpoint_of_the_gap_after_the_action_column():
+    assert detect_column_boundary([120, 120, 400, 400]) == 260
+
+def test_result_column_does_not_move_the_boundary():
+    assert detect_column_boundary([120, 400, 720]) == 260
+
+def test_stray_fragment_far_from_the_default_is_ignored():
+    assert detect_column_boundary([10, 120, 400]) == 260
+    assert detect_column_boundary([120, 680, 720]) == DEFAULT_COLUMN_BOUNDARY
+
+def test_gap_inside_the_action_column_does_not_split_it():
+    # 动作列中缩进的片段（left=230）与动作列之间的间隔也超过min_gap，但小于动作列与预期结果列之间的间隔
+    assert detect_column_boundary([120, 230, 400]) == 315
+
+def test_single_column_falls_back_to_the_default():
+    assert detect_column_boundary([]) == DEFAULT_COLUMN_BOUNDARY
+    assert detect_column_boundary([120, 160, 200]) == DEFAULT_COLUMN_BOUNDARY
+
+def test_step_table_with_a_pass_fail_column():
+    page = '<html><body>\n' + '\n'.join([
+        paragraph(50, 90, "1.1 Test case: Alpha (Ver: 1)"),
+        paragraph(70, 90, "Test Case ID: 101"),
+        paragraph(90, 90, "Test Script Description"),
+        paragraph(110, 90, "Step Action Expected Result"),
+        paragraph(130, 90, "1"),
+        paragraph(130, 120, "Read DID"),
+        paragraph(130, 400, "Positive response"),
+        paragraph(130, 720, "Pass"),
+    ]) + '\n</body></html>\n'
+    test_case, = dvm.extract_test_cases_from_html(page, 3)
+    assert [step.to_dict() for step in test_case.test_script] == [
+        {"step": "1", "action": "Read DID", "expected_result": "Positive response Pass"}
+    ]
+
+def test_indented_action_fragment_stays_in_the_action_column():
+    page = '<html><body>\n' + '\n'.join([
+        paragraph(50, 90, "1.1 Test case: Alpha (Ver: 1)"),
+        paragraph(70, 90, "Test Case ID: 101"),
+        paragraph(90, 90, "Test Script Description"),
+        paragraph(110, 90, "1"),
+        paragraph(110, 120, "Read DID"),
+        paragraph(110, 230, "0xF190"),
+        paragraph(110, 400, "Positive response"),
+    ]) + '\n</body></html>\n'
+    test_case, = dvm.extract_test_cases_from_html(page, 3)
+    # 与原来固定列边界（250）的结果一致
+    assert [step.to_dict() for step in test_case.test_script] == [
+        {"step": "1", "action": "Read DID 0xF190", "expected_result": "Positive response"}
+    ]
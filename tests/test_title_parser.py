@@ -0,0 +1,66 @@
+"""
+测试用例标题语法 html_to_json_converter.parse_test_case_title / test_case_filename
+与原正则表达式级联（benchmark_title_parser.legacy_parse_title）的一致性
+"""
+
+import pytest
+
+import html_to_json_converter
+from benchmark_title_parser import generate_titles, legacy_parse_title, parse_title
+
+@pytest.mark.parametrize("title, expected", [
+    # 带结果
+    ("3 Test Case Silk ID:12345: Read DID 0xF190: Passed", ("12345", "Read DID 0xF190", "Passed")),
+    ("3 Test Case Silk ID:12345:Read DID: Failed", ("12345", "Read DID", "Failed")),
+    # 名称中包含冒号，结果取第一个 ": Passed/Failed"
+    ("3 Test Case Silk ID:7: wiper: speed: Passed", ("7", "wiper: speed", "Passed")),
+    # 不带结果
+    ("3 Test Case Silk ID:12345: Read DID 0xF190", ("12345", "Read DID 0xF190", "")),
+    ("3 Test Case Silk ID:12345: Read DID :", ("12345", "Read DID", "")),
+    ("3 Test Case Silk ID:12345:", ("12345", "", "")),
+    # 结果不是 Passed/Failed 时作为名称的一部分
+    ("3 Test Case Silk ID:12345: Read DID: Skipped", ("12345", "Read DID: Skipped", "")),
+])
+def test_grammar(title, expected):
+    assert html_to_json_converter.parse_test_case_title(title) == expected
+    assert legacy_parse_title(title, 0)[:3] == expected
+
+@pytest.mark.parametrize("title, expected", [
+    # ID不是数字，按冒号分割：第三段为ID，第四段为名称，其余部分用下划线连接
+    ("3 Test Case Silk ID:A12: name: x", ("name", "x", "")),
+    ("3 Test Case Silk ID:A12: a: b: c: d", ("a", "b_c_ d", "")),
+    # 名称跨行时语法不匹配，同样回退到按冒号分割
+    ("3 Test Case Silk ID:12:Read\n: Passed trailing", ("Read", "Passed trailing", "")),
+])
+def test_split_fallback(title, expected):
+    assert html_to_json_converter.parse_test_case_title(title) == expected
+    assert legacy_parse_title(title, 0)[:3] == expected
+
+@pytest.mark.parametrize("title", [
+    "Test Case Silk ID without colon",
+    "3 Test Case Silk ID:A12: name",
+    "Some other heading",
+    "",
+])
+def test_malformed_titles_have_no_id(title):
+    test_case_id, test_case_name, verdict = html_to_json_converter.parse_test_case_title(title)
+    assert (test_case_id, test_case_name, verdict) == (None, title, "")
+    # 调用方使用序号作为ID
+    assert parse_title(title, 9) == legacy_parse_title(title, 9)
+    assert parse_title(title, 9)[0] == "9"
+
+@pytest.mark.parametrize("name, test_case_id, expected", [
+    ("Read DID 0xF190", "1", "Read_DID_0xF190"),
+    ("wiper: speed", "1", "wiper__speed"),
+    ("Écran-1 (B)", "1", "cran-1_B"),
+    ("", "42", "test_case_42"),
+    ("éé", "42", "test_case_42"),
+    ("x" * 150, "1", "x" * 100),
+])
+def test_filename_sanitizing(name, test_case_id, expected):
+    assert html_to_json_converter.test_case_filename(name, test_case_id) == expected
+
+def test_matches_legacy_cascade_on_corpus():
+    titles = generate_titles(5000, seed=3)
+    for index, title in enumerate(titles):
+        assert parse_title(title, index) == legacy_parse_title(title, index), title